@@ -0,0 +1,284 @@
+"""
+Redaction Engine: single-pass masking of sensitive values.
+All active patterns are compiled into one alternation, so a text is scanned
+once however many patterns apply; a named (empty) group at the end of each
+branch tells which rule matched. RedactionPolicy precomputes one engine per
+combination of rule groups and picks it by (role, clearance).
+StreamingRedactor masks text chunk by chunk, carrying a bounded overlap
+window so matches spanning chunk boundaries are still caught.
+
+Copy of sap_agents/src/services/redaction.py (the two apps are built and
+deployed separately); sap_agents/verify_redaction.py fails if the code of
+the two drifts apart.
+"""
+import re
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Overlap carried between stream chunks; matches longer than this may be split
+STREAM_WINDOW = 256
+
+
+@dataclass(frozen=True)
+class RedactionRule:
+    name: str                   # Identifier reported by the compiled alternation
+    pattern: str                # Must not define named groups of its own
+    replacement: str
+    # Characters directly before a match that belong to it (e.g. an email's
+    # local part before "@"); at least one is required. Lets the pattern
+    # start at a literal, which re can jump to instead of trying every position.
+    lead: Optional[str] = None
+
+
+class RedactionEngine:
+    """
+    Applies a fixed list of rules in one scan. Matches are leftmost (leads
+    included); at the same position earlier rules win.
+    """
+
+    def __init__(self, rules: Sequence[RedactionRule], flags: int = 0):
+        self.rules = tuple(rules)
+        self.flags = flags
+        self._replacements = {rule.name: rule.replacement for rule in self.rules}
+        self._leads = {rule.name: frozenset(rule.lead) for rule in self.rules if rule.lead}
+        self._lead_chars = frozenset().union(*self._leads.values())
+        self._lead_rules = tuple(
+            (rule.name, re.compile(rule.pattern, flags), self._leads[rule.name])
+            for rule in self.rules if rule.lead
+        )
+        self._regex = self._compile(self.rules)
+        self._excluding_cache: Dict[FrozenSet[str], Optional["re.Pattern"]] = {}
+
+    def _compile(self, rules: Sequence[RedactionRule]) -> Optional["re.Pattern"]:
+        if not rules:
+            return None
+        # Group markers go after each branch rather than around it: a
+        # branch starting with a literal keeps re's fast prefix scan
+        return re.compile("|".join(f"(?:{rule.pattern})(?P<{rule.name}>)" for rule in rules), self.flags)
+
+    def _excluding(self, names: FrozenSet[str]) -> Optional["re.Pattern"]:
+        """The alternation without the named rules (compiled on first use)."""
+        if names not in self._excluding_cache:
+            self._excluding_cache[names] = self._compile([rule for rule in self.rules if rule.name not in names])
+        return self._excluding_cache[names]
+
+    def redact(self, text: str) -> str:
+        return self.redact_count(text)[0]
+
+    def redact_count(self, text: str) -> Tuple[str, int]:
+        """(redacted text, number of replacements)."""
+        if self._regex is None or not text:
+            return text, 0
+        parts = []
+        pos = 0
+        for start, end, name in self.matches(text):
+            parts.append(text[pos:start])
+            parts.append(self._replacements[name])
+            pos = end
+        if not parts:
+            return text, 0
+        parts.append(text[pos:])
+        return "".join(parts), len(parts) // 2
+
+    def matches(self, text: str, pos: int = 0, stop: Optional[int] = None,
+                horizon: Optional[int] = None) -> Iterator[Tuple[int, int, str]]:
+        """
+        (start, end, rule name) of each match at or after pos, leads included.
+        Leftmost is decided with leads resolved: a match lying in the lead of
+        a lead-rule match (e.g. digits in an email's local part) gives way to it.
+        With `stop`, ends before the first match whose pattern starts at or after it.
+        Text from `horizon` on may still change; lead-rule patterns starting
+        there are not considered when resolving leads.
+        """
+        if self._regex is None:
+            return
+        search = self._regex.search
+        runs: Dict[str, tuple] = {}
+        excluded: FrozenSet[str] = frozenset()
+        match = search(text, pos)
+        while match is not None:
+            at = match.start()
+            if stop is not None and at >= stop:
+                return
+            name = match.lastgroup
+            start, end = at, match.end()
+            lead = self._leads.get(name)
+            if lead is not None:
+                while start > pos and text[start - 1] in lead:
+                    start -= 1
+                if start == at:
+                    # No lead: not a match here, but other rules may still match at this position
+                    excluded |= {name}
+                    others = self._excluding(excluded)
+                    match = others.match(text, at) if others is not None else None
+                    if match is None:
+                        excluded = frozenset()
+                        match = search(text, at + 1)
+                    continue
+            elif self._lead_rules:
+                covering = self._lead_cover(text, at, pos, horizon, runs)
+                if covering is not None:
+                    start, end, name = covering
+            yield start, end, name
+            pos = end
+            excluded = frozenset()
+            match = search(text, pos)
+
+    def _lead_cover(self, text: str, at: int, pos: int, horizon: Optional[int],
+                    runs: Dict[str, tuple]) -> Optional[Tuple[int, int, str]]:
+        """
+        A lead-rule match whose lead (not before pos) reaches `at`, as
+        (start, end, rule name). Lead runs are cached in `runs`, so a long run
+        holding many matches is scanned once.
+        """
+        for name, regex, lead in self._lead_rules:
+            run = runs.get(name)
+            if run is None or not run[0] <= at <= run[1]:
+                run_end = at
+                while run_end < len(text) and text[run_end] in lead:
+                    run_end += 1
+                found = regex.match(text, run_end) if horizon is None or run_end < horizon else None
+                run_start = at
+                if found is not None:
+                    while run_start > pos and text[run_start - 1] in lead:
+                        run_start -= 1
+                run = runs[name] = (at, run_end, found, run_start)
+            _, run_end, found, run_start = run
+            start = max(run_start, pos)
+            if found is not None and start < run_end:
+                return start, found.end(), name
+        return None
+
+    def _lead_run(self, text: str, end: int, floor: int) -> int:
+        """Start of the run of lead characters ending at `end` (not before floor)."""
+        chars = self._lead_chars
+        start = end
+        while start > floor and text[start - 1] in chars:
+            start -= 1
+        return start
+
+    def stream(self, window: int = STREAM_WINDOW) -> "StreamingRedactor":
+        return StreamingRedactor(self, window)
+
+    def redact_stream(self, chunks: Iterable[str], window: int = STREAM_WINDOW) -> Iterator[str]:
+        """Masks an iterable of text chunks, yielding masked text as it becomes final."""
+        redactor = self.stream(window)
+        for chunk in chunks:
+            out = redactor.feed(chunk)
+            if out:
+                yield out
+        out = redactor.close()
+        if out:
+            yield out
+
+
+class StreamingRedactor:
+    """
+    Incremental RedactionEngine. Output is identical to redacting the whole
+    text at once, provided every match (lead included) is shorter than
+    `window`. Memory is bounded by chunk size + 3 * window.
+
+    Text is held back while it could still change: the last `window`
+    characters (a match starting there may continue in the next chunk) and
+    any lead run reaching into them (it may precede a later "@").
+    The last `window` emitted characters are kept as context so lookbehinds
+    and word boundaries see the same text as in a single pass.
+    """
+
+    def __init__(self, engine: RedactionEngine, window: int = STREAM_WINDOW):
+        self.engine = engine
+        self.window = window
+        self._context = ""   # Already emitted, kept for lookbehind only
+        self._pending = ""   # Not yet emitted
+        self.count = 0
+
+    def feed(self, chunk: str) -> str:
+        """Adds a chunk; returns the masked text that is now final (may be empty)."""
+        self._pending += chunk
+        if len(self._pending) <= self.window:
+            return ""
+        return self._flush(final=False)
+
+    def close(self) -> str:
+        """Returns the rest of the masked text."""
+        out = self._flush(final=True)
+        self._context = ""
+        return out
+
+    def _flush(self, final: bool) -> str:
+        base = len(self._context)
+        text = self._context + self._pending
+        if final:
+            cut = len(text)
+            horizon = None
+        else:
+            horizon = len(text) - self.window
+            # Keep a lead run touching the held-back tail with it
+            cut = self.engine._lead_run(text, horizon, max(base, horizon - self.window))
+        parts = []
+        pos = base
+        for start, end, name in self.engine.matches(text, base, None if final else cut, horizon):
+            parts.append(text[pos:start])
+            parts.append(self.engine._replacements[name])
+            self.count += 1
+            pos = end
+        emit = max(pos, cut)
+        parts.append(text[pos:emit])
+        self._pending = text[emit:]
+        self._context = text[max(0, emit - self.window):emit]
+        return "".join(parts)
+
+
+# Decides whether (role, clearance) may see a rule group unmasked
+Visibility = Callable[[str, str], bool]
+
+
+class RedactionPolicy:
+    """
+    Rule groups (e.g. "financial", "pii"), each hidden unless its visibility
+    check passes for the caller. Engines for every subset of hidden groups
+    are compiled up front; (role, clearance) -> engine lookups are memoized.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[RedactionRule]], visibility: Dict[str, Visibility], flags: int = 0):
+        self.groups = {name: tuple(rules) for name, rules in groups.items()}
+        self.visibility = visibility
+        names = list(self.groups)
+        self._engines: Dict[FrozenSet[str], RedactionEngine] = {}
+        for size in range(len(names) + 1):
+            for hidden in combinations(names, size):
+                rules = [rule for name in names if name in hidden for rule in self.groups[name]]
+                self._engines[frozenset(hidden)] = RedactionEngine(rules, flags)
+        self._by_caller: Dict[Tuple[str, str], RedactionEngine] = {}
+
+    def hidden_groups(self, role: str, clearance: str) -> FrozenSet[str]:
+        return frozenset(
+            name for name in self.groups
+            if name not in self.visibility or not self.visibility[name](role, clearance)
+        )
+
+    def engine_for(self, role: str, clearance: str) -> RedactionEngine:
+        key = (role, clearance)
+        engine = self._by_caller.get(key)
+        if engine is None:
+            engine = self._by_caller[key] = self._engines[self.hidden_groups(role, clearance)]
+        return engine
+
+    def redact(self, text: str, role: str, clearance: str) -> str:
+        return self.engine_for(role, clearance).redact(text)
+
+    def redact_stream(self, chunks: Iterable[str], role: str, clearance: str,
+                      window: int = STREAM_WINDOW) -> Iterator[str]:
+        return self.engine_for(role, clearance).redact_stream(chunks, window)
+
+
+# Email as "@domain.tld" plus a lead of local-part characters. The old
+# "[^@]+@[^@]+\.[^@]+" swallowed whole sentences around an "@" and
+# backtracked quadratically on long outputs.
+EMAIL_LOCAL_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-"
+EMAIL_DOMAIN_PATTERN = r"@(?:[A-Za-z0-9-]{1,63}\.)+[A-Za-z]{2,24}"
+
+
+def email_rule(name: str, replacement: str) -> RedactionRule:
+    return RedactionRule(name, EMAIL_DOMAIN_PATTERN, replacement, lead=EMAIL_LOCAL_CHARS)
@@ -1,23 +1,32 @@
-import re
+from athena_system.security.redaction import EMAIL_DOMAIN_PATTERN, RedactionEngine, RedactionRule, email_rule
 
 class PIISanitizer:
     def __init__(self):
         # Regex patterns for common PII
         self.patterns = {
-            "email": r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+            "email": EMAIL_DOMAIN_PATTERN,  # Local part matched as the rule's lead
             "phone": r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
             "ssn": r'\b\d{3}-\d{2}-\d{4}\b'
         }
+        # All patterns in one compiled alternation: one scan per text
+        self.engine = RedactionEngine([
+            email_rule("email", "[REDACTED_EMAIL]") if pii_type == "email"
+            else RedactionRule(pii_type, pattern, f"[REDACTED_{pii_type.upper()}]")
+            for pii_type, pattern in self.patterns.items()
+        ])
 
     def redact(self, text):
         """
         Redacts PII from the input text.
         """
-        redacted_text = text
-        for pii_type, pattern in self.patterns.items():
-            redacted_text = re.sub(pattern, f"[REDACTED_{pii_type.upper()}]", redacted_text)
-        
-        return redacted_text
+        return self.engine.redact(text)
+
+    def redact_stream(self, chunks):
+        """
+        Redacts PII from an iterable of text chunks, yielding redacted text
+        as it becomes final (patterns spanning chunk boundaries included).
+        """
+        return self.engine.redact_stream(chunks)
 
 if __name__ == "__main__":
     sanitizer = PIISanitizer()
@@ -0,0 +1,118 @@
+"""
+Agent Pool: warm, reusable agent executors.
+Executors are built lazily on first use (LLM client, tools, ReAct prompt)
+and reused across requests instead of being reconstructed per step.
+Each agent has a bounded number of concurrent invocations.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+# Concurrent invocations allowed per pooled executor
+MAX_AGENT_CONCURRENCY = int(os.getenv("AGENT_POOL_MAX_CONCURRENCY", "4"))
+
+
+class _PoolEntry:
+    __slots__ = ("executor", "ready", "build_lock", "slots", "hits", "misses", "construction_seconds")
+
+    def __init__(self, concurrency: int):
+        self.executor = None
+        self.ready = False               # True once the factory ran (even if it returned None)
+        self.build_lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.hits = 0
+        self.misses = 0
+        self.construction_seconds = 0.0
+
+
+class AgentPool:
+    """
+    Executors keyed by agent id.
+    A factory returning None (e.g. no API key configured) is remembered as
+    well, so unavailable agents do not retry construction on every call;
+    use invalidate() after changing configuration.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_AGENT_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> _PoolEntry:
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(key, _PoolEntry(self.max_concurrency))
+        return entry
+
+    def get(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Returns the pooled executor for key, constructing it on first use."""
+        return self._acquire(key, factory)[1]
+
+    def _acquire(self, key: str, factory: Callable[[], Any]):
+        """(entry, executor) for key; the entry is the one the executor came from."""
+        entry = self._entry(key)
+        if entry.ready:
+            self._count(entry, hits=1)
+            return entry, entry.executor
+        with entry.build_lock:
+            if entry.ready:
+                self._count(entry, hits=1)
+                return entry, entry.executor
+            start = time.perf_counter()
+            try:
+                entry.executor = factory()
+            finally:
+                self._count(entry, misses=1, seconds=time.perf_counter() - start)
+            entry.ready = True
+            return entry, entry.executor
+
+    def _count(self, entry: _PoolEntry, hits: int = 0, misses: int = 0, seconds: float = 0.0):
+        # Counters are bumped from concurrent requests; += is not atomic
+        with self._lock:
+            entry.hits += hits
+            entry.misses += misses
+            entry.construction_seconds += seconds
+
+    @contextmanager
+    def lease(self, key: str, factory: Callable[[], Any]):
+        """
+        Holds one of the agent's concurrency slots while the executor is used:
+
+            with agent_pool.lease("travel_agent", create_travel_agent) as executor:
+                ...
+        """
+        entry, executor = self._acquire(key, factory)
+        with entry.slots:
+            yield executor
+
+    def invalidate(self, key: str = None):
+        """Drops one pooled executor (or all of them) so it is rebuilt on next use."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {
+                key: {
+                    "available": entry.executor is not None,
+                    "hits": entry.hits,
+                    "misses": entry.misses,
+                    "construction_ms": round(entry.construction_seconds * 1000, 2),
+                }
+                for key, entry in self._entries.items() if entry.ready
+            }
+        return {
+            "hits": sum(a["hits"] for a in agents.values()),
+            "misses": sum(a["misses"] for a in agents.values()),
+            "construction_ms": round(sum(a["construction_ms"] for a in agents.values()), 2),
+            "agents": agents,
+        }
+
+# Global Instance
+agent_pool = AgentPool()
@@ -1,5 +1,6 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from src.agents.dispatch import register_agent
 
 # Mock Data for Customer Service (CS)
 TICKETS = {
@@ -38,3 +39,5 @@ def create_cs_agent():
     Creates the Customer Service Agent (CS).
     """
     return MockCSLLM()
+
+register_agent("cs_service", create_cs_agent, category="Customer Service", label="Customer Service Agent")
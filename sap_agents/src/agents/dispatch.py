@@ -0,0 +1,88 @@
+"""
+Agent Dispatch: table-driven routing from a capability to its agent executor.
+Agent modules register their factory by capability id and/or category at
+import time, so dispatch is a dict lookup and adding an agent does not
+touch the orchestrator (only AGENT_MODULES below).
+"""
+import importlib
+from typing import Callable, Dict, Optional
+
+# Agent modules that register themselves on import. Registration order is
+# dispatch precedence when a capability's id and category point at
+# different agents.
+AGENT_MODULES = [
+    "src.agents.travel_agent",
+    "src.agents.planning_agent",
+    "src.agents.sustainability_agent",
+    "src.agents.knowledge_agent",
+    "src.agents.market_intelligence_agent",
+    "src.agents.manufacturing_agent",
+    "src.agents.eam_agent",
+    "src.agents.cs_agent",
+    "src.agents.procurement_agent",
+    "src.agents.sales_agent",
+    "src.agents.finance_agent",
+    "src.agents.hr_agent",
+    "src.agents.supply_chain_agent",
+    "src.agents.project_agent",
+]
+
+
+class AgentRoute:
+    __slots__ = ("agent_id", "factory", "fallback", "order")
+
+    def __init__(self, agent_id: str, factory: Callable, fallback: Callable[[str], str], order: int):
+        self.agent_id = agent_id    # Agent pool key
+        self.factory = factory      # Builds the executor (may return None)
+        self.fallback = fallback    # prompt -> response when the executor is unavailable
+        self.order = order
+
+
+class AgentDispatcher:
+    def __init__(self):
+        self.by_id: Dict[str, AgentRoute] = {}
+        self.by_category: Dict[str, AgentRoute] = {}
+        self._loaded = False
+
+    def register(self, agent_id: str, factory: Callable, category: str = None,
+                 label: str = None, fallback: Callable[[str], str] = None) -> AgentRoute:
+        """
+        Registers factory under agent_id and, if given, category.
+        Without an explicit fallback, an unavailable executor answers
+        "Error: Could not initialize <label>."
+        """
+        if fallback is None:
+            message = f"Error: Could not initialize {label or agent_id}."
+            fallback = lambda prompt: message
+        route = AgentRoute(agent_id, factory, fallback, len(self.by_id))
+        self.by_id[agent_id] = route
+        if category:
+            self.by_category.setdefault(category, route)
+        return route
+
+    def load_agents(self):
+        """Imports AGENT_MODULES once so their registrations run."""
+        if self._loaded:
+            return
+        for module in AGENT_MODULES:
+            importlib.import_module(module)
+        self._loaded = True
+
+    def resolve(self, capability: dict) -> Optional[AgentRoute]:
+        """
+        Route for a capability entry: matched by id or by category,
+        earliest registration wins.
+        """
+        by_id = self.by_id.get(capability.get('id'))
+        by_category = self.by_category.get(capability.get('category'))
+        if by_id is None or by_category is None:
+            return by_id or by_category
+        return by_id if by_id.order <= by_category.order else by_category
+
+# Global Instance
+agent_dispatcher = AgentDispatcher()
+
+
+def register_agent(agent_id: str, factory: Callable, category: str = None,
+                   label: str = None, fallback: Callable[[str], str] = None) -> AgentRoute:
+    return agent_dispatcher.register(agent_id, factory, category, label, fallback)
@@ -1,5 +1,6 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from src.agents.dispatch import register_agent
 
 # Mock Data for Asset Management (EAM)
 EQUIPMENT = {
@@ -38,3 +39,5 @@ def create_eam_agent():
     Creates the Asset Management Agent (EAM).
     """
     return MockEAMLLM()
+
+register_agent("eam_assets", create_eam_agent, category="Asset Management", label="Asset Management Agent")
@@ -4,6 +4,7 @@ from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from src.tools.finance_tools import get_finance_tools
+from src.agents.dispatch import register_agent
 
 def create_finance_agent():
     """
@@ -57,3 +58,5 @@ Thought:{agent_scratchpad}'''
     )
     
     return agent_executor
+
+register_agent("financereconciliationagent", create_finance_agent, category="Finance", label="Finance Agent")
@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 # Mock Vector Database (Document Index)
 VECTOR_DB = {
@@ -37,3 +38,5 @@ class MockKnowledgeLLM:
 
 def create_knowledge_agent():
     return MockKnowledgeLLM()
+
+register_agent("rag_knowledge", create_knowledge_agent, category="Knowledge Base", label="Knowledge Agent")
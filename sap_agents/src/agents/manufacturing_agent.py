@@ -1,5 +1,6 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from src.agents.dispatch import register_agent
 
 # Mock Data for Manufacturing (PP)
 PRODUCTION_ORDERS = {
@@ -81,3 +82,5 @@ def create_manufacturing_agent():
     Creates the Manufacturing Agent (PP).
     """
     return MockManufacturingLLM()
+
+register_agent("pp_manufacturing", create_manufacturing_agent, category="Manufacturing", label="Manufacturing Agent")
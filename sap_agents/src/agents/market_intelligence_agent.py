@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 # Mock External Knowledge Graph
 MARKET_DATA = {
@@ -37,3 +38,5 @@ class MockMarketIntelligenceLLM:
 
 def create_market_intelligence_agent():
     return MockMarketIntelligenceLLM()
+
+register_agent("strat_market", create_market_intelligence_agent, category="Market Intelligence", label="Market Intelligence Agent")
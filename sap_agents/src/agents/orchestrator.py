@@ -2,35 +2,23 @@ import json
 import os
 import sys
 import random
+import time
 from datetime import datetime
 import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.agents.procurement_agent import create_procurement_agent, run_offline_agent
-from src.agents.sales_agent import create_sales_agent
-from src.agents.finance_agent import create_finance_agent
-from src.agents.hr_agent import create_hr_agent
-from src.agents.analytics_agent import create_analytics_agent
-from src.agents.manufacturing_agent import create_manufacturing_agent
-from src.agents.eam_agent import create_eam_agent
-from src.agents.cs_agent import create_cs_agent
-from src.agents.supply_chain_agent import create_supply_chain_agent
-from src.agents.project_agent import create_project_agent
-from src.agents.treasury_agent import create_treasury_agent
-from src.agents.integration_agent import create_integration_agent
-from src.agents.experience_agent import create_experience_agent
-from src.agents.network_agent import create_network_agent
-from src.agents.travel_agent import create_travel_agent
-from src.agents.planning_agent import create_planning_agent
-from src.agents.process_agent import create_process_agent
-from src.agents.sustainability_agent import create_sustainability_agent
-from src.agents.knowledge_agent import create_knowledge_agent
-from src.agents.market_intelligence_agent import create_market_intelligence_agent
+from src.agents.agent_pool import agent_pool
+from src.agents.dispatch import agent_dispatcher
 
 REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'registry.json')
 
+# Upper bound on plan steps executing at the same time
+MAX_PARALLEL_STEPS = int(os.getenv("ORCHESTRATOR_MAX_PARALLEL_STEPS", "8"))
+
 from src.services.service_manager import service_manager
 from src.services.capability_index import capability_index
 from src.services.quality_guardrail import quality_guardrail
@@ -39,33 +27,75 @@ from src.services.solution_architect import solution_architect
 from src.services.data_privacy import data_privacy
 from src.services.human_handoff import confidence_engine
 from src.services.audit_service import create_audit_service
+from src.core.latency_metrics import latency_metrics
+
+class RequestContext:
+    """
+    Per-request orchestration state (trace, plan, transaction id).
+    Passing one to plan()/execute() keeps concurrent requests isolated.
+    on_output(step_id, text), if set, receives each step's masked agent
+    output as it is produced (from the step's worker thread).
+    """
+    def __init__(self, user_id="admin", transaction_id=None, on_output=None):
+        self.user_id = user_id
+        self.transaction_id = transaction_id or str(uuid.uuid4())
+        self.trace = []
+        self.plan = None
+        self.on_output = on_output
 
 class OrchestratorAgent:
     def __init__(self):
         self.services = service_manager
         self.registry = capability_index.index
+        agent_dispatcher.load_agents()
         self.audit_service = create_audit_service()
-        self.trace_log = []
-        self.current_plan = None
-
-    def _log(self, stage, message):
+        # Legacy callers (plan() then execute() without a context) get one
+        # implicit context per thread
+        self._local = threading.local()
+
+    def _context(self, context=None):
+        if context is not None:
+            return context
+        current = getattr(self._local, "context", None)
+        if current is None:
+            current = self._local.context = RequestContext()
+        return current
+
+    @property
+    def current_plan(self):
+        return self._context().plan
+
+    @current_plan.setter
+    def current_plan(self, plan):
+        self._context().plan = plan
+
+    @property
+    def trace_log(self):
+        return self._context().trace
+
+    def _log(self, ctx, stage, message):
         entry = f"[{datetime.now().isoformat()}] [{stage}]: {message}"
         print(entry)
-        self.trace_log.append(entry)
-
-    def plan(self, user_request, user_id="admin"):
-        self.trace_log = [] # Reset trace
-        transaction_id = str(uuid.uuid4())
-        self._log("Planning Started", f"User: {user_id}, Request: {user_request}")
+        ctx.trace.append(entry)
+
+    def plan(self, user_request, user_id="admin", context=None):
+        if context is None:
+            # Fresh implicit context for this thread
+            context = self._local.context = RequestContext(user_id)
+        ctx = context
+        transaction_id = ctx.transaction_id
+        self._log(ctx, "Planning Started", f"User: {user_id}, Request: {user_request}")
         
         try:
             # 1. Context Enrichment
-            enriched_ctx = context_enricher.enrich(user_request, user_id)
-            self._log("Context Enriched", str(enriched_ctx))
+            with latency_metrics.stage("enrichment"):
+                enriched_ctx = context_enricher.enrich(user_request, user_id)
+            self._log(ctx, "Context Enriched", str(enriched_ctx))
             
             # 2. Intent/Strategy
-            strategy = solution_architect.evaluate(enriched_ctx['enriched_prompt'])
-            self._log("Solution Strategy", f"{strategy['strategy']} via {strategy['source']}")
+            with latency_metrics.stage("strategy"):
+                strategy = solution_architect.evaluate(enriched_ctx['enriched_prompt'])
+            self._log(ctx, "Solution Strategy", f"{strategy['strategy']} via {strategy['source']}")
 
             plan = {
                 "goal": user_request,
@@ -107,12 +137,12 @@ class OrchestratorAgent:
                 self._fallback_planning(user_request, plan)
                 self.audit_service.log_event(transaction_id, "DECISION", "Fallback to Heuristics", "WARNING")
 
-            self.current_plan = plan
-            self._log("Plan Generated", plan)
+            ctx.plan = plan
+            self._log(ctx, "Plan Generated", plan)
             return plan
             
         except Exception as e:
-            self._log("Planning Error", str(e))
+            self._log(ctx, "Planning Error", str(e))
             self.audit_service.log_event(transaction_id, "ERROR", str(e), "CRITICAL")
             # Fallback Plan
             fallback_plan = {
@@ -120,7 +150,7 @@ class OrchestratorAgent:
                 "steps": [{"id": 1, "action": "error", "message": f"Planning failed: {str(e)}"}],
                 "transaction_id": transaction_id
             }
-            self.current_plan = fallback_plan
+            ctx.plan = fallback_plan
             return fallback_plan
 
     def _fallback_planning(self, user_request, plan):
@@ -132,9 +162,12 @@ class OrchestratorAgent:
         
         # 2. Supply Chain Impact Analysis (Complex Scenario)
         elif any(x in req for x in ["impact", "delayed", "delay", "quality", "late"]):
+            # The four domain checks are independent (depends_on: []), so they
+            # fan out concurrently and the plan costs max(latency), not the sum.
             # Step 1: Procurement - Identify the Vendor/PO
             plan["steps"].append({
                 "id": 1, 
+                "depends_on": [],
                 "action": "delegate", 
                 "agent_criteria": "Procurement", 
                 "task": f"Identify Purchase Orders related to: {user_request}"
@@ -142,6 +175,7 @@ class OrchestratorAgent:
             # Step 2: Supply Chain - Check Inventory Buffer
             plan["steps"].append({
                 "id": 2, 
+                "depends_on": [],
                 "action": "delegate", 
                 "agent_criteria": "Supply Chain", 
                 "task": "Check Safety Stock and Inventory Levels for impacted materials"
@@ -149,6 +183,7 @@ class OrchestratorAgent:
             # Step 3: Sales - Identify Customer Impact
             plan["steps"].append({
                 "id": 3, 
+                "depends_on": [],
                 "action": "delegate", 
                 "agent_criteria": "Sales", 
                 "task": "Identify Customer Orders allocated to these materials"
@@ -156,6 +191,7 @@ class OrchestratorAgent:
             # Step 4: Finance - Assess Risk
             plan["steps"].append({
                 "id": 4, 
+                "depends_on": [],
                 "action": "delegate", 
                 "agent_criteria": "Finance", 
                 "task": "Calculate financial risk and SLA penalties"
@@ -174,251 +210,202 @@ class OrchestratorAgent:
         else:
              plan["steps"].append({"id": 1, "action": "clarify", "question": "I am not sure. Please clarify."})
 
-    def execute(self):
+    def execute(self, context=None):
         """
         Advanced Execution: Execute -> Secure -> Validate -> Audit
+        Steps form a DAG: a step may declare 'depends_on' (list of step ids);
+        without it, it waits for the previous step. Independent steps run
+        concurrently and outputs are merged in plan order.
         """
-        if not self.current_plan:
+        ctx = self._context(context)
+        plan = ctx.plan
+        if not plan:
             return {"error": "No plan to execute"}
             
-        results = []
-        ctx = self.current_plan.get('context', {})
-        user_role = ctx.get('user_role', 'Unknown')
-        clearance = ctx.get('security_clearance', 'L1')
-        transaction_id = self.current_plan.get('transaction_id', 'unknown')
+        enriched = plan.get('context', {})
+        user_role = enriched.get('user_role', 'Unknown')
+        clearance = enriched.get('security_clearance', 'L1')
+        transaction_id = plan.get('transaction_id', 'unknown')
         
         try:
-            for step in self.current_plan['steps']:
-                self._log("Execution Step", f"Executing Step {step['id']}: {step['action']}")
-                self.audit_service.log_event(transaction_id, "ACTION", f"Executing {step['action']}")
-                
-                output = ""
-                agent_name = "System"
-                
-                if step['action'] == 'error':
-                    output = f"❌ **System Error**: {step['message']}"
-                
-                elif step['action'] == 'block':
-                    output = f"[System]: 🛡️ Query blocked: {step['reason']}"
-
-                elif step['action'] == 'system_check':
-                    health = self.services.health_check()
-                    status_msg = "\n".join([f"- {k}: {v}" for k, v in health.items()])
-                    output = f"[System]: **Enterprise Services Status:**\n{status_msg}"
-
-                elif step['action'] == 'custom_asset':
-                    output = f"[System]: 🏗️ Executing Custom Asset: **{step['asset_name']}**... [Simulated Output]"
-
-                elif step['action'] == 'new_build':
-                    output = f"[System]: 🚧 Request flagged for **New Custom Build**. Ticket #CB-{random.randint(1000,9999)} created."
-
-                elif step['action'] == 'delegate':
-                    # Find Agent
-                    agent_name = step['agent_criteria']
-                    agent = None
-                    for a in self.registry:
-                        if a['agent'] == agent_name or a.get('category') == agent_name:
-                            agent = a
-                            break
-                    
-                    if agent:
-                        agent_name = agent['agent'] # Update for audit
-                        # Execute Agent Logic
-                        raw_output = self._run_agent(agent, step['task'])
-                        
-                        # 5. Data Privacy (Masking)
-                        secured_output = data_privacy.secure_data(raw_output, user_role, clearance)
-                        if secured_output != raw_output:
-                            self._log("Data Privacy", "Sensitive data masked.")
-                        
-                        # 6. Output Guardrail
-                        validation = quality_guardrail.validate_output(secured_output)
-                        if not validation["valid"]:
-                            self._log("Guardrail Warning", validation["reason"])
-                            secured_output += f"\n\n*(System Note: Quality Flag: {validation['reason']})*"
-                        
-                        output = f"[{agent['agent']}]: {secured_output}"
-                    else:
-                        output = f"[System]: Agent '{agent_name}' not found."
-                
-                elif step['action'] == 'clarify':
-                    output = f"[Agent Manager]: {step['question']}"
-                
-                # 7. Confidence Engine & Audit
-                audit = confidence_engine.evaluate(output, agent_name)
-                self._log("Confidence Audit", f"Score: {audit['confidence_score']}, Status: {audit['review_status'] if 'review_status' in audit else 'Checked'}")
-                self.audit_service.log_event(transaction_id, "OUTCOME", "Response generated", "SUCCESS")
-                
-                # Append Audit Trail
-                output = confidence_engine.append_audit_info(output, audit)
-                
-                results.append(output)
-                        
+            steps = plan['steps']
+            results = self._run_steps(
+                steps, lambda step: self._execute_step(ctx, step, user_role, clearance, transaction_id)
+            )
             final_response = "\n\n".join(results)
-            self._log("Execution Complete", "Success")
+            self._log(ctx, "Execution Complete", "Success")
             return final_response
         except Exception as e:
-            self._log("Execution Error", str(e))
+            self._log(ctx, "Execution Error", str(e))
             return f"System Error during execution: {str(e)}"
 
-    def _run_agent(self, agent, prompt):
-        executor = None
-        if agent['id'] == 'travel_agent' or agent.get('category') == 'Travel':
-            executor = create_travel_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Travel Agent."
-
-        elif agent['id'] == 'pl_planning' or agent.get('category') == 'Planning':
-            executor = create_planning_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Planning Agent."
-
-        elif agent['id'] == 'sus_sustainability' or agent.get('category') == 'Sustainability':
-            executor = create_sustainability_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Sustainability Agent."
-
-        elif agent['id'] == 'rag_knowledge' or agent.get('category') == 'Knowledge Base':
-            executor = create_knowledge_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Knowledge Agent."
-
-        elif agent['id'] == 'strat_market' or agent.get('category') == 'Market Intelligence':
-            executor = create_market_intelligence_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Market Intelligence Agent."
-
-        elif agent['id'] == 'pp_manufacturing' or agent.get('category') == 'Manufacturing':
-            executor = create_manufacturing_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Manufacturing Agent."
-
-        elif agent['id'] == 'eam_assets' or agent.get('category') == 'Asset Management':
-            executor = create_eam_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Asset Management Agent."
+    def _step_dependencies(self, steps):
+        """
+        Returns, per step position, the positions of the steps it waits for.
+        """
+        positions = {step['id']: pos for pos, step in enumerate(steps)}
+        deps = []
+        for pos, step in enumerate(steps):
+            if 'depends_on' not in step:
+                deps.append([pos - 1] if pos else [])
+                continue
+            missing = [d for d in step['depends_on'] if d not in positions]
+            if missing:
+                raise ValueError(f"Step {step['id']} depends on unknown step(s) {missing}")
+            deps.append([positions[d] for d in step['depends_on']])
+        return deps
+
+    def _run_steps(self, steps, run_step):
+        """
+        Runs steps in dependency order, starting each one as soon as its
+        dependencies have finished. Returns outputs in plan order.
+        """
+        if len(steps) <= 1 or not any('depends_on' in step for step in steps):
+            # Linear plan: nothing to overlap
+            return [run_step(step) for step in steps]
+
+        deps = self._step_dependencies(steps)
+        outputs = {}
+        pending = set(range(len(steps)))
+        running = {}
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_STEPS, len(steps))) as pool:
+            while pending or running:
+                ready = [pos for pos in sorted(pending) if all(d in outputs for d in deps[pos])]
+                if not ready and not running:
+                    raise ValueError("Plan steps have a dependency cycle")
+                for pos in ready:
+                    pending.discard(pos)
+                    running[pool.submit(run_step, steps[pos])] = pos
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outputs[running.pop(future)] = future.result()
+        return [outputs[pos] for pos in range(len(steps))]
+
+    def _execute_step(self, ctx, step, user_role, clearance, transaction_id):
+        self._log(ctx, "Execution Step", f"Executing Step {step['id']}: {step['action']}")
+        self.audit_service.log_event(transaction_id, "ACTION", f"Executing {step['action']}")
+        
+        output = ""
+        agent_name = "System"
+        
+        if step['action'] == 'error':
+            output = f"❌ **System Error**: {step['message']}"
+        
+        elif step['action'] == 'block':
+            output = f"[System]: 🛡️ Query blocked: {step['reason']}"
 
-        elif agent['id'] == 'cs_service' or agent.get('category') == 'Customer Service':
-            executor = create_cs_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Customer Service Agent."
+        elif step['action'] == 'system_check':
+            health = self.services.health_check()
+            status_msg = "\n".join([f"- {k}: {v}" for k, v in health.items()])
+            output = f"[System]: **Enterprise Services Status:**\n{status_msg}"
 
-        elif agent['id'] == 'procurementnegotiationassistant':
-            # Run the real/mock procurement logic
-            executor = create_procurement_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return run_offline_agent(prompt)['output']
+        elif step['action'] == 'custom_asset':
+            output = f"[System]: 🏗️ Executing Custom Asset: **{step['asset_name']}**... [Simulated Output]"
 
-        elif agent['id'] == 'salesorderassistant' or agent.get('category') == 'Sales':
-            executor = create_sales_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Sales Agent."
+        elif step['action'] == 'new_build':
+            output = f"[System]: 🚧 Request flagged for **New Custom Build**. Ticket #CB-{random.randint(1000,9999)} created."
 
-        elif agent['id'] == 'financereconciliationagent' or agent.get('category') == 'Finance':
-            executor = create_finance_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Finance Agent."
+        elif step['action'] == 'delegate':
+            # Find Agent
+            agent_name = step['agent_criteria']
+            agent = capability_index.find_agent(agent_name)
+            
+            if agent:
+                agent_name = agent['agent'] # Update for audit
+                # Execute Agent Logic, with 5. Data Privacy (Masking) applied
+                # chunk by chunk as the output arrives: the raw output is never
+                # held whole, and masked text is forwarded as soon as it is final
+                redactor = data_privacy.stream_redactor(user_role, clearance)
+                secured_parts = []
+                masking = 0.0
+                start = time.perf_counter()
+                produced = self._run_agent(agent, step['task'])
+                for chunk in ([produced] if isinstance(produced, str) else produced):
+                    mask_start = time.perf_counter()
+                    secured_parts.append(redactor.feed(chunk))
+                    masking += time.perf_counter() - mask_start
+                    self._forward_output(ctx, step, secured_parts[-1])
+                mask_start = time.perf_counter()
+                secured_parts.append(redactor.close())
+                masking += time.perf_counter() - mask_start
+                self._forward_output(ctx, step, secured_parts[-1])
+                elapsed = time.perf_counter() - start - masking
+                latency_metrics.record("stage", "agent_run", elapsed)
+                latency_metrics.record("agent", agent_name, elapsed)
+                latency_metrics.record("stage", "privacy_masking", masking)
+                secured_output = "".join(secured_parts)
+                if redactor.count:
+                    self._log(ctx, "Data Privacy", "Sensitive data masked.")
+                
+                # 6. Output Guardrail
+                with latency_metrics.stage("guardrail"):
+                    validation = quality_guardrail.validate_output(secured_output)
+                if not validation["valid"]:
+                    self._log(ctx, "Guardrail Warning", validation["reason"])
+                    secured_output += f"\n\n*(System Note: Quality Flag: {validation['reason']})*"
+                
+                output = f"[{agent['agent']}]: {secured_output}"
+            else:
+                output = f"[System]: Agent '{agent_name}' not found."
+        
+        elif step['action'] == 'clarify':
+            output = f"[Agent Manager]: {step['question']}"
+        
+        # 7. Confidence Engine & Audit
+        with latency_metrics.stage("confidence"):
+            audit = confidence_engine.evaluate(output, agent_name)
+        self._log(ctx, "Confidence Audit", f"Score: {audit['confidence_score']}, Status: {audit['review_status'] if 'review_status' in audit else 'Checked'}")
+        self.audit_service.log_event(transaction_id, "OUTCOME", "Response generated", "SUCCESS")
+        
+        # Append Audit Trail
+        return confidence_engine.append_audit_info(output, audit)
 
-        elif agent['id'] == 'hremployeeassistant' or agent.get('category') == 'HR':
-            executor = create_hr_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize HR Agent."
+    def _forward_output(self, ctx, step, text):
+        if text and ctx.on_output is not None:
+            ctx.on_output(step['id'], text)
 
-        elif agent['id'] == 'scm_ibp' or agent.get('category') == 'Supply Chain':
-            executor = create_supply_chain_agent()
-            if executor:
-                try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Supply Chain Agent."
+    def _run_agent(self, agent, prompt):
+        """The agent's output: a string, or an iterable of chunks as it is produced."""
+        route = agent_dispatcher.resolve(agent)
+        if route is None:
+            return f"I have analyzed '{prompt}' based on my expertise in {agent.get('category')}. [Simulated Result]"
+        return self._invoke_pooled(route.agent_id, route.factory, prompt, lambda: route.fallback(prompt))
 
-        elif agent['id'] == 'ppm_projects' or agent.get('category') == 'Project Management':
-            executor = create_project_agent()
+    def _invoke_pooled(self, agent_id, factory, prompt, unavailable):
+        """
+        Runs prompt on the pooled executor for agent_id (built once by factory),
+        yielding its output as the executor streams it (in one piece if it
+        cannot). unavailable() supplies the response when the executor
+        cannot be built.
+        """
+        with agent_pool.lease(agent_id, factory) as executor:
             if executor:
                 try:
-                    res = executor.invoke({"input": prompt})
-                    return res['output']
+                    if hasattr(executor, "stream"):
+                        for chunk in executor.stream({"input": prompt}):
+                            if chunk.get("output"):
+                                yield chunk["output"]
+                    else:
+                        res = executor.invoke({"input": prompt})
+                        yield res['output']
                 except Exception as e:
-                    return f"Error: {str(e)}"
-            return "Error: Could not initialize Project Agent."
-            
-        else:
-            return f"I have analyzed '{prompt}' based on my expertise in {agent.get('category')}. [Simulated Result]"
+                    yield f"Error: {str(e)}"
+                return
+        yield unavailable()
 
-    def get_trace(self):
-        return self.trace_log
+    def get_trace(self, context=None):
+        return self._context(context).trace
 
-    def run(self, prompt, user_id="admin"):
+    def run(self, prompt, user_id="admin", context=None):
         """
         Convenience method for one-shot execution (Plan + Execute).
         """
-        plan = self.plan(prompt, user_id)
-        if "error" in plan and "steps" not in plan:
-             return plan["error"], "N/A"
-             
-        response = self.execute()
+        with latency_metrics.stage("request"):
+            plan = self.plan(prompt, user_id, context)
+            if "error" in plan and "steps" not in plan:
+                 return plan["error"], "N/A"
+                 
+            response = self.execute(context)
         transaction_id = plan.get('transaction_id', 'unknown')
         return response, transaction_id
 
@@ -426,9 +413,11 @@ class OrchestratorAgent:
 orchestrator = OrchestratorAgent()
 
 def handle_request(prompt, user_id="admin"):
-    orchestrator.plan(prompt, user_id)
-    response = orchestrator.execute()
+    ctx = RequestContext(user_id)
+    with latency_metrics.stage("request"):
+        orchestrator.plan(prompt, user_id, ctx)
+        response = orchestrator.execute(ctx)
     return {
         "response": response,
-        "trace": orchestrator.get_trace()
+        "trace": ctx.trace
     }
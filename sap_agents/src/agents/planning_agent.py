@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 class MockPlanningLLM:
     def invoke(self, input_dict):
@@ -11,3 +12,5 @@ class MockPlanningLLM:
 
 def create_planning_agent():
     return MockPlanningLLM()
+
+register_agent("pl_planning", create_planning_agent, category="Planning", label="Planning Agent")
@@ -7,6 +7,8 @@ from dotenv import load_dotenv
 # Add parent directory to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from src.agents.dispatch import register_agent
+
 # Load environment variables
 load_dotenv()
 
@@ -137,6 +139,10 @@ Thought:{agent_scratchpad}'''
 
     return agent_executor
 
+# Registered by id only: the generic 'Procurement' category keeps its simulated answer
+register_agent("procurementnegotiationassistant", create_procurement_agent,
+               fallback=lambda prompt: run_offline_agent(prompt)['output'])
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='SAP Procurement Agent')
     parser.add_argument('--prompt', type=str, required=True, help='The user request')
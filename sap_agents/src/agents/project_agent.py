@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 # Mock Data for Project System (PPM)
 PROJECTS = {
@@ -20,3 +21,5 @@ class MockProjectLLM:
 
 def create_project_agent():
     return MockProjectLLM()
+
+register_agent("ppm_projects", create_project_agent, category="Project Management", label="Project Agent")
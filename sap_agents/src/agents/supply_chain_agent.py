@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 # Mock Data for Supply Chain (IBP)
 DEMAND_PLANS = {
@@ -37,3 +38,5 @@ def update_demand_forecast(product: str, quantity: int):
 
 def create_supply_chain_agent():
     return MockSupplyChainLLM()
+
+register_agent("scm_ibp", create_supply_chain_agent, category="Supply Chain", label="Supply Chain Agent")
@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 # Mock Data for Sustainability (Green Ledger)
 CARBON_METRICS = {
@@ -20,3 +21,5 @@ class MockSustainabilityLLM:
 
 def create_sustainability_agent():
     return MockSustainabilityLLM()
+
+register_agent("sus_sustainability", create_sustainability_agent, category="Sustainability", label="Sustainability Agent")
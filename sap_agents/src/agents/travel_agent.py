@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from src.agents.dispatch import register_agent
 
 # Mock Data for Travel (Concur)
 TRIPS = {
@@ -20,3 +21,5 @@ class MockTravelLLM:
 
 def create_travel_agent():
     return MockTravelLLM()
+
+register_agent("travel_agent", create_travel_agent, category="Travel", label="Travel Agent")
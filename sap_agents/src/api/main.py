@@ -1,19 +1,53 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
-from pydantic import BaseModel
+import time
+from typing import List, Optional, Union
+from pydantic import BaseModel, Field
 
-from src.api.routes import feedback, health
+from src.api.routes import feedback, health, metrics
+from src.api.serialization import FastJSONResponse, dumps
 from src.core.engine import engine
+from src.core.metrics import CHAT_REQUESTS, CHAT_LATENCY, record_error
+from src.core.pagination import MAX_PAGE_SIZE, InvalidCursor, parse_fields
 
 class ChatRequest(BaseModel):
     message: str
+    # Optional paging of the result rows: resume from a previous response's
+    # `next_cursor`, return at most `limit` rows, only `fields` ("id,status,total_value")
+    cursor: Optional[str] = None
+    limit: Optional[int] = Field(default=None, ge=1, le=MAX_PAGE_SIZE)
+    fields: Optional[Union[str, List[str]]] = None
+
+    def page_args(self):
+        return {"cursor": self.cursor, "limit": self.limit, "fields": parse_fields(self.fields)}
+
+# Largest accepted /api/chat/batch, and the analysis worker processes started
+# with the app for large batches (0 = analyze in-process)
+MAX_CHAT_BATCH = int(os.getenv("CHAT_BATCH_MAX_PROMPTS", "10000"))
+CHAT_BATCH_PROCESSES = int(os.getenv("CHAT_BATCH_PROCESSES", "0"))
+
+class ChatBatchRequest(BaseModel):
+    messages: List[str] = Field(min_length=1, max_length=MAX_CHAT_BATCH)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Fork the batch analysis workers before any request thread exists
+    if CHAT_BATCH_PROCESSES > 1:
+        engine.start_analysis_pool(CHAT_BATCH_PROCESSES)
+    yield
+    engine.stop_analysis_pool()
 
 app = FastAPI(
     title="Enterprise AI Platform API",
     description="Backend for the Enterprise SAP AI Agents",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -25,57 +59,161 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include Routers (Feedback & Health only)
+# Include Routers (Feedback, Health & Prometheus metrics)
 app.include_router(feedback.router, prefix="/api", tags=["Feedback"])
 app.include_router(health.router, prefix="/api", tags=["Health"])
+app.include_router(metrics.router, tags=["Metrics"])
 
-# Chat Endpoint (Using Reasoning Engine)
-@app.post("/api/chat")
-async def chat(request: ChatRequest):
-    try:
-        response = engine.execute(request.message)
+def format_chat_response(response):
+    """Shapes an engine.execute() result for the UI."""
+    if response["status"] == "success":
+        # Format the output for the UI
+        tool = response["tool_used"]
         
-        if response["status"] == "success":
-            # Format the output for the UI
-            tool = response["tool_used"]
-            
-            if "message" in response:
-                summary = response["message"]
-                data = []
-            else:
-                data = response["data"]
-                count = len(data) if isinstance(data, list) else 1
-                
-                # Generate a natural language summary
-                summary = f"I executed `{tool}` and found {count} results."
-                if count > 0 and isinstance(data, list):
-                    first_item = data[0]
-                    if "name" in first_item:
-                        summary += f" Including '{first_item['name']}'."
-                    elif "id" in first_item:
-                        summary += f" Example ID: {first_item['id']}."
-            
-            return {
-                "response": summary,
-                "data": data,
-                "trace": response["trace"],
-                "tool": tool
-            }
+        if "message" in response:
+            summary = response["message"]
+            data = []
         else:
-            return {
-                "response": f"I encountered an issue: {response.get('message')}",
-                "trace": response.get("trace"),
-                "error": True
-            }
+            data = response["data"]
+            count = len(data) if isinstance(data, list) else 1
+            if "page" in response:
+                count = response["page"]["total"]
             
+            # Generate a natural language summary
+            summary = f"I executed `{tool}` and found {count} results."
+            if count > 0 and isinstance(data, list):
+                first_item = data[0]
+                if "name" in first_item:
+                    summary += f" Including '{first_item['name']}'."
+                elif "id" in first_item:
+                    summary += f" Example ID: {first_item['id']}."
+        
+        result = {
+            "response": summary,
+            "data": data,
+            "trace": response["trace"],
+            "tool": tool
+        }
+        if "page" in response:
+            result.update(response["page"])
+        return result
+    else:
+        return {
+            "response": f"I encountered an issue: {response.get('message')}",
+            "trace": response.get("trace"),
+            "error": True
+        }
+
+# Chat Endpoint (Using Reasoning Engine)
+# Sync handler: the engine call is blocking, so FastAPI runs it on its
+# worker threadpool instead of stalling the event loop.
+# Returns a ready FastJSONResponse: large row lists skip jsonable_encoder.
+@app.post("/api/chat", response_class=FastJSONResponse)
+def chat(request: ChatRequest):
+    start = time.perf_counter()
+    status = "error"
+    try:
+        response = engine.execute(request.message, **request.page_args())
+        status = response["status"]
+        return FastJSONResponse(format_chat_response(response))
+
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Log the error for debugging
         print(f"Error in chat endpoint: {e}")
-        return {
+        record_error("api", e)
+        return FastJSONResponse({
             "response": f"System Error: {str(e)}",
             "trace": {"reasoning": ["System Error"]},
             "error": True
-        }
+        })
+    finally:
+        CHAT_REQUESTS.inc(endpoint="/api/chat", status=status)
+        CHAT_LATENCY.observe(time.perf_counter() - start, endpoint="/api/chat")
+
+# Batch Chat Endpoint (e.g. nightly reconciliation over templated questions)
+# One result per message, in order, shaped like /api/chat responses.
+# Duplicate messages and repeated tool calls are executed once.
+@app.post("/api/chat/batch", response_class=FastJSONResponse)
+def chat_batch(request: ChatBatchRequest):
+    start = time.perf_counter()
+    status = "error"
+    try:
+        responses = engine.execute_many(request.messages)
+        status = "success"
+        return FastJSONResponse({
+            "results": [format_chat_response(response) for response in responses],
+            "count": len(responses),
+        })
+    except Exception as e:
+        print(f"Error in chat batch endpoint: {e}")
+        record_error("api", e)
+        raise HTTPException(status_code=500, detail=f"System Error: {str(e)}")
+    finally:
+        CHAT_REQUESTS.inc(endpoint="/api/chat/batch", status=status)
+        CHAT_LATENCY.observe(time.perf_counter() - start, endpoint="/api/chat/batch")
+
+def _sse(event, data):
+    """One server-sent event frame."""
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+def _stream_chat(request, emit):
+    """
+    Worker-thread side of /api/chat/stream: runs the engine, forwarding its
+    progress events, then the result rows one by one and the summary.
+    """
+    start = time.perf_counter()
+    status = "error"
+    try:
+        response = engine.execute(request.message, on_event=emit, **request.page_args())
+        status = response["status"]
+        result = format_chat_response(response)
+        data = result.pop("data", [])
+        rows = data if isinstance(data, list) else [data]
+        for row in rows:
+            emit("row", row)
+        result["count"] = len(rows)
+        emit("result", result)
+    except Exception as e:
+        print(f"Error in chat stream: {e}")
+        record_error("api", e)
+        emit("error", {"response": f"System Error: {str(e)}", "error": True})
+    finally:
+        CHAT_REQUESTS.inc(endpoint="/api/chat/stream", status=status)
+        CHAT_LATENCY.observe(time.perf_counter() - start, endpoint="/api/chat/stream")
+
+# Streaming Chat Endpoint (Server-Sent Events)
+# Emits "start" at once, then "reasoning"/"hop" events while the engine
+# works, one "row" per result row, a final "result" summary and "done".
+# The engine runs on the worker threadpool; the event loop only relays.
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def emit(event, data):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+        except RuntimeError:
+            pass  # Loop closed: the client is gone
+
+    async def events():
+        yield _sse("start", {"message": request.message})
+        worker = asyncio.ensure_future(run_in_threadpool(_stream_chat, request, emit))
+        worker.add_done_callback(lambda _: emit(None, None))
+        while True:
+            event, data = await queue.get()
+            if event is None:
+                break
+            yield _sse(event, data)
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # Demo Data Endpoint (Provides real sample IDs for demo buttons)
 @app.get("/api/demo")
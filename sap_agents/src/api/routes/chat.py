@@ -1,23 +1,35 @@
+import time
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from src.agents.orchestrator import orchestrator
+from src.agents.orchestrator import orchestrator, RequestContext
 from src.services.human_handoff import confidence_engine
+from src.core.metrics import CHAT_REQUESTS, CHAT_LATENCY, record_error
 
 router = APIRouter()
 
 class ChatRequest(BaseModel):
     message: str
 
+# Sync handler: FastAPI runs it on its worker threadpool, and the
+# per-request context keeps concurrent chats isolated.
 @router.post("/chat")
-async def chat_endpoint(request: ChatRequest):
+def chat_endpoint(request: ChatRequest):
+    start = time.perf_counter()
+    status = "error"
     try:
         # 1. Get response from Orchestrator (already includes audit info)
-        final_response, transaction_id = orchestrator.run(request.message)
+        ctx = RequestContext()
+        final_response, transaction_id = orchestrator.run(request.message, context=ctx)
+        status = "success"
         
         return {
             "response": final_response,
-            "trace": orchestrator.get_trace()
+            "trace": ctx.trace
         }
         
     except Exception as e:
+        record_error("api", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        CHAT_REQUESTS.inc(endpoint="/chat", status=status)
+        CHAT_LATENCY.observe(time.perf_counter() - start, endpoint="/chat")
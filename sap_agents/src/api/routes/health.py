@@ -1,15 +1,22 @@
 from fastapi import APIRouter
 from src.services.monitoring_service import monitoring_service
 from src.services.enterprise_formula import enterprise_formula
+from src.agents.agent_pool import agent_pool
+from src.core.latency_metrics import latency_metrics
 
 router = APIRouter()
 
+# Sync handlers: get_system_health() flushes and reads the audit log, so
+# FastAPI runs them on its worker threadpool instead of the event loop.
 @router.get("/health")
-async def health_check():
-    return monitoring_service.get_system_health()
+def health_check():
+    health = monitoring_service.get_system_health()
+    health["agent_pool"] = agent_pool.stats()
+    health["latency"] = latency_metrics.snapshot()
+    return health
 
 @router.get("/formula")
-async def get_formula():
+def get_formula():
     # Get raw metrics from monitoring service
     health_data = monitoring_service.get_system_health()
     
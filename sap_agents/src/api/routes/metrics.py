@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.core.metrics import metrics, CONTENT_TYPE
+from src.core.meta_registry import registry
+from src.core.engine import engine
+
+router = APIRouter()
+
+def _cache_stats():
+    """(cache name, LRUCache stats) for every cache in the reasoning core."""
+    caches = [(f"tool:{name}", stats) for name, stats in registry.cache_stats().items()]
+    caches.append(("intent_plan", engine.plan_cache.stats()))
+    return caches
+
+# Cache counters already live on the caches; read them at scrape time
+metrics.collector("cache_hits_total", "Cache hits, by cache.", "counter",
+                  lambda: [({"cache": name}, stats["hits"]) for name, stats in _cache_stats()])
+metrics.collector("cache_misses_total", "Cache misses, by cache.", "counter",
+                  lambda: [({"cache": name}, stats["misses"]) for name, stats in _cache_stats()])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
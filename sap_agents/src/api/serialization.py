@@ -0,0 +1,27 @@
+"""
+JSON serialization for API payloads.
+Uses orjson when installed (several times faster on large row lists) and
+falls back to the standard library otherwise. Endpoints returning large
+payloads hand FastJSONResponse a ready dict, which also skips FastAPI's
+per-value jsonable_encoder pass.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,363 @@
+"""
+Bulk Synthetic Data Generator for the Mock SAP Database.
+Builds scale-factor sized, seeded datasets (TPC-style SF1/SF10/SF100) in
+vectorized NumPy batches and persists them as per-column .npy snapshots.
+
+SF1 matches the hand-tuned demo volumes of MockDatabase._generate_data:
+20 vendors, 50 materials, 200 POs (~70% invoiced), 150 sales orders, 50 employees.
+"""
+import argparse
+import json
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from faker import Faker
+
+PLANT_LOCATIONS = ['Berlin', 'New York', 'Singapore', 'Tokyo', 'London', 'Texas', 'Shanghai']
+MATERIAL_TYPES = ['Steel', 'Aluminum', 'Plastic', 'Electronics', 'Chemicals']
+VENDOR_RATINGS = ['A', 'B', 'C']
+PO_STATUSES = ['Open', 'Late', 'Received', 'Blocked']
+PO_STATUS_WEIGHTS = [0.4, 0.2, 0.3, 0.1]
+INVOICE_STATUSES = ['Paid', 'Pending', 'Blocked']
+SO_STATUSES = ['Open', 'Shipped', 'Delayed']
+DEPARTMENTS = ['IT', 'Sales', 'Finance', 'HR']
+COMPANY_SUFFIXES = ['Inc', 'and Sons', 'LLC', 'Group', 'PLC', 'Ltd']
+
+# Row counts at SF1
+BASE_VOLUMES = {
+    'vendors': 20,
+    'materials': 50,
+    'purchase_orders': 200,
+    'sales_orders': 150,
+    'customers': 150,
+    'employees': 50,
+}
+
+# Size of the Faker draws the string columns are composed from
+NAME_POOL_SIZE = 1000
+
+# Default day all generated dates are offset from: a fixed epoch rather than
+# today, so a seed reproduces the same snapshot whenever it is generated
+BASE_EPOCH = date(2025, 1, 1)
+
+MANIFEST_FILE = 'manifest.json'
+NO_VALUE = -1  # Sentinel for NULL in integer columns
+
+
+class SyntheticDataset:
+    """
+    Columnar dataset: per-table dicts of NumPy arrays plus the string
+    dictionaries that categorical columns index into.
+    """
+
+    def __init__(self, columns: Dict[str, Dict[str, np.ndarray]],
+                 dictionaries: Dict[str, List[str]], meta: Dict[str, Any]):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.meta = meta
+
+    # --- Row Materialization ---
+
+    @staticmethod
+    def _rows(fields: Dict[str, list]) -> List[Dict]:
+        keys = list(fields.keys())
+        return [dict(zip(keys, values)) for values in zip(*fields.values())]
+
+    @staticmethod
+    def _lookup(values: List[str], codes: np.ndarray) -> list:
+        return np.asarray(values, dtype=object)[codes].tolist()
+
+    @staticmethod
+    def _dates(days: np.ndarray) -> list:
+        return np.datetime_as_string(days, unit='D').tolist()
+
+    @staticmethod
+    def _optional(values: np.ndarray) -> list:
+        return [None if v == NO_VALUE else v for v in values.tolist()]
+
+    def to_tables(self) -> Dict[str, List[Dict]]:
+        """Materialize the MockDatabase row-dict tables."""
+        c, d = self.columns, self.dictionaries
+        plant_ids = c['plants']['id'].astype(str).tolist()
+        vendor_ids = c['vendors']['id'].astype(str)
+
+        tables = {}
+        tables['plants'] = self._rows({
+            'id': plant_ids,
+            'name': [f"Plant {loc}" for loc in PLANT_LOCATIONS],
+            'location': list(PLANT_LOCATIONS),
+            'code': [loc[:3].upper() for loc in PLANT_LOCATIONS],
+        })
+        tables['vendors'] = self._rows({
+            'id': vendor_ids.tolist(),
+            'name': d['vendor_names'],
+            'country': self._lookup(d['countries'], c['vendors']['country']),
+            'rating': self._lookup(VENDOR_RATINGS, c['vendors']['rating']),
+        })
+        tables['materials'] = self._rows({
+            'id': c['materials']['id'].astype(str).tolist(),
+            'name': d['material_names'],
+            'type': self._lookup(['Raw', 'Finished'], c['materials']['type']),
+            'price': c['materials']['price'].tolist(),
+        })
+
+        po = c['purchase_orders']
+        po_ids = po['id'].astype(str)
+        tables['purchase_orders'] = self._rows({
+            'id': po_ids.tolist(),
+            'vendor_id': vendor_ids[po['vendor']].tolist(),
+            'vendor_name': self._lookup(d['vendor_names'], po['vendor']),
+            'plant_id': self._lookup(plant_ids, po['plant']),
+            'plant_location': self._lookup(PLANT_LOCATIONS, po['plant']),
+            'date': self._dates(po['date']),
+            'status': self._lookup(PO_STATUSES, po['status']),
+            'total_value': po['total_value'].tolist(),
+            'delivery_days_actual': self._optional(po['delivery_days_actual']),
+            'delivery_days_promised': po['delivery_days_promised'].tolist(),
+        })
+
+        inv = c['invoices']
+        tables['invoices'] = self._rows({
+            'id': inv['id'].astype(str).tolist(),
+            'po_id': po_ids[inv['po']].tolist(),
+            'amount': po['total_value'][inv['po']].tolist(),
+            'status': self._lookup(INVOICE_STATUSES, inv['status']),
+            'due_date': self._dates(inv['due_date']),
+        })
+
+        so = c['sales_orders']
+        tables['sales_orders'] = self._rows({
+            'id': so['id'].astype(str).tolist(),
+            'customer': self._lookup(d['customer_names'], so['customer']),
+            'plant_id': self._lookup(plant_ids, so['plant']),
+            'status': self._lookup(SO_STATUSES, so['status']),
+            'delivery_date': self._dates(so['delivery_date']),
+        })
+
+        emp = c['employees']
+        tables['employees'] = self._rows({
+            'id': emp['id'].astype(str).tolist(),
+            'name': d['employee_names'],
+            'department': self._lookup(DEPARTMENTS, emp['department']),
+            'location': self._lookup(PLANT_LOCATIONS, emp['location']),
+        })
+        return tables
+
+    # --- Snapshot Persistence ---
+
+    def save(self, path: str):
+        """
+        Write the dataset as one .npy file per column plus a JSON manifest
+        holding the string dictionaries and generation parameters.
+        """
+        os.makedirs(path, exist_ok=True)
+        for table, cols in self.columns.items():
+            for name, values in cols.items():
+                np.save(os.path.join(path, f"{table}.{name}.npy"), values)
+        manifest = {
+            'meta': self.meta,
+            'dictionaries': self.dictionaries,
+            'columns': {table: list(cols.keys()) for table, cols in self.columns.items()},
+        }
+        with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> 'SyntheticDataset':
+        """
+        Load a snapshot with one sequential read per column. to_tables()
+        converts every column to Python values anyway, so memory-mapping
+        (mmap=True) only pays off for callers reading columns directly.
+        """
+        with open(os.path.join(path, MANIFEST_FILE), 'r') as f:
+            manifest = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        columns = {
+            table: {name: np.load(os.path.join(path, f"{table}.{name}.npy"), mmap_mode=mmap_mode)
+                    for name in names}
+            for table, names in manifest['columns'].items()
+        }
+        return cls(columns, manifest['dictionaries'], manifest['meta'])
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+
+class BulkDataGenerator:
+    """
+    Deterministic, scale-configurable generator.
+    Same (scale_factor, seed, base_date) always yields the same dataset.
+    """
+
+    def __init__(self, scale_factor: float = 1.0, seed: Optional[int] = None,
+                 base_date: Optional[date] = None):
+        if scale_factor <= 0:
+            raise ValueError("scale_factor must be positive.")
+        self.scale_factor = scale_factor
+        self.seed = seed
+        self.base_date = base_date or BASE_EPOCH
+        self.rng = np.random.default_rng(seed)
+        self.fake = Faker()
+        if seed is not None:
+            self.fake.seed_instance(seed)
+
+    def volume(self, table: str) -> int:
+        return max(1, int(round(BASE_VOLUMES[table] * self.scale_factor)))
+
+    # --- Vectorized Helpers ---
+
+    def _unique_ids(self, start: int, span: int, n: int) -> np.ndarray:
+        """n distinct integer ids in [start, start + max(span, n))."""
+        return start + self.rng.choice(max(span, n), size=n, replace=False)
+
+    def _dates(self, n: int, start_offset: int, end_offset: int) -> np.ndarray:
+        offsets = self.rng.integers(start_offset, end_offset + 1, size=n)
+        return np.datetime64(self.base_date, 'D') + offsets
+
+    def _choice(self, options: list, n: int, weights: Optional[list] = None) -> np.ndarray:
+        return self.rng.choice(len(options), size=n, p=weights).astype(np.int8)
+
+    def _pool(self, draw, size: int) -> List[str]:
+        """Pre-draw a pool of distinct Faker strings."""
+        seen = dict.fromkeys(draw() for _ in range(size))
+        return list(seen)
+
+    def _company_names(self, last_names: List[str], n: int) -> List[str]:
+        """
+        n distinct company names composed from the last-name pool in Faker's
+        '{last} {suffix}' and '{last}-{last}' formats.
+        """
+        n_last, n_suffix = len(last_names), len(COMPANY_SUFFIXES)
+        space_a = n_last * n_suffix
+        space = space_a + n_last * n_last
+        if n > space:
+            raise ValueError(f"Cannot build {n} distinct company names from a pool of {n_last}.")
+        keys = self.rng.choice(space, size=n, replace=False).tolist()
+        names = []
+        for k in keys:
+            if k < space_a:
+                names.append(f"{last_names[k // n_suffix]} {COMPANY_SUFFIXES[k % n_suffix]}")
+            else:
+                k -= space_a
+                names.append(f"{last_names[k // n_last]}-{last_names[k % n_last]}")
+        return names
+
+    def _person_names(self, first_names: List[str], last_names: List[str], n: int) -> List[str]:
+        first = self.rng.integers(0, len(first_names), size=n).tolist()
+        last = self.rng.integers(0, len(last_names), size=n).tolist()
+        return [f"{first_names[i]} {last_names[j]}" for i, j in zip(first, last)]
+
+    # --- Generation ---
+
+    def generate(self) -> SyntheticDataset:
+        rng = self.rng
+        n_vendors = self.volume('vendors')
+        n_materials = self.volume('materials')
+        n_pos = self.volume('purchase_orders')
+        n_sos = self.volume('sales_orders')
+        n_customers = self.volume('customers')
+        n_employees = self.volume('employees')
+
+        # String pools (the only per-value Faker calls)
+        last_names = self._pool(self.fake.last_name, NAME_POOL_SIZE)
+        first_names = self._pool(self.fake.first_name, NAME_POOL_SIZE)
+        words = self._pool(self.fake.word, NAME_POOL_SIZE)
+        countries = self._pool(self.fake.country, NAME_POOL_SIZE // 4)
+
+        material_type = self._choice(MATERIAL_TYPES, n_materials)
+        material_word = rng.integers(0, len(words), size=n_materials).tolist()
+        dictionaries = {
+            'vendor_names': self._company_names(last_names, n_vendors),
+            'customer_names': self._company_names(last_names, n_customers),
+            'material_names': [f"{MATERIAL_TYPES[t]} {words[w].capitalize()}"
+                               for t, w in zip(material_type.tolist(), material_word)],
+            'employee_names': self._person_names(first_names, last_names, n_employees),
+            'countries': countries,
+        }
+
+        columns: Dict[str, Dict[str, np.ndarray]] = {}
+        columns['plants'] = {
+            'id': self._unique_ids(1000, 9000, len(PLANT_LOCATIONS)),
+        }
+        columns['vendors'] = {
+            'id': self._unique_ids(50000, 50000, n_vendors),
+            'country': rng.integers(0, len(countries), size=n_vendors).astype(np.int32),
+            'rating': self._choice(VENDOR_RATINGS, n_vendors),
+        }
+        columns['materials'] = {
+            'id': self._unique_ids(100000, 900000, n_materials),
+            'type': self._choice(['Raw', 'Finished'], n_materials),
+            'price': np.round(rng.uniform(10.0, 500.0, size=n_materials), 2),
+        }
+
+        # Purchase Orders (MM)
+        po_status = self._choice(PO_STATUSES, n_pos, PO_STATUS_WEIGHTS)
+        received = po_status == PO_STATUSES.index('Received')
+        columns['purchase_orders'] = {
+            'id': self._unique_ids(4500000, 100000, n_pos),
+            'vendor': rng.integers(0, n_vendors, size=n_pos).astype(np.int32),
+            'plant': self._choice(PLANT_LOCATIONS, n_pos),
+            'date': self._dates(n_pos, -30, 30),
+            'status': po_status,
+            'total_value': np.round(rng.uniform(1000, 50000, size=n_pos), 2),
+            'delivery_days_actual': np.where(
+                received, rng.integers(1, 16, size=n_pos), NO_VALUE).astype(np.int16),
+            'delivery_days_promised': rng.integers(5, 11, size=n_pos).astype(np.int16),
+        }
+
+        # Invoices (FI): 70% of POs, blocked POs carry blocked invoices
+        invoiced = np.flatnonzero(rng.random(n_pos) > 0.3)
+        n_invoices = len(invoiced)
+        inv_status = rng.integers(0, 2, size=n_invoices).astype(np.int8)  # Paid / Pending
+        po_blocked = po_status[invoiced] == PO_STATUSES.index('Blocked')
+        inv_status[po_blocked] = INVOICE_STATUSES.index('Blocked')
+        columns['invoices'] = {
+            'id': self._unique_ids(51000000, 1000000, n_invoices),
+            'po': invoiced.astype(np.int32),
+            'status': inv_status,
+            'due_date': self._dates(n_invoices, -10, 30),
+        }
+
+        # Sales Orders (SD)
+        columns['sales_orders'] = {
+            'id': self._unique_ids(900000, 100000, n_sos),
+            'customer': rng.integers(0, n_customers, size=n_sos).astype(np.int32),
+            'plant': self._choice(PLANT_LOCATIONS, n_sos),
+            'status': self._choice(SO_STATUSES, n_sos),
+            'delivery_date': self._dates(n_sos, -5, 20),
+        }
+
+        # Employees (HR)
+        columns['employees'] = {
+            'id': self._unique_ids(1000, 9000, n_employees),
+            'department': self._choice(DEPARTMENTS, n_employees),
+            'location': self._choice(PLANT_LOCATIONS, n_employees),
+        }
+
+        meta = {
+            'scale_factor': self.scale_factor,
+            'seed': self.seed,
+            'base_date': self.base_date.isoformat(),
+        }
+        return SyntheticDataset(columns, dictionaries, meta)
+
+
+def build_snapshot(path: str, scale_factor: float, seed: Optional[int] = None) -> SyntheticDataset:
+    dataset = BulkDataGenerator(scale_factor, seed).generate()
+    dataset.save(path)
+    return dataset
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a Mock SAP data snapshot.")
+    parser.add_argument("--sf", type=float, default=1.0, help="Scale factor (SF1 = demo volumes)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--out", required=True, help="Snapshot directory")
+    args = parser.parse_args()
+
+    ds = build_snapshot(args.out, args.sf, args.seed)
+    counts = {table: len(next(iter(cols.values()))) for table, cols in ds.columns.items()}
+    print(f"[Data Generator] 💾 SF{args.sf:g} snapshot written to {args.out}: {counts}")
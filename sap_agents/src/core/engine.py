@@ -1,75 +1,94 @@
-import re
-from typing import Dict, List, Any
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
 from difflib import get_close_matches
 from src.core.meta_registry import registry
 from src.core.mock_sap import mock_db
 from src.core.graph_walker import graph_walker
+from src.core.entity_recognizer import entity_recognizer
+from src.core.intent_classifier import intent_classifier, normalize_prompt
+from src.core.cache import LRUCache
+from src.core.latency_metrics import latency_metrics
+from src.core.metrics import record_error
+from src.core.pagination import InvalidCursor, clamp_limit, decode_cursor, encode_cursor, paginate
+
+# Max distinct prompts whose analyze_intent plan is kept
+PLAN_CACHE_SIZE = 4096
+# Batches with fewer uncached prompts are analyzed in-process even when an
+# analysis pool is running (the round trip would cost more than it saves)
+POOL_MIN_BATCH = 256
 
 class ReasoningEngine:
     def __init__(self):
         self.registry = registry
         self.db = mock_db
         self.graph_walker = graph_walker
+        self.entities = entity_recognizer
+        self.classifier = intent_classifier
+        self.plan_cache = LRUCache(max_entries=PLAN_CACHE_SIZE)
+        self._analysis_pool = None   # (executor, entity version at fork, processes)
 
     def is_multihop_query(self, prompt: str) -> bool:
         """
         Detect if the query requires multi-hop reasoning.
         Patterns: "X of Y", "X for the Y of Z", "X linked to Y"
         """
-        multihop_patterns = [
-            r'(risk|invoice|vendor|order).*(of|for).*(po|invoice|order|vendor)',
-            r'find.*(for|of).*#?\d+',
-            r'(linked|related|associated|connected)\s+to',
-        ]
-        prompt_lower = prompt.lower()
-        return any(re.search(pattern, prompt_lower) for pattern in multihop_patterns)
+        return self.classifier.is_multihop(prompt.lower())
 
     def analyze_intent(self, prompt: str) -> Dict[str, Any]:
         """
         Analyzes the prompt to determine the likely tool and parameters.
+        Plans are cached per normalized prompt; the key includes the entity
+        recognizer version so master-data changes invalidate stale plans.
+        """
+        prompt_norm = normalize_prompt(prompt)
+        self.entities.sync()
+        key = (prompt_norm, self.entities.version)
+        plan = self.plan_cache.get(key)
+        if plan is None:
+            plan = self._analyze_intent(prompt_norm)
+            self.plan_cache.put(key, plan)
+        return self._copy_plan(plan)
+
+    @staticmethod
+    def _copy_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the mutable parts so callers cannot corrupt the cached plan."""
+        plan = dict(plan)
+        if "params" in plan:
+            plan["params"] = dict(plan["params"])
+        plan["reasoning"] = list(plan["reasoning"])
+        return plan
+
+    def _analyze_intent(self, prompt_lower: str) -> Dict[str, Any]:
+        """
+        Uncached intent analysis over the lowercased prompt.
         Uses fuzzy matching against the database and registry.
         """
-        prompt_lower = prompt.lower()
         plan = {"tool": None, "params": {}, "confidence": 0.0, "reasoning": []}
 
-        # 1. Identify Entities (Fuzzy Match against DB)
-        # Plants
-        for plant in self.db.plants:
-            if plant['location'].lower() in prompt_lower or plant['name'].lower() in prompt_lower:
-                plan["params"]["plant_loc"] = plant['location']
-                plan["reasoning"].append(f"Identified Plant Location: {plant['location']}")
-                break
-        
-        # Vendors
-        for vendor in self.db.vendors:
-            if vendor['name'].lower() in prompt_lower:
-                plan["params"]["vendor_name"] = vendor['name']
-                plan["reasoning"].append(f"Identified Vendor: {vendor['name']}")
-                break
-
-        # Customers
-        for so in self.db.sales_orders:
-             if so['customer'].lower() in prompt_lower:
-                plan["params"]["customer"] = so['customer']
-                plan["reasoning"].append(f"Identified Customer: {so['customer']}")
-                break
-
-        # Status Keywords
-        status_keywords = {
-            "late": "Late", "delayed": "Late",
-            "blocked": "Blocked", "hold": "Blocked",
-            "open": "Open", "pending": "Pending",
-            "paid": "Paid", "shipped": "Shipped"
-        }
-        for kw, status in status_keywords.items():
-            if kw in prompt_lower:
-                plan["params"]["status"] = status
-                plan["reasoning"].append(f"Identified Status: {status} (from '{kw}')")
-                break
+        # 1. Identify Entities (single automaton pass over the prompt)
+        entities = self.entities.recognize(prompt_lower)
+        if "plant" in entities:
+            plan["params"]["plant_loc"] = entities["plant"]
+            plan["reasoning"].append(f"Identified Plant Location: {entities['plant']}")
+
+        if "vendor" in entities:
+            plan["params"]["vendor_name"] = entities["vendor"]
+            plan["reasoning"].append(f"Identified Vendor: {entities['vendor']}")
+
+        if "customer" in entities:
+            plan["params"]["customer"] = entities["customer"]
+            plan["reasoning"].append(f"Identified Customer: {entities['customer']}")
+
+        # Status / Predictive / Entity-mention Keywords (one trie pass)
+        hits = self.classifier.keywords(prompt_lower)
+        if hits.status:
+            kw, status = hits.status
+            plan["params"]["status"] = status
+            plan["reasoning"].append(f"Identified Status: {status} (from '{kw}')")
 
         # Predictive Keywords (SAP RPT-1)
-        predictive_keywords = ["risk", "likely", "prediction", "forecast", "chance"]
-        is_predictive = any(kw in prompt_lower for kw in predictive_keywords)
+        is_predictive = hits.predictive
         if is_predictive:
              plan["reasoning"].append("Detected Predictive Intent (SAP RPT-1 Logic)")
 
@@ -77,7 +96,7 @@ class ReasoningEngine:
         # If the user explicitly mentions a generic entity ("vendor", "customer", "plant") 
         # but we failed to extract a specific name, we must ASK for it.
         
-        if "vendor" in prompt_lower and "vendor_name" not in plan["params"]:
+        if "vendor" in hits.mentions and "vendor_name" not in plan["params"]:
             return {
                 "tool": "clarification",
                 "message": "You mentioned a 'vendor', but I couldn't identify which one. Could you specify the Vendor Name? (e.g., 'Acme Corp', 'Globex')",
@@ -85,7 +104,7 @@ class ReasoningEngine:
                 "reasoning": plan["reasoning"] + ["Detected ambiguity: 'vendor' mentioned but no specific name found."]
             }
             
-        if "customer" in prompt_lower and "customer" not in plan["params"]:
+        if "customer" in hits.mentions and "customer" not in plan["params"]:
             return {
                 "tool": "clarification",
                 "message": "You mentioned a 'customer', but I missed the name. Which Customer are you referring to?",
@@ -93,7 +112,7 @@ class ReasoningEngine:
                 "reasoning": plan["reasoning"] + ["Detected ambiguity: 'customer' mentioned but no specific name found."]
             }
 
-        if "plant" in prompt_lower and "plant_loc" not in plan["params"]:
+        if "plant" in hits.mentions and "plant_loc" not in plan["params"]:
              return {
                 "tool": "clarification",
                 "message": "Which Plant location are you interested in? (e.g., 'Berlin', 'Texas')",
@@ -117,11 +136,11 @@ class ReasoningEngine:
             plan["tool"] = "find_sales_orders"
             plan["confidence"] = 0.9
         # If "Invoice" mentioned -> FI
-        elif "invoice" in prompt_lower:
+        elif "invoice" in hits.mentions:
             plan["tool"] = "find_invoices"
             plan["confidence"] = 0.8
         # If "Order" mentioned but no vendor/customer -> Ambiguous, default to PO if plant present
-        elif "order" in prompt_lower:
+        elif "order" in hits.mentions:
             if "plant_loc" in plan["params"]:
                  plan["tool"] = "find_purchase_orders" # Default assumption
                  plan["confidence"] = 0.7
@@ -134,17 +153,29 @@ class ReasoningEngine:
 
         return plan
 
-    def execute(self, prompt: str) -> Dict[str, Any]:
+    def execute(self, prompt: str, on_event: Optional[Callable[[str, Any], None]] = None,
+                cursor: Optional[str] = None, limit: Optional[int] = None,
+                fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Executes the reasoning loop: Analyze -> Plan -> Execute -> Verify.
         Supports multi-hop queries via Knowledge Graph traversal.
+        on_event(kind, payload) receives progress as it happens:
+        "reasoning" lines and GraphWalker "hop" trace entries.
+        With cursor/limit/fields, "data" is one page of projected rows and
+        "page" holds {"total", "next_cursor"}; tools page at the source.
         """
+        emit = on_event or (lambda kind, payload: None)
+        paged = cursor is not None or limit is not None or bool(fields)
         
         # 1. Check for multi-hop query (Knowledge Graph route)
         if self.is_multihop_query(prompt):
-            result = self.graph_walker.solve(prompt)
+            emit("reasoning", "Detected multi-hop query pattern.")
+            on_hop = (lambda hop: on_event("hop", hop)) if on_event else None
+            with latency_metrics.stage("graph_walk"):
+                result = self.graph_walker.solve(prompt, on_hop=on_hop)
             if result["status"] == "success":
-                return {
+                emit("reasoning", f"Graph traversal path: {result.get('path', 'N/A')}")
+                response = {
                     "status": "success",
                     "data": [result["data"]] if not isinstance(result["data"], list) else result["data"],
                     "tool_used": "GraphWalker",
@@ -158,11 +189,157 @@ class ReasoningEngine:
                     },
                     "graph_path": result.get("path")
                 }
+                if "fan_out" in result:
+                    response["fan_out"] = result["fan_out"]
+                if paged:
+                    rows = response["data"]
+                    after = decode_cursor(cursor, "GraphWalker", {"prompt": prompt}) if cursor else -1
+                    response["data"], last = paginate(rows, after, clamp_limit(limit), fields)
+                    response["page"] = {
+                        "total": len(rows),
+                        "next_cursor": encode_cursor("GraphWalker", {"prompt": prompt}, last) if last is not None else None,
+                    }
+                return response
             # Fall through to simple reasoning if graph fails
         
         # 2. Simple query path (single tool)
-        analysis = self.analyze_intent(prompt)
+        with latency_metrics.stage("intent_analysis"):
+            analysis = self.analyze_intent(prompt)
+        for line in analysis["reasoning"]:
+            emit("reasoning", line)
         
+        early = self._early_response(analysis)
+        if early is not None:
+            return early
+        tool_name = analysis["tool"]
+
+        # Execute Tool
+        try:
+            valid_params = self._tool_params(analysis)
+            
+            with latency_metrics.stage("tool_invoke"):
+                if paged:
+                    page = self.registry.invoke_page(tool_name, valid_params, cursor, limit, fields)
+                    result = page.pop("rows")
+                else:
+                    result = self.registry.invoke(tool_name, **valid_params)
+            
+            response = self._tool_response(analysis, valid_params, result)
+            if paged:
+                response["page"] = page
+            return response
+        except InvalidCursor:
+            raise  # Caller error, reported by the API as such
+        except Exception as e:
+            return self._tool_error(analysis, e)
+
+    def execute_many(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Executes a batch of prompts; returns one execute()-shaped result per
+        prompt, in order. Identical prompts run once. Single-tool prompts are
+        planned first, then grouped by tool so every distinct (tool, params)
+        call runs once through MetaRegistry.invoke_batch and its result is
+        fanned back out. Multi-hop prompts go through execute() one by one.
+        Large batches spread intent analysis over the analysis pool when one
+        was started (see start_analysis_pool).
+        """
+        distinct = list(dict.fromkeys(prompts))
+        responses: Dict[str, Dict[str, Any]] = {}
+        with latency_metrics.stage("batch"):
+            singles = []
+            for prompt in distinct:
+                if self.is_multihop_query(prompt):
+                    responses[prompt] = self.execute(prompt)
+                else:
+                    singles.append(prompt)
+
+            with latency_metrics.stage("intent_analysis"):
+                plans = self._analyze_many(singles)
+
+            # tool -> [(prompt, plan, params)]
+            calls: Dict[str, List[tuple]] = {}
+            for prompt in singles:
+                analysis = plans[prompt]
+                early = self._early_response(analysis)
+                if early is not None:
+                    responses[prompt] = early
+                    continue
+                params = self._tool_params(analysis)
+                calls.setdefault(analysis["tool"], []).append((prompt, analysis, params))
+
+            for tool_name, group in calls.items():
+                with latency_metrics.stage("tool_invoke"):
+                    try:
+                        results = self.registry.invoke_batch(tool_name, [params for _, _, params in group])
+                    except Exception:
+                        results = None  # Retried one by one below to isolate the failing calls
+                for i, (prompt, analysis, params) in enumerate(group):
+                    try:
+                        result = results[i] if results is not None else self.registry.invoke(tool_name, **params)
+                        responses[prompt] = self._tool_response(analysis, params, result)
+                    except Exception as e:
+                        responses[prompt] = self._tool_error(analysis, e)
+
+        # Shallow copies, so callers can annotate one result without touching its duplicates
+        return [dict(responses[prompt]) for prompt in prompts]
+
+    def start_analysis_pool(self, processes: int):
+        """
+        Starts the worker processes execute_many() spreads intent analysis
+        over; they are reused by every batch. Call once at startup, before
+        request or writer threads exist: workers are forked so they inherit
+        the master data instead of rebuilding it, and forking a threaded
+        process could leave them holding locks no thread will release.
+        Workers see the master data as of the fork; once it changes,
+        batches fall back to in-process analysis.
+        """
+        self.stop_analysis_pool()
+        if "fork" not in mp.get_all_start_methods():
+            print("[Engine] ⚠️ Analysis pool needs the 'fork' start method; analyzing in-process.")
+            return
+        self.entities.sync()
+        pool = ProcessPoolExecutor(processes, mp_context=mp.get_context("fork"),
+                                   initializer=_init_analysis_worker, initargs=(self,))
+        pool.submit(int).result()  # Fork every worker now rather than on the first batch
+        self._analysis_pool = (pool, self.entities.version, processes)
+
+    def stop_analysis_pool(self):
+        if self._analysis_pool is not None:
+            pool, _, _ = self._analysis_pool
+            self._analysis_pool = None
+            pool.shutdown()
+
+    def _analyze_many(self, prompts: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        analyze_intent() for many prompts: {prompt: plan}. Plans missing from
+        the cache are computed once per normalized prompt, on the analysis
+        pool for large batches (workers only run the lock-free
+        _analyze_intent over the recognizers inherited at fork time).
+        """
+        self.entities.sync()
+        version = self.entities.version
+        keys = {prompt: (normalize_prompt(prompt), version) for prompt in prompts}
+        plans = {}
+        for key in dict.fromkeys(keys.values()):
+            plan = self.plan_cache.get(key)
+            if plan is not None:
+                plans[key] = plan
+        missing = [key[0] for key in dict.fromkeys(keys.values()) if key not in plans]
+
+        pool = self._analysis_pool
+        if pool is not None and len(missing) >= POOL_MIN_BATCH and pool[1] == version:
+            executor, _, processes = pool
+            chunksize = max(1, len(missing) // (processes * 4))
+            computed = list(executor.map(_analyze_in_worker, missing, chunksize=chunksize))
+        else:
+            computed = [self._analyze_intent(prompt_norm) for prompt_norm in missing]
+        for prompt_norm, plan in zip(missing, computed):
+            plans[(prompt_norm, version)] = plan
+            self.plan_cache.put((prompt_norm, version), plan)
+        return {prompt: self._copy_plan(plans[key]) for prompt, key in keys.items()}
+
+    def _early_response(self, analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The response for a plan that does not lead to a tool call, else None."""
         if not analysis["tool"]:
             return {
                 "status": "error",
@@ -181,31 +358,44 @@ class ReasoningEngine:
             }
 
         tool_name = analysis["tool"]
-        tool_schema = self.registry.get_tool(tool_name)
-        
-        if not tool_schema:
+        if not self.registry.get_tool(tool_name):
              return {"status": "error", "message": f"Tool {tool_name} not found."}
+        return None
 
-        # Execute Tool
-        try:
-            # Filter params to only those accepted by the tool
-            valid_params = {k: v for k, v in analysis["params"].items() if k in tool_schema.inputs}
-            
-            result = tool_schema.func(**valid_params)
-            
-            return {
-                "status": "success",
-                "data": result,
-                "tool_used": tool_name,
-                "params_used": valid_params,
-                "trace": analysis
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": str(e),
-                "trace": analysis
-            }
+    def _tool_params(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        # Filter params to only those accepted by the tool
+        inputs = self.registry.get_tool(analysis["tool"]).inputs
+        return {k: v for k, v in analysis["params"].items() if k in inputs}
+
+    @staticmethod
+    def _tool_response(analysis: Dict[str, Any], params: Dict[str, Any], result: Any) -> Dict[str, Any]:
+        return {
+            "status": "success",
+            "data": result,
+            "tool_used": analysis["tool"],
+            "params_used": params,
+            "trace": analysis
+        }
+
+    @staticmethod
+    def _tool_error(analysis: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+        record_error("engine", e)
+        return {
+            "status": "error",
+            "message": str(e),
+            "trace": analysis
+        }
+
+# Worker side of the analysis pool (fork start method: the engine is
+# inherited, not pickled)
+_worker_engine: Optional[ReasoningEngine] = None
+
+def _init_analysis_worker(engine_: ReasoningEngine):
+    global _worker_engine
+    _worker_engine = engine_
+
+def _analyze_in_worker(prompt_norm: str) -> Dict[str, Any]:
+    return _worker_engine._analyze_intent(prompt_norm)
 
 # Singleton
 engine = ReasoningEngine()
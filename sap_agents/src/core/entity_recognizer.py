@@ -0,0 +1,209 @@
+"""
+Entity Recognizer: single-pass extraction of master-data names from prompts.
+An Aho-Corasick automaton over all plant, vendor and customer names replaces
+per-entity substring tests, so recognition cost depends on the prompt length
+(plus the number of hits) instead of the size of the master data.
+"""
+import threading
+from collections import deque
+from math import isqrt
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Smallest delta automaton merged into the base one (see EntityRecognizer.sync)
+MIN_DELTA_PATTERNS = 64
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string automaton.
+    Patterns are inserted into the trie incrementally; failure links are
+    recomputed lazily on the first search after an insert.
+    """
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Any]] = [[]]
+        self.output_link: List[int] = [-1]  # Nearest node on the fail chain with outputs
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return sum(len(out) for out in self.outputs)
+
+    def add(self, pattern: str, payload: Any):
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.output_link.append(-1)
+            node = nxt
+        self.outputs[node].append(payload)
+        self._dirty = True
+
+    def _build(self):
+        """BFS over the trie to (re)compute failure and output links."""
+        queue = deque()
+        for child in self.goto[0].values():
+            self.fail[child] = 0
+            self.output_link[child] = -1
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                fail = self.fail[child]
+                self.output_link[child] = fail if self.outputs[fail] else self.output_link[fail]
+                queue.append(child)
+        self._dirty = False
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yields (end_index, payload) for every pattern occurrence in text."""
+        if self._dirty:
+            self._build()
+        goto, fail, outputs, output_link = self.goto, self.fail, self.outputs, self.output_link
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if outputs[node] else output_link[node]
+            while hit > 0:
+                for payload in outputs[hit]:
+                    yield i, payload
+                hit = output_link[hit]
+
+
+class EntityRecognizer:
+    """
+    Recognizes plants, vendors and customers mentioned in a prompt.
+    Stays in sync with the master data lists by indexing rows appended since
+    the last call (the pattern set is reset only if a list is replaced).
+    Patterns live in two automata: a base one over most of them and a small
+    delta one over recent additions, so an append rebuilds only the delta.
+    When several entities of one kind match, the one listed first in the
+    master data wins, matching the previous first-hit loop semantics.
+    """
+
+    # kind -> (MockDatabase attribute, fields whose values are patterns, value field)
+    SOURCES = {
+        "plant": ("plants", ("location", "name"), "location"),
+        "vendor": ("vendors", ("name",), "name"),
+        "customer": ("sales_orders", ("customer",), "customer"),
+    }
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()   # Serializes rebuilds; readers never take it
+        self._generation = 0
+        self._clear()
+        self.automata: Tuple[AhoCorasick, ...] = ()
+        self._version: Tuple[int, ...] = (self._generation,)
+
+    def _clear(self):
+        self._patterns: List[Tuple[str, Any]] = []
+        self._base: Optional[AhoCorasick] = None   # Over _patterns[:_delta_start]
+        self._delta_start = 0
+        self._watermarks: Dict[str, Tuple[int, int]] = {}  # kind -> (id(list), rows indexed)
+        self._seen: Dict[str, set] = {kind: set() for kind in self.SOURCES}
+        self._generation += 1
+
+    @property
+    def version(self) -> Tuple[int, ...]:
+        """Changes whenever the set of recognizable entities changes."""
+        return self._version
+
+    def _stale(self) -> bool:
+        for kind, (attr, _, _) in self.SOURCES.items():
+            rows = getattr(self.db, attr)
+            if self._watermarks.get(kind) != (id(rows), len(rows)):
+                return True
+        return False
+
+    def sync(self):
+        """
+        Index master-data rows added since the last sync.
+        New patterns go into the delta automaton, which is rebuilt from the
+        delta's patterns only; once the delta outgrows the square root of
+        the pattern count (at least MIN_DELTA_PATTERNS) everything is merged
+        into a new base automaton. That keeps an append at O(sqrt(patterns))
+        amortized instead of a full rebuild each time.
+        Automata in use are never modified: new ones are built and swapped
+        in together, so concurrent recognize() calls see either the old or
+        the new pair, never a half-built trie.
+        """
+        if not self._stale():
+            return
+        with self._lock:
+            if not self._stale():
+                return
+            for kind, (attr, _, _) in self.SOURCES.items():
+                rows = getattr(self.db, attr)
+                list_id, indexed = self._watermarks.get(kind, (id(rows), 0))
+                if list_id != id(rows) or indexed > len(rows):
+                    self._clear()
+                    break
+            watermarks = dict(self._watermarks)
+            for kind, (attr, fields, value_field) in self.SOURCES.items():
+                rows = getattr(self.db, attr)
+                _, indexed = watermarks.get(kind, (id(rows), 0))
+                end = len(rows)
+                for rank in range(indexed, end):
+                    row = rows[rank]
+                    for field in fields:
+                        pattern = str(row.get(field) or "").lower()
+                        if pattern and pattern not in self._seen[kind]:
+                            self._seen[kind].add(pattern)
+                            self._patterns.append((pattern, (kind, rank, row[value_field])))
+                watermarks[kind] = (id(rows), end)
+            delta = self._patterns[self._delta_start:]
+            if self._base is None or len(delta) > max(MIN_DELTA_PATTERNS, isqrt(len(self._patterns))):
+                self._base = self._build(self._patterns)
+                self._delta_start = len(self._patterns)
+                delta = []
+            self._watermarks = watermarks
+            self.automata = (self._base, self._build(delta)) if delta else (self._base,)
+            self._version = (self._generation,) + tuple(indexed for _, indexed in watermarks.values())
+
+    def recognize(self, text: str) -> Dict[str, str]:
+        """
+        Returns {kind: value} for each entity kind found in text
+        (text is matched case-insensitively).
+        """
+        self.sync()
+        text = text.lower()
+        best: Dict[str, Tuple[int, str]] = {}
+        for automaton in self.automata:  # One consistent snapshot for the whole scan
+            for _, (kind, rank, value) in automaton.iter_matches(text):
+                current = best.get(kind)
+                if current is None or rank < current[0]:
+                    best[kind] = (rank, value)
+        return {kind: value for kind, (_, value) in best.items()}
+
+    @staticmethod
+    def _build(patterns: List[Tuple[str, Any]]) -> AhoCorasick:
+        automaton = AhoCorasick()
+        for pattern, payload in patterns:
+            automaton.add(pattern, payload)
+        automaton._build()
+        return automaton
+
+
+def create_entity_recognizer(db=None) -> EntityRecognizer:
+    if db is None:
+        from src.core.mock_sap import mock_db
+        db = mock_db
+    return EntityRecognizer(db)
+
+# Singleton
+entity_recognizer = create_entity_recognizer()
@@ -1,10 +1,21 @@
 """
 Graph Walker: Executes multi-hop queries by traversing the Knowledge Graph.
 """
-from typing import Dict, Any, List, Optional
+import re
+from typing import Callable, Dict, Any, List, Optional
 from src.core.knowledge_graph import knowledge_graph, GraphEdge
 from src.core.meta_registry import registry
 from src.core.mock_sap import mock_db
+from src.core.entity_recognizer import entity_recognizer
+from src.core.metrics import GRAPH_HOPS, record_error
+
+# Set-at-a-time queries: "risk for all vendors of blocked invoices"
+SET_QUERY_PATTERN = re.compile(r'\b(all|every|each)\b')
+START_STATUS_KEYWORDS = {
+    "Invoice": {"blocked": "Blocked", "hold": "Blocked", "pending": "Pending", "paid": "Paid"},
+    "PurchaseOrder": {"late": "Late", "delayed": "Late", "blocked": "Blocked",
+                      "open": "Open", "received": "Received"},
+}
 
 class GraphWalker:
     """
@@ -16,6 +27,7 @@ class GraphWalker:
         self.graph = knowledge_graph
         self.registry = registry
         self.db = mock_db
+        self.entities = entity_recognizer
         
     def detect_entities(self, prompt: str) -> Dict[str, Any]:
         """
@@ -23,7 +35,7 @@ class GraphWalker:
         Returns: {"start_entity": "Invoice", "start_value": "999", "end_entity": "RiskAssessment"}
         """
         prompt_lower = prompt.lower()
-        result = {"start_entity": None, "start_value": None, "end_entity": None}
+        result = {"start_entity": None, "start_value": None, "start_status": None, "end_entity": None}
         
         # Detect target entity (what we want to find)
         if any(kw in prompt_lower for kw in ["risk", "prediction", "forecast"]):
@@ -54,26 +66,38 @@ class GraphWalker:
         elif "vendor" in prompt_lower:
             result["start_entity"] = "Vendor"
             # Try to extract vendor name (check against DB)
-            for vendor in self.db.vendors:
-                if vendor['name'].lower() in prompt_lower:
-                    result["start_value"] = vendor['name']
-                    break
+            result["start_value"] = self.entities.recognize(prompt_lower).get("vendor")
+            
+        # Status filter on the source entity (used for set-at-a-time queries)
+        for kw, status in START_STATUS_KEYWORDS.get(result["start_entity"], {}).items():
+            if kw in prompt_lower:
+                result["start_status"] = status
+                break
                     
         return result
 
-    def execute_path(self, path: List[GraphEdge], start_data: Any) -> Dict[str, Any]:
+    def execute_path(self, path: List[GraphEdge], start_data: Any, batched: bool = False,
+                     on_hop: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Execute a chain of tool calls along the graph path.
         
         Args:
             path: List of edges to traverse
             start_data: Initial data (e.g., an Invoice object)
+            batched: Carry every entity of start_data (not just the first)
+                through each hop, with one tool call per hop
+            on_hop: Called with each traversal trace entry as soon as the
+                hop completes (e.g. to stream progress)
             
         Returns:
             Final result after all traversals
         """
+        if batched:
+            return self._execute_path_batched(path, start_data, on_hop)
+            
         current_data = start_data
         trace = []
+        record = self._trace_recorder(trace, on_hop)
         
         for edge in path:
             tool_schema = self.registry.get_tool(edge.tool_name)
@@ -87,7 +111,7 @@ class GraphWalker:
                         current_data = {"name": current_data.get("vendor_name")}
                     elif isinstance(current_data, list) and current_data:
                         current_data = {"name": current_data[0].get("vendor_name")}
-                    trace.append({
+                    record({
                         "step": f"{edge.source} -> {edge.target}",
                         "tool": edge.tool_name,
                         "result": f"Extracted vendor: {current_data.get('name', 'N/A')}"
@@ -103,9 +127,8 @@ class GraphWalker:
                         po_id = current_data[0].get("po_id")
                     
                     if po_id:
-                        pos = [p for p in self.db.purchase_orders if p['id'] == po_id]
-                        current_data = pos[0] if pos else {}
-                    trace.append({
+                        current_data = self.db.get_po(po_id) or {}
+                    record({
                         "step": f"{edge.source} -> {edge.target}",
                         "tool": edge.tool_name,
                         "result": f"Fetched PO #{po_id}"
@@ -118,7 +141,7 @@ class GraphWalker:
                         current_data = {"name": current_data.get("customer")}
                     elif isinstance(current_data, list) and current_data:
                         current_data = {"name": current_data[0].get("customer")}
-                    trace.append({
+                    record({
                         "step": f"{edge.source} -> {edge.target}",
                         "tool": edge.tool_name,
                         "result": f"Extracted customer: {current_data.get('name', 'N/A')}"
@@ -126,7 +149,7 @@ class GraphWalker:
                     continue
                     
                 else:
-                    trace.append({"step": edge.relation, "error": f"Tool {edge.tool_name} not found"})
+                    record({"step": edge.relation, "error": f"Tool {edge.tool_name} not found"})
                     continue
             
             # Build parameters from current data
@@ -144,8 +167,8 @@ class GraphWalker:
             
             # Execute tool
             try:
-                result = tool_schema.func(**params)
-                trace.append({
+                result = self.registry.invoke(edge.tool_name, **params)
+                record({
                     "step": f"{edge.source} --({edge.relation})--> {edge.target}",
                     "tool": edge.tool_name,
                     "params": params,
@@ -153,7 +176,8 @@ class GraphWalker:
                 })
                 current_data = result
             except Exception as e:
-                trace.append({"step": edge.relation, "error": str(e)})
+                record_error("graph_walker", e)
+                record({"step": edge.relation, "error": str(e)})
                 break
                 
         return {
@@ -161,12 +185,133 @@ class GraphWalker:
             "traversal_trace": trace
         }
 
-    def solve(self, prompt: str) -> Dict[str, Any]:
+    @staticmethod
+    def _trace_recorder(trace: List[Dict[str, Any]], on_hop: Optional[Callable[[Dict[str, Any]], None]]):
+        """Appends a trace entry and reports it to on_hop, if given."""
+        if on_hop is None:
+            return trace.append
+        def record(entry):
+            trace.append(entry)
+            on_hop(entry)
+        return record
+
+    # --- Set-at-a-time Execution ---
+
+    VIRTUAL_EXTRACTORS = {
+        "get_vendor_from_po": ("vendor_name", "vendor"),
+        "get_customer_from_so": ("customer", "customer"),
+    }
+
+    def _execute_path_batched(self, path: List[GraphEdge], start_data: Any,
+                              on_hop: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Carries the full frontier of entities through each edge.
+        Each hop issues a single (batched) tool call over the deduplicated
+        parameter sets of the frontier, so cost is one call per hop instead
+        of one call per hop per entity.
+        """
+        if isinstance(start_data, list):
+            frontier = [e for e in start_data if isinstance(e, dict)]
+        else:
+            frontier = [start_data] if isinstance(start_data, dict) else []
+        trace = []
+        record = self._trace_recorder(trace, on_hop)
+        fan_out = []
+        
+        for edge in path:
+            step = f"{edge.source} --({edge.relation})--> {edge.target}"
+            tool_schema = self.registry.get_tool(edge.tool_name)
+            
+            if not tool_schema:
+                # Virtual tools (data extraction without API call)
+                if edge.tool_name in self.VIRTUAL_EXTRACTORS:
+                    field, label = self.VIRTUAL_EXTRACTORS[edge.tool_name]
+                    names = list(dict.fromkeys(e.get(field) for e in frontier if e.get(field)))
+                    fan_out = [{"input": {field: n}, "result": {"name": n}} for n in names]
+                    frontier = [{"name": n} for n in names]
+                    record({
+                        "step": step,
+                        "tool": edge.tool_name,
+                        "result": f"Extracted {len(names)} distinct {label}(s)"
+                    })
+                    continue
+                    
+                elif edge.tool_name == "get_po_from_invoice":
+                    po_ids = list(dict.fromkeys(e.get("po_id") for e in frontier if e.get("po_id")))
+                    pos = [p for p in map(self.db.get_po, po_ids) if p]
+                    fan_out = [{"input": {"po_id": p['id']}, "result": p} for p in pos]
+                    frontier = pos
+                    record({
+                        "step": step,
+                        "tool": edge.tool_name,
+                        "result": f"Fetched {len(pos)} PO(s) for {len(po_ids)} distinct PO id(s)"
+                    })
+                    continue
+                    
+                else:
+                    record({"step": edge.relation, "error": f"Tool {edge.tool_name} not found"})
+                    continue
+            
+            # Build one parameter set per frontier entity
+            param_sets = []
+            for entity in frontier:
+                params = {}
+                for source_attr, tool_param in edge.param_map.items():
+                    if source_attr in entity:
+                        params[tool_param] = entity[source_attr]
+                    elif source_attr == "name" and "vendor_name" in entity:
+                        params[tool_param] = entity["vendor_name"]
+                if params:
+                    param_sets.append(params)
+            distinct = list({tuple(sorted(p.items())): p for p in param_sets}.values())
+            
+            try:
+                results = self.registry.invoke_batch(edge.tool_name, distinct) if distinct else []
+            except Exception as e:
+                record_error("graph_walker", e)
+                record({"step": edge.relation, "error": str(e)})
+                break
+                
+            fan_out = [{"input": params, "result": result} for params, result in zip(distinct, results)]
+            next_frontier = []
+            seen_ids = set()
+            for result in results:
+                for item in (result if isinstance(result, list) else [result]):
+                    if not isinstance(item, dict):
+                        continue
+                    item_id = item.get("id")
+                    if item_id is not None:
+                        if item_id in seen_ids:
+                            continue
+                        seen_ids.add(item_id)
+                    next_frontier.append(item)
+            frontier = next_frontier
+            record({
+                "step": step,
+                "tool": edge.tool_name,
+                "batch_size": len(distinct),
+                "result_count": len(frontier)
+            })
+            
+        return {
+            "final_result": frontier,
+            "fan_out": fan_out,
+            "traversal_trace": trace
+        }
+
+    def solve(self, prompt: str, batched: Optional[bool] = None,
+              on_hop: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Main entry point: Solve a multi-hop query.
         
         Example: "Find the risk for the vendor of PO #4500123"
+        Set queries ("risk for all vendors of blocked invoices") run batched;
+        pass `batched` to force either mode. `on_hop` receives each hop's
+        trace entry as it completes.
         """
+        if batched is None:
+            batched = bool(SET_QUERY_PATTERN.search(prompt.lower()))
+            
         # 1. Detect entities
         entities = self.detect_entities(prompt)
         
@@ -187,8 +332,13 @@ class GraphWalker:
                 "entities_detected": entities
             }
             
-        # 3. Get starting data
-        start_data = self._get_start_data(entities)
+        # 3. Get starting data (a whole entity set for batched queries without an ID)
+        start_data = None
+        if batched and path and not entities["start_value"]:
+            start_data = self._get_start_set(entities)
+        if not start_data:
+            start_data = self._get_start_data(entities)
+            batched = batched and isinstance(start_data, list)
         
         if not start_data:
             return {
@@ -198,9 +348,10 @@ class GraphWalker:
             }
             
         # 4. Execute the path
-        result = self.execute_path(path, start_data)
+        GRAPH_HOPS.observe(len(path))
+        result = self.execute_path(path, start_data, batched=batched, on_hop=on_hop)
         
-        return {
+        response = {
             "status": "success",
             "data": result["final_result"],
             "path": self.graph.explain_path(path),
@@ -208,6 +359,9 @@ class GraphWalker:
             "tool_used": "GraphWalker",
             "confidence": 0.95
         }
+        if batched:
+            response["fan_out"] = result["fan_out"]
+        return response
         
     def _get_start_data(self, entities: Dict) -> Optional[Any]:
         """Fetch the starting entity data."""
@@ -215,17 +369,33 @@ class GraphWalker:
         value = entities["start_value"]
         
         if entity_type == "Invoice" and value:
-            invoices = [i for i in self.db.invoices if value in i['id']]
-            return invoices[0] if invoices else None
+            invoice = self.db.get_invoice(value)
+            if invoice is None:
+                # Exact key miss: fall back to partial ID match
+                invoice = next((i for i in self.db.invoices if value in i['id']), None)
+            return invoice
             
         elif entity_type == "PurchaseOrder" and value:
-            pos = [p for p in self.db.purchase_orders if value in p['id']]
-            return pos[0] if pos else None
+            po = self.db.get_po(value)
+            if po is None:
+                po = next((p for p in self.db.purchase_orders if value in p['id']), None)
+            return po
             
         elif entity_type == "Vendor" and value:
             return {"name": value}
             
         return None
 
+    def _get_start_set(self, entities: Dict) -> Optional[List[Dict]]:
+        """Fetch every starting entity matching the detected status filter."""
+        status = entities.get("start_status")
+        if not status:
+            return None
+        if entities["start_entity"] == "Invoice":
+            return self.db.find_invoices(status=status) or None
+        if entities["start_entity"] == "PurchaseOrder":
+            return self.db.find_pos(status=status) or None
+        return None
+
 # Singleton
 graph_walker = GraphWalker()
@@ -0,0 +1,164 @@
+"""
+Indexed In-Memory Table Store for the Mock SAP Database.
+Answers filter queries through per-field indexes instead of full list scans,
+so lookup cost scales with the result size rather than the table size.
+"""
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.core.pagination import MAX_PAGE_SIZE, page_positions, project
+
+# Match modes understood by IndexedTable.select()
+EXACT = "exact"        # Case-insensitive equality
+CONTAINS = "contains"  # Case-insensitive substring
+
+
+class FieldIndex:
+    """
+    Index over a single field.
+    - Hash part: lowercased value -> set of row positions (exact lookups).
+    - Substring part (optional): sorted list of (suffix, value) pairs over the
+      distinct lowercased values. A needle is a substring of a value iff it is a
+      prefix of one of its suffixes, so 'contains' becomes a bisect + range scan.
+    """
+
+    def __init__(self, field: str, substring: bool = False):
+        self.field = field
+        self.substring = substring
+        self.buckets: Dict[str, Set[int]] = {}
+        self._suffixes: Optional[List[Tuple[str, str]]] = None  # Rebuilt lazily
+
+    @staticmethod
+    def normalize(value: Any) -> str:
+        return str(value).lower()
+
+    def add(self, value: Any, pos: int):
+        if value is None:
+            return
+        key = self.normalize(value)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = set()
+            self._suffixes = None  # New distinct value -> suffix list is stale
+        bucket.add(pos)
+
+    def remove(self, value: Any, pos: int):
+        if value is None:
+            return
+        key = self.normalize(value)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return
+        bucket.discard(pos)
+        if not bucket:
+            del self.buckets[key]
+            self._suffixes = None
+
+    def exact(self, value: Any) -> Set[int]:
+        return self.buckets.get(self.normalize(value), set())
+
+    def contains(self, value: Any) -> Set[int]:
+        if not self.substring:
+            raise ValueError(f"Field '{self.field}' has no substring index.")
+        needle = self.normalize(value)
+        suffixes = self._suffix_list()
+        i = bisect_left(suffixes, (needle, ""))
+        keys = set()
+        while i < len(suffixes) and suffixes[i][0].startswith(needle):
+            keys.add(suffixes[i][1])
+            i += 1
+        if len(keys) == 1:
+            return self.buckets[keys.pop()]
+        result: Set[int] = set()
+        for key in keys:
+            result |= self.buckets[key]
+        return result
+
+    def _suffix_list(self) -> List[Tuple[str, str]]:
+        if self._suffixes is None:
+            self._suffixes = sorted(
+                (key[i:], key) for key in self.buckets for i in range(len(key))
+            )
+        return self._suffixes
+
+
+class IndexedTable:
+    """
+    A list of row dicts plus field indexes kept in sync on insert/update.
+    The `rows` list is exposed as-is so existing callers that iterate the
+    table (e.g. `mock_db.purchase_orders`) keep working unchanged.
+    """
+
+    def __init__(self, rows: Optional[List[Dict]] = None,
+                 exact: Iterable[str] = (), substring: Iterable[str] = ()):
+        self.rows: List[Dict] = rows if rows is not None else []
+        self.indexes: Dict[str, FieldIndex] = {}
+        for field in exact:
+            self.indexes[field] = FieldIndex(field)
+        for field in substring:
+            self.indexes[field] = FieldIndex(field, substring=True)
+        for pos, row in enumerate(self.rows):
+            self._index_row(row, pos)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _index_row(self, row: Dict, pos: int):
+        for field, index in self.indexes.items():
+            index.add(row.get(field), pos)
+
+    def insert(self, row: Dict) -> int:
+        """Append a row and index it. Returns its position."""
+        pos = len(self.rows)
+        self.rows.append(row)
+        self._index_row(row, pos)
+        return pos
+
+    def update(self, pos: int, **changes):
+        """Update fields of the row at `pos`, re-indexing the changed fields."""
+        row = self.rows[pos]
+        for field, value in changes.items():
+            index = self.indexes.get(field)
+            if index is not None:
+                index.remove(row.get(field), pos)
+                index.add(value, pos)
+            row[field] = value
+
+    def lookup(self, field: str, value: Any, match: str = EXACT) -> Set[int]:
+        """Row positions whose `field` matches `value`."""
+        index = self.indexes[field]
+        if match == CONTAINS:
+            return index.contains(value)
+        return index.exact(value)
+
+    def positions(self, filters: List[Tuple[str, Any, str]]) -> List[int]:
+        """
+        Row positions matching all (field, value, match) filters, in insertion
+        order. Filters are intersected smallest-first.
+        """
+        if not filters:
+            return list(range(len(self.rows)))
+        candidates = sorted((self.lookup(f, v, m) for f, v, m in filters), key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            if not result:
+                break
+            result = result & other
+        return sorted(result)
+
+    def select(self, filters: List[Tuple[str, Any, str]]) -> List[Dict]:
+        """Rows matching all filters, in insertion order."""
+        if not filters:
+            return self.rows
+        return [self.rows[pos] for pos in self.positions(filters)]
+
+    def page(self, filters: List[Tuple[str, Any, str]], after: int = -1, limit: int = MAX_PAGE_SIZE,
+             fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict], int, Optional[int]]:
+        """
+        One page of select(): up to `limit` matching rows positioned after
+        `after`, projected to `fields`. Only rows on the page are touched.
+        Returns (rows, total matches, position to resume after or None).
+        """
+        positions = self.positions(filters) if filters else range(len(self.rows))
+        window, last = page_positions(positions, after, limit)
+        return [project(self.rows[pos], fields) for pos in window], len(positions), last
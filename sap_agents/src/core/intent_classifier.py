@@ -0,0 +1,76 @@
+"""
+Intent Classifier: compiled once at import, reused for every prompt.
+- Multi-hop detection: one combined alternation regex.
+- Keyword routing (status, predictive, generic entity mentions): one
+  keyword trie (Aho-Corasick) pass over the prompt.
+"""
+import re
+from typing import Optional, Set, Tuple
+
+from src.core.entity_recognizer import AhoCorasick
+
+# Patterns: "X of Y", "X for the Y of Z", "X linked to Y"
+MULTIHOP_PATTERNS = [
+    r'(risk|invoice|vendor|order).*(of|for).*(po|invoice|order|vendor)',
+    r'find.*(for|of).*#?\d+',
+    r'(linked|related|associated|connected)\s+to',
+]
+
+# Earlier entries win when several keywords are present
+STATUS_KEYWORDS = {
+    "late": "Late", "delayed": "Late",
+    "blocked": "Blocked", "hold": "Blocked",
+    "open": "Open", "pending": "Pending",
+    "paid": "Paid", "shipped": "Shipped"
+}
+
+PREDICTIVE_KEYWORDS = ["risk", "likely", "prediction", "forecast", "chance"]
+
+# Generic entity words that drive ambiguity detection and tool selection
+MENTION_KEYWORDS = ["vendor", "customer", "plant", "invoice", "order"]
+
+
+class KeywordHits:
+    """Keyword signals found in a prompt."""
+
+    def __init__(self, status: Optional[Tuple[str, str]], predictive: bool, mentions: Set[str]):
+        self.status = status          # (keyword, status) or None
+        self.predictive = predictive
+        self.mentions = mentions
+
+
+class IntentClassifier:
+    def __init__(self):
+        self.multihop_regex = re.compile("|".join(f"(?:{p})" for p in MULTIHOP_PATTERNS))
+        self.keyword_trie = AhoCorasick()
+        for rank, (kw, status) in enumerate(STATUS_KEYWORDS.items()):
+            self.keyword_trie.add(kw, ("status", rank, (kw, status)))
+        for kw in PREDICTIVE_KEYWORDS:
+            self.keyword_trie.add(kw, ("predictive", 0, kw))
+        for kw in MENTION_KEYWORDS:
+            self.keyword_trie.add(kw, ("mention", 0, kw))
+
+    def is_multihop(self, prompt_lower: str) -> bool:
+        return self.multihop_regex.search(prompt_lower) is not None
+
+    def keywords(self, prompt_lower: str) -> KeywordHits:
+        status_rank, status = len(STATUS_KEYWORDS), None
+        predictive = False
+        mentions: Set[str] = set()
+        for _, (group, rank, value) in self.keyword_trie.iter_matches(prompt_lower):
+            if group == "status":
+                if rank < status_rank:
+                    status_rank, status = rank, value
+            elif group == "predictive":
+                predictive = True
+            else:
+                mentions.add(value)
+        return KeywordHits(status, predictive, mentions)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Cache key form of a prompt: lowercased, whitespace collapsed."""
+    return " ".join(prompt.lower().split())
+
+# Singleton (compiled at import)
+intent_classifier = IntentClassifier()
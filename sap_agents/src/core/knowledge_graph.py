@@ -25,13 +25,17 @@ class BusinessGraph:
     """
     Semantic Knowledge Graph for SAP Business Logic.
     Supports BFS pathfinding to discover tool chains.
+    Shortest paths are precomputed (one BFS tree per source node) and
+    invalidated whenever a node or edge is added.
     """
     
     def __init__(self):
         self.nodes: Dict[str, GraphNode] = {}
         self.edges: List[GraphEdge] = []
         self.adjacency: Dict[str, List[GraphEdge]] = {}
+        self._path_table: Optional[Dict[Tuple[str, str], Tuple[GraphEdge, ...]]] = None
         self._build_graph()
+        self._build_path_table()
 
     def _build_graph(self):
         """Populate the graph with SAP entities and relationships."""
@@ -131,20 +135,54 @@ class BusinessGraph:
     def _add_node(self, name: str, attributes: List[str]):
         self.nodes[name] = GraphNode(name, attributes)
         self.adjacency[name] = []
+        self._path_table = None
 
     def _add_edge(self, source: str, target: str, relation: str, 
                   tool_name: str, param_map: Dict[str, str]):
         edge = GraphEdge(source, target, relation, tool_name, param_map)
         self.edges.append(edge)
         self.adjacency[source].append(edge)
+        self._path_table = None
 
     def get_neighbors(self, node_type: str) -> List[GraphEdge]:
         """Get all outgoing edges from a node type."""
         return self.adjacency.get(node_type, [])
 
+    def _build_path_table(self):
+        """
+        All-pairs shortest paths: one BFS per source node recording the edge
+        that first reached each target (parent pointers), then each path is
+        reconstructed once by walking the parents back to the source.
+        """
+        table: Dict[Tuple[str, str], Tuple[GraphEdge, ...]] = {}
+        for start_type in self.nodes:
+            parent: Dict[str, GraphEdge] = {}
+            queue = deque([start_type])
+            visited = {start_type}
+            
+            while queue:
+                current = queue.popleft()
+                for edge in self.adjacency.get(current, []):
+                    if edge.target not in visited:
+                        visited.add(edge.target)
+                        parent[edge.target] = edge
+                        queue.append(edge.target)
+            
+            for end_type in parent:
+                path = []
+                node = end_type
+                while node != start_type:
+                    edge = parent[node]
+                    path.append(edge)
+                    node = edge.source
+                table[(start_type, end_type)] = tuple(reversed(path))
+                
+        self._path_table = table
+
     def find_path(self, start_type: str, end_type: str) -> List[GraphEdge]:
         """
-        BFS to find the shortest path of edges from start to end entity type.
+        Shortest path of edges from start to end entity type (BFS order),
+        served from the precomputed path table.
         Returns the list of edges (tool calls) to traverse.
         
         Example: find_path("Invoice", "RiskAssessment")
@@ -156,22 +194,10 @@ class BusinessGraph:
         if start_type == end_type:
             return []
             
-        # BFS
-        queue = deque([(start_type, [])])
-        visited = {start_type}
-        
-        while queue:
-            current, path = queue.popleft()
+        if self._path_table is None:
+            self._build_path_table()
             
-            for edge in self.adjacency.get(current, []):
-                if edge.target == end_type:
-                    return path + [edge]
-                    
-                if edge.target not in visited:
-                    visited.add(edge.target)
-                    queue.append((edge.target, path + [edge]))
-                    
-        return []  # No path found
+        return list(self._path_table.get((start_type, end_type), ()))
 
     def explain_path(self, path: List[GraphEdge]) -> str:
         """Human-readable explanation of a traversal path."""
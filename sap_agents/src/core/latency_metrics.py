@@ -0,0 +1,126 @@
+"""
+Latency Metrics: fixed-bucket latency histograms for the engine and orchestrator.
+Buckets grow geometrically (HDR-style), so recording is O(1), memory is a
+few hundred ints per series, and any percentile is within one bucket
+(~10% relative error) of the exact value.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Smallest / largest latency resolved by the buckets (seconds)
+MIN_LATENCY = 0.0001
+MAX_LATENCY = 600.0
+
+# Ratio between consecutive bucket bounds
+BUCKET_GROWTH = 1.1
+
+N_BUCKETS = int(math.ceil(math.log(MAX_LATENCY / MIN_LATENCY) / math.log(BUCKET_GROWTH))) + 1
+
+PERCENTILES = (50, 95, 99)
+
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+def bucket_of(seconds):
+    """Index of the bucket holding `seconds` (bucket i ends at MIN_LATENCY * GROWTH**i)."""
+    if seconds <= MIN_LATENCY:
+        return 0
+    return min(int(math.ceil(math.log(seconds / MIN_LATENCY) / _LOG_GROWTH)), N_BUCKETS - 1)
+
+
+def bucket_bound(index):
+    """Upper bound (seconds) of bucket `index`."""
+    return MIN_LATENCY * BUCKET_GROWTH ** index
+
+
+class LatencyHistogram:
+    """Counts of observed latencies per geometric bucket, plus sum/max."""
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bucket_of(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct):
+        """Latency (seconds) at percentile `pct`, clamped to the observed max."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * pct / 100.0)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_bound(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self):
+        """Summary in milliseconds: count, mean, p50/p95/p99, max."""
+        summary = {"count": self.count, "mean_ms": round(self.mean() * 1000, 2)}
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = round(self.percentile(pct) * 1000, 2)
+        summary["max_ms"] = round(self.max * 1000, 2)
+        return summary
+
+
+class LatencyRecorder:
+    """
+    Histograms keyed by (kind, name), e.g. ("stage", "enrichment") or
+    ("agent", "SalesAgent"). Safe to record from concurrent requests.
+    """
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, seconds):
+        with self._lock:
+            histogram = self._series.get((kind, name))
+            if histogram is None:
+                histogram = self._series[(kind, name)] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def timed(self, kind, name):
+        """Records the wall time of the `with` body (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - start)
+
+    def stage(self, name):
+        return self.timed("stage", name)
+
+    def histogram(self, kind, name):
+        """The (kind, name) histogram, or None if nothing was recorded yet."""
+        return self._series.get((kind, name))
+
+    def snapshot(self):
+        """{kind: {name: summary}} for every series recorded so far."""
+        with self._lock:
+            series = list(self._series.items())
+            out = {}
+            for (kind, name), histogram in sorted(series):
+                out.setdefault(kind, {})[name] = histogram.snapshot()
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+# Singleton
+latency_metrics = LatencyRecorder()
@@ -1,6 +1,21 @@
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Optional
 from dataclasses import dataclass
 from src.core.mock_sap import mock_db
+from src.core.cache import LRUCache
+from src.core.metrics import TOOL_INVOCATIONS
+from src.core.pagination import clamp_limit, decode_cursor, encode_cursor, paginate
+
+_MISS = object()
+
+@dataclass
+class CachePolicy:
+    """Opt-in memoization for pure-read tools."""
+    ttl: Optional[float] = None               # Seconds; None = until the source changes
+    max_entries: int = 1024
+    key_inputs: Optional[List[str]] = None    # Inputs forming the key (default: all)
+
+# Default policy for read-only mock_db lookups
+READ_CACHE = CachePolicy(ttl=300, max_entries=1024)
 
 @dataclass
 class ToolSchema:
@@ -10,10 +25,19 @@ class ToolSchema:
     outputs: Dict[str, str] # name: type_description
     func: Callable
     category: str
+    # Optional set-at-a-time variant: List[params] -> List[result] (same order)
+    batch_func: Optional[Callable] = None
+    # Optional result cache; entries are dropped when `source.generation` changes
+    cache: Optional[CachePolicy] = None
+    source: Any = None
+    # Optional paged variant: (after, limit, fields, **params) -> (rows, total, resume position)
+    page_func: Optional[Callable] = None
 
 class MetaRegistry:
     def __init__(self):
         self.tools: Dict[str, ToolSchema] = {}
+        self.caches: Dict[str, LRUCache] = {}
+        self._cache_generations: Dict[str, int] = {}
         self._register_tools()
 
     def _register_tools(self):
@@ -28,6 +52,9 @@ class MetaRegistry:
             },
             outputs={"purchase_orders": "List[Dict] - List of PO objects"},
             func=mock_db.find_pos,
+            page_func=mock_db.find_pos_page,
+            cache=READ_CACHE,
+            source=mock_db,
             category="MM"
         ))
 
@@ -41,6 +68,9 @@ class MetaRegistry:
             },
             outputs={"invoices": "List[Dict] - List of Invoice objects"},
             func=mock_db.find_invoices,
+            page_func=mock_db.find_invoices_page,
+            cache=READ_CACHE,
+            source=mock_db,
             category="FI"
         ))
 
@@ -54,6 +84,9 @@ class MetaRegistry:
             },
             outputs={"sales_orders": "List[Dict] - List of Sales Order objects"},
             func=mock_db.find_sales_orders,
+            page_func=mock_db.find_sales_orders_page,
+            cache=READ_CACHE,
+            source=mock_db,
             category="SD"
         ))
 
@@ -64,6 +97,8 @@ class MetaRegistry:
             inputs={"location": "str - City or Name of the plant (e.g., 'Texas')"},
             outputs={"plant_id": "str - The 4-digit SAP Plant ID"},
             func=mock_db.get_plant_id,
+            cache=READ_CACHE,
+            source=mock_db,
             category="UTILS"
         ))
 
@@ -74,15 +109,140 @@ class MetaRegistry:
             inputs={"vendor_name": "str - Name of the vendor"},
             outputs={"prediction": "Dict - Risk score and reasoning"},
             func=mock_db.analyze_vendor_risk,
-            category="PREDICTIVE"
+            category="PREDICTIVE",
+            batch_func=mock_db.analyze_vendor_risk_batch,
+            cache=READ_CACHE,
+            source=mock_db
+        ))
+
+        self.register(ToolSchema(
+            name="rank_vendors_by_risk",
+            description="PREDICTIVE: Ranks all vendors by predicted delivery risk (highest first).",
+            inputs={"limit": "int (Optional) - Maximum number of vendors to return"},
+            outputs={"ranking": "List[Dict] - Risk assessments sorted by risk score"},
+            func=mock_db.rank_vendors_by_risk,
+            category="PREDICTIVE",
+            cache=READ_CACHE,
+            source=mock_db
         ))
 
     def register(self, schema: ToolSchema):
         self.tools[schema.name] = schema
+        if schema.cache:
+            self.caches[schema.name] = LRUCache(schema.cache.max_entries, schema.cache.ttl)
+            self._cache_generations[schema.name] = self._generation(schema)
 
     def get_tool(self, name: str) -> ToolSchema:
         return self.tools.get(name)
 
+    @staticmethod
+    def _generation(tool: ToolSchema) -> int:
+        return getattr(tool.source, "generation", 0)
+
+    def _valid_cache(self, tool: ToolSchema):
+        """
+        The tool's cache (emptied first if its data source was written to)
+        and the source generation to key new entries on.
+        """
+        cache = self.caches.get(tool.name)
+        generation = self._generation(tool)
+        if cache is not None and self._cache_generations[tool.name] != generation:
+            cache.clear()
+            self._cache_generations[tool.name] = generation
+        return cache, generation
+
+    @staticmethod
+    def _cache_key(tool: ToolSchema, generation: int, params: Dict[str, Any]) -> tuple:
+        # The generation is part of the key so a result computed while a
+        # write was in flight can never be served after that write.
+        inputs = tool.cache.key_inputs
+        if inputs is None:
+            return (generation,) + tuple(sorted(params.items()))
+        return (generation,) + tuple((k, params.get(k)) for k in inputs)
+
+    @staticmethod
+    def _copy_result(result: Any) -> Any:
+        """Copy a cached result's list and row dicts so callers cannot corrupt the cache."""
+        if isinstance(result, list):
+            return [dict(row) if isinstance(row, dict) else row for row in result]
+        if isinstance(result, dict):
+            return dict(result)
+        return result
+
+    def invoke(self, name: str, **params) -> Any:
+        """Invoke a tool, serving pure reads from its cache when enabled."""
+        tool = self.tools[name]
+        TOOL_INVOCATIONS.inc(tool=name, mode="single")
+        cache, generation = self._valid_cache(tool)
+        if cache is None:
+            return tool.func(**params)
+        key = self._cache_key(tool, generation, params)
+        result = cache.get(key, _MISS)
+        if result is _MISS:
+            result = tool.func(**params)
+            cache.put(key, result)
+        return self._copy_result(result)
+
+    def invoke_batch(self, name: str, param_sets: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Invoke a tool once for a whole set of parameter dicts.
+        Duplicate parameter sets are executed once (cached ones not at all);
+        results are returned in the order of `param_sets`.
+        """
+        tool = self.tools[name]
+        TOOL_INVOCATIONS.inc(tool=name, mode="batch")
+        cache, generation = self._valid_cache(tool)
+        keys = [tuple(sorted(params.items())) for params in param_sets]
+        by_key = {}
+        pending = []
+        for k in dict.fromkeys(keys):
+            cached = cache.get(self._cache_key(tool, generation, dict(k)), _MISS) if cache is not None else _MISS
+            if cached is _MISS:
+                pending.append(k)
+            else:
+                by_key[k] = cached
+        if pending:
+            if tool.batch_func:
+                results = tool.batch_func([dict(k) for k in pending])
+            else:
+                results = [tool.func(**dict(k)) for k in pending]
+            for k, result in zip(pending, results):
+                by_key[k] = result
+                if cache is not None:
+                    cache.put(self._cache_key(tool, generation, dict(k)), result)
+        if cache is None and len(by_key) == len(keys):
+            return [by_key[k] for k in keys]
+        # Cached or repeated results are shared: hand out copies
+        return [self._copy_result(by_key[k]) for k in keys]
+
+    def invoke_page(self, name: str, params: Dict[str, Any], cursor: Optional[str] = None,
+                    limit: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        One page of a tool's result: {"rows", "total", "next_cursor"}.
+        Tools with a page_func slice and project at the source, so rows off
+        the page are never copied; others are paged over their full result.
+        Raises InvalidCursor for a cursor issued to a different query.
+        """
+        tool = self.tools[name]
+        after = decode_cursor(cursor, name, params) if cursor else -1
+        limit = clamp_limit(limit)
+        if tool.page_func:
+            TOOL_INVOCATIONS.inc(tool=name, mode="page")
+            rows, total, last = tool.page_func(after=after, limit=limit, fields=fields, **params)
+        else:
+            result = self.invoke(name, **params)
+            result = result if isinstance(result, list) else [result]
+            rows, last = paginate(result, after, limit, fields)
+            total = len(result)
+        return {
+            "rows": rows,
+            "total": total,
+            "next_cursor": encode_cursor(name, params, last) if last is not None else None,
+        }
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: cache.stats() for name, cache in self.caches.items()}
+
     def list_tools(self) -> List[Dict]:
         return [{
             "name": t.name,
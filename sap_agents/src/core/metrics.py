@@ -0,0 +1,254 @@
+"""
+Metrics: Prometheus-style counters and histograms for the /metrics endpoint.
+Hot paths write only to a per-thread shard (no lock, no contention); a
+scrape sums the shards of live threads and a base shard into which exited
+threads' shards are folded. Values that
+already live elsewhere (e.g. cache hit counters) are exported through
+collectors evaluated at scrape time, so they cost nothing per request.
+"""
+import bisect
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Default latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (labels, value) rows produced by a collector
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _ThreadToken:
+    """Placeholder kept in a thread-local; its finalizer runs when the thread exits."""
+    __slots__ = ("__weakref__",)
+
+
+class _ShardedMetric:
+    """
+    Base for metrics aggregated per thread. Each thread owns one dict
+    (label values -> state) that only it mutates. When a thread exits, its
+    shard is folded into the base shard (totals stay monotonic), so the
+    shard list is bounded by the number of live threads.
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._base: dict = {}           # Totals of exited threads
+        self._shards: List[dict] = []   # Shards of live threads
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            # Only the thread-local holds the token: it is released when the thread exits
+            token = self._local.token = _ThreadToken()
+            weakref.finalize(token, self._retire, shard)
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _retire(self, shard: dict):
+        """Folds an exited thread's shard into the base shard."""
+        with self._shards_lock:
+            for key, state in shard.items():
+                # New values, never updated in place: a snapshot taken earlier stays consistent
+                self._base[key] = self._merge(self._base.get(key), state)
+            self._shards.remove(shard)
+
+    @staticmethod
+    def _merge(total, state):
+        raise NotImplementedError
+
+    def _label_values(self, labels: Dict[str, str]) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _snapshots(self) -> List[dict]:
+        # dict() copies under the GIL, so a concurrent writer cannot break iteration;
+        # the lock keeps a shard from being counted both live and folded into the base
+        with self._shards_lock:
+            return [dict(self._base)] + [dict(shard) for shard in self._shards]
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_ShardedMetric):
+    """Monotonic counter, optionally labelled."""
+    kind = "counter"
+
+    @staticmethod
+    def _merge(total, value):
+        return value if total is None else total + value
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self._shard()
+        key = self._label_values(labels) if labels or self.labelnames else ()
+        shard[key] = shard.get(key, 0) + amount
+
+    def values(self) -> Dict[tuple, float]:
+        totals: Dict[tuple, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def collect(self) -> List[str]:
+        lines = self.header()
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_ShardedMetric):
+    """Fixed-bucket histogram; per shard and label set: [bucket counts..., sum]."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    @staticmethod
+    def _merge(total, state):
+        return list(state) if total is None else [a + b for a, b in zip(total, state)]
+
+    def observe(self, value: float, **labels):
+        shard = self._shard()
+        key = self._label_values(labels) if labels or self.labelnames else ()
+        state = shard.get(key)
+        if state is None:
+            # One slot per bucket, one for +Inf, one for the sum
+            state = shard[key] = [0] * (len(self.buckets) + 2)
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def values(self) -> Dict[tuple, List[float]]:
+        totals: Dict[tuple, List[float]] = {}
+        for shard in self._snapshots():
+            for key, state in shard.items():
+                state = list(state)
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = state
+                else:
+                    for i, value in enumerate(state):
+                        total[i] += value
+        return totals
+
+    def collect(self) -> List[str]:
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for key, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CollectorMetric:
+    """Metric whose samples are read from `collect_fn` at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str, collect_fn: Callable[[], Samples]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.collect_fn = collect_fn
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.collect_fn():
+            names = sorted(labels)
+            lines.append(f"{self.name}{_format_labels(names, [labels[n] for n in names])} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered as {existing.kind}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, name: str, documentation: str, kind: str, collect_fn: Callable[[], Samples]):
+        """Registers (or replaces) a scrape-time collector."""
+        with self._lock:
+            metric = self._metrics[name] = CollectorMetric(name, documentation, kind, collect_fn)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton
+metrics = MetricsRegistry()
+
+# --- Platform metrics ---
+
+CHAT_REQUESTS = metrics.counter(
+    "chat_requests_total", "Chat requests served, by endpoint and outcome.", ("endpoint", "status"))
+CHAT_LATENCY = metrics.histogram(
+    "chat_request_duration_seconds", "Chat request latency in seconds.", ("endpoint",))
+TOOL_INVOCATIONS = metrics.counter(
+    "tool_invocations_total", "MetaRegistry tool invocations, by tool and mode (single or batch).", ("tool", "mode"))
+GRAPH_HOPS = metrics.histogram(
+    "graph_walker_hops", "Edges traversed per GraphWalker query.", (), buckets=(1, 2, 3, 4, 5, 6, 8))
+ERRORS = metrics.counter(
+    "errors_total", "Handled exceptions, by component and exception class.", ("component", "error_class"))
+
+
+def record_error(component: str, error: BaseException):
+    ERRORS.inc(component=component, error_class=type(error).__name__)
@@ -1,12 +1,25 @@
+import os
 import random
+import threading
 from faker import Faker
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
+from src.core.indexed_store import IndexedTable, EXACT, CONTAINS
+from src.core.pagination import MAX_PAGE_SIZE
+from src.core.data_generator import BulkDataGenerator, SyntheticDataset
+from src.core.vendor_risk import VendorRiskAggregates
 
 fake = Faker()
 
 class MockDatabase:
-    def __init__(self):
+    def __init__(self, scale_factor: Optional[float] = None, seed: Optional[int] = None,
+                 snapshot_path: Optional[str] = None):
+        """
+        Default: the small, Faker-driven demo dataset.
+        scale_factor/seed: bulk, deterministic dataset (SF1 = demo volumes).
+        snapshot_path: load a previously saved snapshot if present,
+        otherwise generate at `scale_factor` and save it there for later processes.
+        """
         self.plants = []
         self.vendors = []
         self.materials = []
@@ -14,7 +27,30 @@ class MockDatabase:
         self.invoices = []
         self.sales_orders = []
         self.employees = []
-        self._generate_data()
+        # Incremented on every write; read caches key on it (see MetaRegistry)
+        self.generation = 0
+        self._write_lock = threading.RLock()
+
+        if snapshot_path and SyntheticDataset.exists(snapshot_path):
+            self._load_dataset(SyntheticDataset.load(snapshot_path))
+        elif scale_factor is not None or snapshot_path:
+            dataset = BulkDataGenerator(scale_factor or 1.0, seed).generate()
+            if snapshot_path:
+                dataset.save(snapshot_path)
+            self._load_dataset(dataset)
+        else:
+            self._generate_data()
+        self._build_indexes()
+
+    def _load_dataset(self, dataset: SyntheticDataset):
+        tables = dataset.to_tables()
+        self.plants = tables['plants']
+        self.vendors = tables['vendors']
+        self.materials = tables['materials']
+        self.purchase_orders = tables['purchase_orders']
+        self.invoices = tables['invoices']
+        self.sales_orders = tables['sales_orders']
+        self.employees = tables['employees']
 
     def _generate_data(self):
         # 1. Plants
@@ -98,69 +134,117 @@ class MockDatabase:
                 'location': random.choice(plant_locations)
             })
 
+    def _build_indexes(self):
+        """
+        Wraps the transactional tables in IndexedTables (the row lists are shared,
+        not copied) so the find_* methods answer through index intersection.
+        """
+        self.po_table = IndexedTable(
+            self.purchase_orders,
+            exact=['id', 'status'],
+            substring=['vendor_name', 'plant_location']
+        )
+        self.invoice_table = IndexedTable(self.invoices, exact=['id', 'po_id', 'status'])
+        self.so_table = IndexedTable(self.sales_orders, exact=['id', 'status'], substring=['customer'])
+        self.vendor_risk = VendorRiskAggregates()
+        self.vendor_risk.rebuild(self.purchase_orders)
+
     # --- API Methods (Simulating SAP BAPIs) ---
 
     def analyze_vendor_risk(self, vendor_name: str) -> Dict[str, Any]:
         """
         Simulates SAP RPT-1 behavior: Analyzes historical performance to predict risk.
         In-Context Learning simulation: Looks at last N orders to determine a pattern.
+        Context comes from the running per-vendor aggregates (O(1) per call).
         """
-        # 1. Fetch Context (Historical Data)
-        vendor_orders = [p for p in self.purchase_orders 
-                        if p['vendor_name'].lower() == vendor_name.lower() 
-                        and p['status'] == 'Received']
-        
-        if not vendor_orders:
-            return {"risk_score": 0.0, "reason": "No historical data found for context."}
-            
-        # 2. RPT-1 Logic Simulation (Pattern Recognition)
-        # We simulate the model finding a pattern: "Late delivery when Value > 10k" or "Late in Winter"
-        late_count = sum(1 for p in vendor_orders if p['delivery_days_actual'] > p['delivery_days_promised'])
-        total = len(vendor_orders)
-        
-        avg_delay = 0
-        if late_count > 0:
-            delays = [p['delivery_days_actual'] - p['delivery_days_promised'] for p in vendor_orders 
-                     if p['delivery_days_actual'] > p['delivery_days_promised']]
-            avg_delay = sum(delays) / len(delays)
-
-        risk_score = min(1.0, (late_count / total) * 1.5) # Amplify for sensitivity
-        
-        return {
-            "vendor": vendor_name,
-            "risk_score": round(risk_score, 2),
-            "total_orders_analyzed": total,
-            "late_orders": late_count,
-            "avg_delay_days": round(avg_delay, 1),
-            "prediction": "High Risk of Delay" if risk_score > 0.5 else "Low Risk",
-            "model_model": "sap-rpt-1-large (Simulated)"
-        }
+        return self.vendor_risk.risk(vendor_name)
+
+    def analyze_vendor_risk_batch(self, param_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Batched analyze_vendor_risk: one aggregate lookup per vendor."""
+        return [self.vendor_risk.risk(params['vendor_name']) for params in param_sets]
+
+    def rank_vendors_by_risk(self, limit: int = None) -> List[Dict[str, Any]]:
+        """All vendors with delivery history, highest predicted risk first."""
+        return self.vendor_risk.ranked(limit)
 
     def find_pos(self, vendor_name: str = None, status: str = None, plant_loc: str = None) -> List[Dict]:
-        results = self.purchase_orders
+        return self.po_table.select(self._po_filters(vendor_name, status, plant_loc))
+
+    def find_invoices(self, status: str = None, po_id: str = None) -> List[Dict]:
+        return self.invoice_table.select(self._invoice_filters(status, po_id))
+
+    def find_sales_orders(self, customer: str = None, status: str = None) -> List[Dict]:
+        return self.so_table.select(self._so_filters(customer, status))
+
+    # Paged variants (see IndexedTable.page): (rows, total, resume position)
+
+    def find_pos_page(self, after: int = -1, limit: int = MAX_PAGE_SIZE, fields: List[str] = None,
+                      vendor_name: str = None, status: str = None, plant_loc: str = None):
+        return self.po_table.page(self._po_filters(vendor_name, status, plant_loc), after, limit, fields)
+
+    def find_invoices_page(self, after: int = -1, limit: int = MAX_PAGE_SIZE, fields: List[str] = None,
+                           status: str = None, po_id: str = None):
+        return self.invoice_table.page(self._invoice_filters(status, po_id), after, limit, fields)
+
+    def find_sales_orders_page(self, after: int = -1, limit: int = MAX_PAGE_SIZE, fields: List[str] = None,
+                               customer: str = None, status: str = None):
+        return self.so_table.page(self._so_filters(customer, status), after, limit, fields)
+
+    @staticmethod
+    def _po_filters(vendor_name: str = None, status: str = None, plant_loc: str = None):
+        filters = []
         if vendor_name:
-            results = [p for p in results if vendor_name.lower() in p['vendor_name'].lower()]
+            filters.append(('vendor_name', vendor_name, CONTAINS))
         if status:
-            results = [p for p in results if status.lower() == p['status'].lower()]
+            filters.append(('status', status, EXACT))
         if plant_loc:
-            results = [p for p in results if plant_loc.lower() in p['plant_location'].lower()]
-        return results
+            filters.append(('plant_location', plant_loc, CONTAINS))
+        return filters
 
-    def find_invoices(self, status: str = None, po_id: str = None) -> List[Dict]:
-        results = self.invoices
+    @staticmethod
+    def _invoice_filters(status: str = None, po_id: str = None):
+        filters = []
         if status:
-            results = [i for i in results if status.lower() == i['status'].lower()]
+            filters.append(('status', status, EXACT))
         if po_id:
-            results = [i for i in results if po_id == i['po_id']]
-        return results
+            filters.append(('po_id', po_id, EXACT))
+        return filters
 
-    def find_sales_orders(self, customer: str = None, status: str = None) -> List[Dict]:
-        results = self.sales_orders
+    @staticmethod
+    def _so_filters(customer: str = None, status: str = None):
+        filters = []
         if customer:
-            results = [s for s in results if customer.lower() in s['customer'].lower()]
+            filters.append(('customer', customer, CONTAINS))
         if status:
-            results = [s for s in results if status.lower() == s['status'].lower()]
-        return results
+            filters.append(('status', status, EXACT))
+        return filters
+
+    # --- Join Primitives (Primary / Foreign Key Index Lookups) ---
+
+    @staticmethod
+    def _first(table: IndexedTable, field: str, value: Any) -> Optional[Dict]:
+        positions = table.lookup(field, value)
+        return table.rows[min(positions)] if positions else None
+
+    @staticmethod
+    def _all(table: IndexedTable, field: str, value: Any) -> List[Dict]:
+        return [table.rows[pos] for pos in sorted(table.lookup(field, value))]
+
+    def get_po(self, po_id: str) -> Optional[Dict]:
+        """PK: po_id -> Purchase Order."""
+        return self._first(self.po_table, 'id', po_id)
+
+    def get_invoice(self, invoice_id: str) -> Optional[Dict]:
+        """PK: invoice id -> Invoice."""
+        return self._first(self.invoice_table, 'id', invoice_id)
+
+    def invoices_for_po(self, po_id: str) -> List[Dict]:
+        """FK: po_id -> Invoices billing that PO."""
+        return self._all(self.invoice_table, 'po_id', po_id)
+
+    def pos_for_vendor(self, vendor_name: str) -> List[Dict]:
+        """FK: vendor name (case-insensitive, exact) -> Purchase Orders."""
+        return self._all(self.po_table, 'vendor_name', vendor_name)
 
     def get_plant_id(self, location: str) -> Optional[str]:
         for p in self.plants:
@@ -168,5 +252,70 @@ class MockDatabase:
                 return p['id']
         return None
 
+    # --- Write API (each write bumps the generation) ---
+
+    def _touch(self):
+        self.generation += 1
+
+    def insert_purchase_order(self, po: Dict) -> Dict:
+        with self._write_lock:
+            self.po_table.insert(po)
+            self.vendor_risk.add(po)
+            self._touch()
+        return po
+
+    def update_po_status(self, po_id: str, status: str,
+                         delivery_days_actual: Optional[int] = None) -> Optional[Dict]:
+        """Change a PO's status (and record the actual delivery days on receipt)."""
+        with self._write_lock:
+            positions = self.po_table.lookup('id', po_id)
+            if not positions:
+                return None
+            pos = min(positions)
+            changes = {'status': status}
+            if delivery_days_actual is not None:
+                changes['delivery_days_actual'] = delivery_days_actual
+            po = self.purchase_orders[pos]
+            self.vendor_risk.remove(po)
+            self.po_table.update(pos, **changes)
+            self.vendor_risk.add(po)
+            self._touch()
+            return self.purchase_orders[pos]
+
+    def insert_invoice(self, invoice: Dict) -> Dict:
+        with self._write_lock:
+            self.invoice_table.insert(invoice)
+            self._touch()
+        return invoice
+
+    def update_invoice_status(self, invoice_id: str, status: str) -> Optional[Dict]:
+        with self._write_lock:
+            positions = self.invoice_table.lookup('id', invoice_id)
+            if not positions:
+                return None
+            pos = min(positions)
+            self.invoice_table.update(pos, status=status)
+            self._touch()
+            return self.invoices[pos]
+
+    def insert_sales_order(self, so: Dict) -> Dict:
+        with self._write_lock:
+            self.so_table.insert(so)
+            self._touch()
+        return so
+
+def create_mock_db() -> MockDatabase:
+    """
+    Builds the database from the environment:
+    MOCK_SAP_SCALE (scale factor), MOCK_SAP_SEED, MOCK_SAP_SNAPSHOT (snapshot dir).
+    """
+    scale = os.getenv("MOCK_SAP_SCALE")
+    seed = os.getenv("MOCK_SAP_SEED")
+    return MockDatabase(
+        scale_factor=float(scale) if scale else None,
+        seed=int(seed) if seed else None,
+        snapshot_path=os.getenv("MOCK_SAP_SNAPSHOT") or None
+    )
+
 # Singleton Instance
-mock_db = MockDatabase()
+mock_db = create_mock_db()
@@ -0,0 +1,83 @@
+"""
+Pagination: opaque keyset cursors and field projection for tool results.
+A cursor records the position of the last row served, so the next page
+resumes right after it; positions only grow on insert, so pages stay
+stable while the source is written to. The cursor is bound to the tool and
+its parameters and is rejected when replayed against another query.
+"""
+import base64
+import hashlib
+import json
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bound on a single page, whatever the caller asks for
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _digest(tool: str, params: Dict[str, Any]) -> str:
+    key = json.dumps([tool, sorted(params.items())], default=str)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def encode_cursor(tool: str, params: Dict[str, Any], after: int) -> str:
+    payload = json.dumps({"q": _digest(tool, params), "a": after}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, tool: str, params: Dict[str, Any]) -> int:
+    """Position to resume after. Raises InvalidCursor if it is malformed or from another query."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        digest, after = payload["q"], int(payload["a"])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Malformed cursor.")
+    if digest != _digest(tool, params):
+        raise InvalidCursor("Cursor does not belong to this query.")
+    return after
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return MAX_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def project(row: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Only `fields` of a row dict (missing ones skipped); non-dicts pass through."""
+    if not fields or not isinstance(row, dict):
+        return row
+    return {field: row[field] for field in fields if field in row}
+
+
+def page_positions(positions: Sequence[int], after: int, limit: int) -> Tuple[Sequence[int], Optional[int]]:
+    """
+    The (sorted) positions following `after`, at most `limit` of them, and
+    the position to resume after (None on the last page).
+    """
+    lo = bisect_right(positions, after)
+    window = positions[lo:lo + limit]
+    more = lo + limit < len(positions)
+    return window, (window[-1] if more else None)
+
+
+def paginate(rows: Sequence[Any], after: int, limit: int,
+             fields: Optional[Sequence[str]] = None) -> Tuple[List[Any], Optional[int]]:
+    """Pages an already materialized result list (positions are list indexes)."""
+    window, last = page_positions(range(len(rows)), after, limit)
+    return [project(rows[pos], fields) for pos in window], last
+
+
+def parse_fields(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Accepts "id,status" or ["id", "status"]; None/empty means all fields."""
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    names = [name.strip() for name in fields if name and name.strip()]
+    return list(dict.fromkeys(names)) or None
@@ -0,0 +1,109 @@
+"""
+Incremental Vendor Risk Aggregates.
+Keeps per-vendor running totals over received POs so delivery-risk scoring
+is O(1) per vendor and ranking all vendors is a sort over V aggregates
+instead of V scans of the PO table.
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class VendorStats:
+    __slots__ = ("name", "received", "late", "total_delay")
+
+    def __init__(self, name: str):
+        self.name = name          # Display name (first casing seen)
+        self.received = 0         # Received POs
+        self.late = 0             # Received POs delivered after the promised days
+        self.total_delay = 0      # Sum of delay days over late POs
+
+
+class VendorRiskAggregates:
+    """
+    Running aggregates keyed by lowercased vendor name.
+    Only POs with status 'Received' contribute (the RPT-1 context window).
+    """
+
+    def __init__(self):
+        self.vendors: Dict[str, VendorStats] = {}
+        self.version = 0
+        self._ranked: Optional[List[Dict[str, Any]]] = None
+        self._ranked_version = -1
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _delay(po: Dict) -> Optional[int]:
+        actual = po.get('delivery_days_actual')
+        if actual is None:
+            return None
+        return actual - po['delivery_days_promised']
+
+    def _apply(self, po: Dict, sign: int):
+        if po.get('status') != 'Received':
+            return
+        key = po['vendor_name'].lower()
+        stats = self.vendors.get(key)
+        if stats is None:
+            stats = self.vendors[key] = VendorStats(po['vendor_name'])
+        stats.received += sign
+        delay = self._delay(po)
+        if delay is not None and delay > 0:
+            stats.late += sign
+            stats.total_delay += sign * delay
+        self.version += 1
+
+    def add(self, po: Dict):
+        """Account for a newly inserted PO."""
+        with self._lock:
+            self._apply(po, +1)
+
+    def remove(self, po: Dict):
+        """Withdraw a PO's contribution (call before mutating it)."""
+        with self._lock:
+            self._apply(po, -1)
+
+    def rebuild(self, purchase_orders: List[Dict]):
+        with self._lock:
+            self.vendors.clear()
+            for po in purchase_orders:
+                self._apply(po, +1)
+            self.version += 1
+
+    @staticmethod
+    def score(vendor_name: str, stats: Optional[VendorStats]) -> Dict[str, Any]:
+        if stats is None or stats.received <= 0:
+            return {"risk_score": 0.0, "reason": "No historical data found for context."}
+
+        # RPT-1 Logic Simulation (Pattern Recognition)
+        avg_delay = stats.total_delay / stats.late if stats.late > 0 else 0
+        risk_score = min(1.0, (stats.late / stats.received) * 1.5) # Amplify for sensitivity
+
+        return {
+            "vendor": vendor_name,
+            "risk_score": round(risk_score, 2),
+            "total_orders_analyzed": stats.received,
+            "late_orders": stats.late,
+            "avg_delay_days": round(avg_delay, 1),
+            "prediction": "High Risk of Delay" if risk_score > 0.5 else "Low Risk",
+            "model_model": "sap-rpt-1-large (Simulated)"
+        }
+
+    def risk(self, vendor_name: str) -> Dict[str, Any]:
+        return self.score(vendor_name, self.vendors.get(vendor_name.lower()))
+
+    def ranked(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        All vendors with delivery history, highest risk first (the top
+        `limit` when given). The sorted view is rebuilt only when an
+        aggregate has changed; callers get copies of its rows.
+        """
+        with self._lock:
+            if self._ranked_version != self.version:
+                scored = [self.score(s.name, s) for s in self.vendors.values() if s.received > 0]
+                scored.sort(key=lambda r: (-r["risk_score"], -r["avg_delay_days"], r["vendor"]))
+                self._ranked = scored
+                self._ranked_version = self.version
+            ranked = self._ranked
+        if limit is not None:
+            ranked = ranked[:max(0, limit)]
+        return [dict(row) for row in ranked]
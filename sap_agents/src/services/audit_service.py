@@ -1,20 +1,616 @@
 import json
 import time
 import os
+import base64
+import hashlib
+import threading
+import atexit
+from array import array
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+# Time-bucketed segment files + sidecar indexes (see AuditSegmentStore)
+AUDIT_LOG_DIR = os.path.join(DATA_DIR, 'audit')
+# Earlier formats, imported once on first start: single JSONL file, JSON array
+JSONL_AUDIT_LOG_PATH = os.path.join(DATA_DIR, 'audit_log.jsonl')
+LEGACY_AUDIT_LOG_PATH = os.path.join(DATA_DIR, 'audit_log.json')
+
+# Group commit interval: queued events are written and fsynced at most this
+# often (seconds). 0 commits every event as soon as the writer wakes up.
+AUDIT_COMMIT_INTERVAL = float(os.getenv("AUDIT_COMMIT_INTERVAL", "0.5"))
+# Delay before retrying a batch the store failed to write (flush/close retry at once)
+AUDIT_RETRY_INTERVAL = float(os.getenv("AUDIT_RETRY_INTERVAL", "1.0"))
+# Segment rotation: one segment file per this many seconds of event time
+AUDIT_SEGMENT_SECONDS = int(os.getenv("AUDIT_SEGMENT_SECONDS", "3600"))
+# Segments still written to after a newer one appears: events stamped just
+# before a rotation can be committed to the previous segment shortly after
+OPEN_SEGMENTS = 2
+# Bloom filters over each sealed segment's transaction ids (~1% false positives)
+TX_BLOOM_BITS_PER_KEY = 10
+TX_BLOOM_HASHES = 7
+
+
+def _bloom_hashes(key):
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+def _bloom_bits(h1, h2, size):
+    return [(h1 + i * h2) % size for i in range(TX_BLOOM_HASHES)]
+
+
+class AuditWriteError(IOError):
+    """Audit events could not be written; `unwritten` holds them."""
+    def __init__(self, message, unwritten=()):
+        super().__init__(message)
+        self.unwritten = list(unwritten)
+
+
+class AuditSegmentStore:
+    """
+    Audit events in time-bucketed, append-only segment files:
+      audit-<bucket>.jsonl  one event per line
+      audit-<bucket>.idx    "offset<TAB>length<TAB>timestamp<TAB>transaction_id" per event
+      audit-<bucket>.txi    the .idx entries sorted by transaction_id (sealed segments)
+    <bucket> is the segment's start time (epoch seconds). Data is fsynced
+    before its index entries, and recover() re-indexes any unindexed tail.
+    Transaction lookups read only the matching events' bytes. The newest
+    OPEN_SEGMENTS segments are indexed in memory; older (sealed) ones get a
+    persisted .txi, binary-searched on lookup, and only a Bloom filter of
+    their transaction ids stays in memory. Time-range queries only open the
+    segments that overlap the range.
+    """
+    def __init__(self, directory, segment_seconds=AUDIT_SEGMENT_SECONDS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_seconds = segment_seconds
+        self._lock = threading.Lock()
+        self._segments = []          # Known segment buckets, in time order
+        self._segment_set = set()
+        self._listing_version = None
+        self._dirty = set()          # Buckets appended to through this store, not yet reloaded
+        self._dirty_lock = threading.Lock()
+        self._open_positions = {}    # open bucket -> {transaction key: array('q') of (offset, length) pairs}
+        self._idx_consumed = {}      # open bucket -> bytes of its .idx already loaded
+        self._sealed = {}            # sealed bucket -> Bloom filter (bytes) of its .txi
+
+    def bucket_of(self, timestamp):
+        return int((timestamp or 0) // self.segment_seconds) * self.segment_seconds
+
+    def _path(self, bucket, ext):
+        return os.path.join(self.directory, f"audit-{bucket:010d}.{ext}")
+
+    def segments(self):
+        """Segment buckets in time order."""
+        return sorted(
+            int(name[6:-6]) for name in os.listdir(self.directory)
+            if name.startswith("audit-") and name.endswith(".jsonl")
+        )
+
+    def listing_version(self):
+        """Changes whenever a segment file is created or removed (directory mtime)."""
+        return os.stat(self.directory).st_mtime_ns
+
+    def segment_path(self, bucket):
+        """Path of a segment's data (.jsonl) file."""
+        return self._path(bucket, "jsonl")
+
+    # -- Writing (single writer thread) --
+
+    @staticmethod
+    def _index_line(offset, length, event):
+        return f"{offset}\t{length}\t{event.get('timestamp') or 0}\t{json.dumps(event.get('transaction_id'))}\n"
+
+    def append(self, events):
+        """
+        Appends events to their segments (grouped, one write + fsync per segment).
+        Raises AuditWriteError with the events of the segments left unwritten.
+        """
+        groups = {}
+        for event in events:
+            groups.setdefault(self.bucket_of(event.get('timestamp')), []).append(event)
+        written = set()
+        try:
+            for bucket, group in groups.items():
+                self._append_segment(bucket, group)
+                written.add(bucket)
+        except Exception as e:
+            unwritten = [event for bucket, group in groups.items() if bucket not in written for event in group]
+            raise AuditWriteError(f"{len(unwritten)} audit events not written: {e}", unwritten) from e
+
+    def _append_segment(self, bucket, group):
+        data_path, idx_path = self._path(bucket, "jsonl"), self._path(bucket, "idx")
+        sizes = [(path, os.path.getsize(path) if os.path.exists(path) else 0) for path in (data_path, idx_path)]
+        try:
+            lines = [(json.dumps(event) + "\n").encode('utf-8') for event in group]
+            data = b"".join(lines)
+            with open(data_path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                offset = f.tell() - len(data)
+            entries = []
+            for event, line in zip(group, lines):
+                entries.append(self._index_line(offset, len(line), event))
+                offset += len(line)
+            with open(idx_path, 'a', encoding='utf-8') as f:
+                f.write("".join(entries))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            # Roll the segment back, so a retry neither duplicates events nor follows a torn line
+            for path, size in sizes:
+                try:
+                    with open(path, 'rb+') as f:
+                        f.truncate(size)
+                except OSError:
+                    pass
+            raise
+        finally:
+            self._mark_dirty(bucket)
+
+    def _mark_dirty(self, bucket):
+        with self._dirty_lock:
+            self._dirty.add(bucket)
+
+    def recover(self):
+        """
+        Crash recovery: truncates each .idx to its last complete, well-formed
+        entry, drops a torn trailing data line, and indexes data past the
+        last index entry.
+        """
+        for bucket in self.segments():
+            data_path, idx_path = self._path(bucket, "jsonl"), self._path(bucket, "idx")
+            covered = 0
+            if os.path.exists(idx_path):
+                valid_end, covered = self._last_index_entry(idx_path)
+                if valid_end < os.path.getsize(idx_path):
+                    with open(idx_path, 'rb+') as f:
+                        f.truncate(valid_end)
+                        f.flush()
+                        os.fsync(f.fileno())
+            with open(data_path, 'rb+') as f:
+                f.seek(covered)
+                tail = f.read()
+                complete = tail.rfind(b"\n") + 1
+                if complete < len(tail):
+                    f.truncate(covered + complete)
+            if not complete:
+                continue
+            entries, offset = [], covered
+            for line in tail[:complete].splitlines(keepends=True):
+                entries.append(self._index_line(offset, len(line), json.loads(line)))
+                offset += len(line)
+            with open(idx_path, 'a', encoding='utf-8') as f:
+                f.write("".join(entries))
+                f.flush()
+                os.fsync(f.fileno())
+            self._mark_dirty(bucket)
+
+    @staticmethod
+    def _last_index_entry(idx_path, block=4096):
+        """
+        (end of the last complete, parseable .idx line, data bytes it covers).
+        Reads backwards from the end, so startup cost does not grow with the index.
+        """
+        with open(idx_path, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            buf = b""   # File bytes [pos, pos + len(buf))
+            while True:
+                nl = buf.rfind(b"\n")
+                start = buf.rfind(b"\n", 0, nl) + 1 if nl >= 0 else 0
+                if (nl < 0 or start == 0) and pos > 0:
+                    # The last line (or its start) lies before the buffer
+                    step = min(block, pos)
+                    pos -= step
+                    f.seek(pos)
+                    buf = f.read(step) + buf
+                    continue
+                if nl < 0:
+                    return 0, 0
+                fields = buf[start:nl].split(b"\t", 2)
+                try:
+                    return pos + nl + 1, int(fields[0]) + int(fields[1])
+                except (ValueError, IndexError):
+                    buf = buf[:start]  # Malformed entry: fall back to the one before
+
+    # -- Reading --
+
+    @staticmethod
+    def _index_entries(data):
+        """(transaction key, offset, length) of each complete, well-formed .idx line."""
+        for line in data[:data.rfind(b"\n") + 1].splitlines():
+            try:
+                offset, length, _, key = line.split(b"\t", 3)
+                yield key, int(offset), int(length)
+            except ValueError:
+                continue  # Damaged entry (recover() truncates these on startup)
+
+    def _refresh(self):
+        """
+        Brings the transaction index up to date. Only the open segments,
+        segments created since the last call (directory listing version) and
+        segments this store appended to are statted.
+        """
+        with self._dirty_lock:
+            changed, self._dirty = self._dirty, set()
+        version = self.listing_version()
+        if version != self._listing_version:
+            # Read the version first: a segment created while listing changes it again
+            self._listing_version = version
+            known = set(self._segments)
+            self._segments = self.segments()
+            current = self._segment_set = set(self._segments)
+            changed.update(bucket for bucket in current if bucket not in known)
+            for bucket in (known - current):
+                self._drop(bucket)
+        open_buckets = set(self._segments[-OPEN_SEGMENTS:])
+        # Segments that rotated out of the open set get sealed
+        changed.update(bucket for bucket in self._open_positions if bucket not in open_buckets)
+        for bucket in sorted(changed | open_buckets):
+            if bucket in open_buckets:
+                self._load_open(bucket)
+            elif bucket in self._segment_set:
+                self._seal(bucket)
+
+    def _drop(self, bucket):
+        self._open_positions.pop(bucket, None)
+        self._idx_consumed.pop(bucket, None)
+        self._sealed.pop(bucket, None)
+
+    def _load_open(self, bucket):
+        """Loads an open segment's index entries appended since the last call."""
+        if self._sealed.pop(bucket, None) is not None:
+            self._idx_consumed.pop(bucket, None)
+        idx_path = self._path(bucket, "idx")
+        consumed = self._idx_consumed.get(bucket, 0)
+        try:
+            size = os.path.getsize(idx_path)
+        except OSError:
+            return
+        if size < consumed:
+            # Rolled back after a failed write: reload from the start
+            self._open_positions.pop(bucket, None)
+            consumed = 0
+        if size <= consumed:
+            return
+        with open(idx_path, 'rb') as f:
+            f.seek(consumed)
+            chunk = f.read(size - consumed)
+        positions = self._open_positions.setdefault(bucket, {})
+        for key, offset, length in self._index_entries(chunk):
+            pairs = positions.get(key)
+            if pairs is None:
+                pairs = positions[key] = array('q')
+            pairs.extend((offset, length))
+        self._idx_consumed[bucket] = consumed + chunk.rfind(b"\n") + 1
+
+    def _seal(self, bucket):
+        """
+        Moves a segment's transaction index to disk: (re)writes its .txi
+        unless it already covers the whole .idx, then keeps only its Bloom filter.
+        """
+        self._open_positions.pop(bucket, None)
+        self._idx_consumed.pop(bucket, None)
+        try:
+            size = os.path.getsize(self._path(bucket, "idx"))
+        except OSError:
+            self._sealed.pop(bucket, None)
+            return
+        header = self._read_txi_header(bucket)
+        if header is None or header[0] != size:
+            header = self._write_txi(bucket)
+        self._sealed[bucket] = header[1]
+
+    def _read_txi_header(self, bucket):
+        """(.idx bytes covered, Bloom filter) of a segment's .txi, or None."""
+        try:
+            with open(self._path(bucket, "txi"), 'rb') as f:
+                covered, bloom = f.readline().rstrip(b"\n").split(b"\t")
+            return int(covered), base64.b64decode(bloom, validate=True)
+        except (OSError, ValueError):
+            return None
+
+    def _write_txi(self, bucket):
+        """
+        .txi layout: a header line "covered<TAB>base64 Bloom filter", then
+        "transaction_id<TAB>offset<TAB>length" lines sorted by transaction_id.
+        Written to a temporary file and renamed, so readers never see it partial.
+        """
+        with open(self._path(bucket, "idx"), 'rb') as f:
+            data = f.read()
+        covered = data.rfind(b"\n") + 1
+        entries = sorted(self._index_entries(data))
+        keys = {key for key, _, _ in entries}
+        bloom = bytearray(max(8, (len(keys) * TX_BLOOM_BITS_PER_KEY + 7) // 8))
+        for key in keys:
+            for bit in _bloom_bits(*_bloom_hashes(key), len(bloom) * 8):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+        bloom = bytes(bloom)
+        lines = [b"%d\t%s\n" % (covered, base64.b64encode(bloom))]
+        lines.extend(b"%s\t%d\t%d\n" % entry for entry in entries)
+        path = self._path(bucket, "txi")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(lines))
+        os.replace(tmp_path, path)
+        return covered, bloom
+
+    def _search_txi(self, bucket, key):
+        """(offset, length) pairs of one transaction in a sealed segment (binary search)."""
+        pairs = []
+        try:
+            f = open(self._path(bucket, "txi"), 'rb')
+        except OSError:
+            return pairs
+        with f:
+            lo = len(f.readline())
+            hi = f.seek(0, os.SEEK_END)
+            # lo is a line start; every line before it sorts below key
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if mid == lo:
+                    line_start = lo
+                else:
+                    f.seek(mid - 1)
+                    f.readline()
+                    line_start = f.tell()   # First line starting at or after mid
+                if line_start >= hi:
+                    hi = mid
+                    continue
+                f.seek(line_start)
+                line = f.readline()
+                if line.split(b"\t", 1)[0] < key:
+                    lo = line_start + len(line)
+                else:
+                    hi = line_start
+            f.seek(lo)
+            for line in f:
+                found, offset, length = line.split(b"\t")
+                if found != key:
+                    break
+                pairs.append((int(offset), int(length)))
+        return pairs
+
+    def transaction(self, transaction_id):
+        """All events of one transaction, in log order."""
+        key = json.dumps(transaction_id).encode('utf-8')
+        h1, h2 = _bloom_hashes(key)
+        with self._lock:
+            self._refresh()
+            triples = []
+            for bucket, positions in self._open_positions.items():
+                pairs = positions.get(key)
+                if pairs:
+                    triples.extend((bucket, offset, length) for offset, length in zip(pairs[0::2], pairs[1::2]))
+            candidates = [
+                bucket for bucket, bloom in self._sealed.items()
+                if all(bloom[bit >> 3] >> (bit & 7) & 1 for bit in _bloom_bits(h1, h2, len(bloom) * 8))
+            ]
+        for bucket in candidates:
+            triples.extend((bucket, offset, length) for offset, length in self._search_txi(bucket, key))
+        triples.sort()
+        events, handle, open_bucket = [], None, None
+        try:
+            for bucket, offset, length in triples:
+                if bucket != open_bucket:
+                    if handle:
+                        handle.close()
+                    handle, open_bucket = open(self._path(bucket, "jsonl"), 'rb'), bucket
+                handle.seek(offset)
+                events.append(json.loads(handle.read(length)))
+        finally:
+            if handle:
+                handle.close()
+        return events
+
+    def _read_segment(self, bucket):
+        with open(self._path(bucket, "jsonl"), 'rb') as f:
+            data = f.read()
+        for line in data[:data.rfind(b"\n") + 1].splitlines():
+            yield json.loads(line)
+
+    def _read_segment_range(self, bucket, start, end):
+        """Events of one segment with start <= timestamp < end, via its index."""
+        selected = []
+        with open(self._path(bucket, "idx"), 'rb') as f:
+            data = f.read()
+        # Complete lines only: the writer may be appending to this index
+        for line in data[:data.rfind(b"\n") + 1].splitlines():
+            try:
+                offset, length, timestamp, _ = line.split(b"\t", 3)
+                offset, length, timestamp = int(offset), int(length), float(timestamp)
+            except ValueError:
+                continue  # Damaged entry (recover() truncates these on startup)
+            if (start is None or timestamp >= start) and (end is None or timestamp < end):
+                selected.append((offset, length))
+        if not selected:
+            return
+        # One read spanning the selected events
+        first, last = selected[0][0], selected[-1][0] + selected[-1][1]
+        with open(self._path(bucket, "jsonl"), 'rb') as f:
+            f.seek(first)
+            span = f.read(last - first)
+        for offset, length in selected:
+            yield json.loads(span[offset - first:offset - first + length])
+
+    def events(self, start=None, end=None):
+        """Events with start <= timestamp < end (either bound optional), in log order."""
+        for bucket in self.segments():
+            bucket_end = bucket + self.segment_seconds
+            if (start is not None and bucket_end <= start) or (end is not None and bucket >= end):
+                continue
+            if (start is None or bucket >= start) and (end is None or bucket_end <= end):
+                yield from self._read_segment(bucket)
+            else:
+                yield from self._read_segment_range(bucket, start, end)
+
+
+class AuditLogWriter:
+    """
+    Background writer for one audit segment store.
+    Producers enqueue events; the writer thread drains the queue in batches,
+    writes them with one append and fsyncs once per batch (per segment).
+    Events the store fails to write stay queued and are retried; flush()
+    and close() raise AuditWriteError while they are outstanding.
+    """
+    def __init__(self, store, commit_interval=AUDIT_COMMIT_INTERVAL):
+        self.store = store
+        self.commit_interval = commit_interval
+        self._pending = []
+        self._queued = 0      # Events enqueued so far
+        self._committed = 0   # Events written and fsynced so far
+        self._attempts = 0    # Store writes attempted so far
+        self._error = None    # Why the last attempt failed (None once a write succeeds)
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self.store.recover()
+        self._thread = threading.Thread(target=self._run, name=f"audit-writer:{os.path.basename(store.directory)}", daemon=True)
+        self._thread.start()
+
+    def append(self, event):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Audit log writer is closed")
+            self._pending.append(event)
+            self._queued += 1
+            if len(self._pending) == 1:
+                self._cond.notify_all()
+
+    def flush(self):
+        """
+        Blocks until every event enqueued so far is on disk. Raises
+        AuditWriteError if a write attempted meanwhile fails.
+        """
+        with self._cond:
+            target = self._queued
+            attempts = self._attempts
+            while self._committed < target or self._error is not None:
+                if self._error is not None and (self._attempts > attempts or not self._thread.is_alive()):
+                    raise AuditWriteError(f"Audit events not written: {self._error}") from self._error
+                if not self._thread.is_alive():
+                    return
+                self._flush_requested = True
+                self._cond.notify_all()
+                self._cond.wait()
+
+    def close(self):
+        """Writes the queued events and stops the writer. Raises AuditWriteError if that fails."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise AuditWriteError(f"{len(self._pending)} audit events not written: {self._error}",
+                                  self._pending) from self._error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not (self._closed or self._flush_requested):
+                    # flush/close cut these waits short
+                    if self._error is not None:
+                        # Back off before retrying a failed write
+                        self._cond.wait(timeout=AUDIT_RETRY_INTERVAL)
+                    elif self.commit_interval > 0:
+                        # Let concurrent producers join this batch
+                        self._cond.wait(timeout=self.commit_interval)
+                batch, self._pending = self._pending, []
+                self._flush_requested = False
+                closing = self._closed
+            unwritten, error = [], None
+            if batch:
+                try:
+                    self.store.append(batch)
+                except AuditWriteError as e:
+                    unwritten, error = e.unwritten, e
+                except Exception as e:
+                    unwritten, error = batch, e
+                if error is not None:
+                    print(f"[Audit] ❌ Error writing log: {error}")
+            with self._cond:
+                self._committed += len(batch) - len(unwritten)
+                # Failed events go back ahead of newer ones for the next attempt
+                self._pending[:0] = unwritten
+                self._error = error
+                self._attempts += 1
+                self._cond.notify_all()
+                if closing and (error is not None or not self._pending):
+                    return
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+def get_log_writer(directory):
+    """One writer per audit directory, shared by every AuditService in the process."""
+    with _writers_lock:
+        writer = _writers.get(directory)
+        if writer is None:
+            writer = _writers[directory] = AuditLogWriter(AuditSegmentStore(directory))
+        return writer
+
+def flush_log(directory):
+    """Flushes the directory's writer if this process has one (no-op otherwise)."""
+    with _writers_lock:
+        writer = _writers.get(directory)
+    if writer is not None:
+        writer.flush()
+
+@atexit.register
+def _close_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close()
+        except AuditWriteError as e:
+            print(f"[Audit] ❌ {e}")
+
+
+def migrate_legacy_log(directory, sources=(JSONL_AUDIT_LOG_PATH, LEGACY_AUDIT_LOG_PATH)):
+    """
+    One-shot import of an earlier log format into the segment store: the
+    single-file JSONL log, else the original JSON array. Skipped once the
+    store has segments; the old files are left in place.
+    """
+    store = AuditSegmentStore(directory)
+    if store.segments():
+        return 0
+    for source in sources:
+        if not os.path.exists(source):
+            continue
+        try:
+            with open(source, 'r', encoding='utf-8') as f:
+                if source.endswith(".jsonl"):
+                    events = [json.loads(line) for line in f if line.strip()]
+                else:
+                    events = json.load(f)
+        except (ValueError, OSError) as e:
+            print(f"[Audit] ⚠️ {os.path.basename(source)} not migrated: {e}")
+            continue
+        store.append(events)
+        print(f"[Audit] 📦 Migrated {len(events)} events from {os.path.basename(source)}")
+        return len(events)
+    return 0
 
-AUDIT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'audit_log.json')
 
 class AuditService:
     def __init__(self):
-        self.log_path = AUDIT_LOG_PATH
-        self._ensure_log_file()
+        self.log_dir = AUDIT_LOG_DIR
+        self._ensure_log_dir()
+
+    def _ensure_log_dir(self):
+        if self.log_dir == AUDIT_LOG_DIR and not os.path.exists(self.log_dir):
+            migrate_legacy_log(self.log_dir)
+        os.makedirs(self.log_dir, exist_ok=True)
 
-    def _ensure_log_file(self):
-        if not os.path.exists(os.path.dirname(self.log_path)):
-            os.makedirs(os.path.dirname(self.log_path))
-        if not os.path.exists(self.log_path):
-            with open(self.log_path, 'w') as f:
-                json.dump([], f)
+    @property
+    def writer(self):
+        return get_log_writer(self.log_dir)
 
     def log_event(self, transaction_id, step, detail, status="INFO"):
         """
@@ -46,18 +642,22 @@ class AuditService:
 
     def _append_to_log(self, event):
         try:
-            with open(self.log_path, 'r+') as f:
-                data = json.load(f)
-                data.append(event)
-                f.seek(0)
-                json.dump(data, f, indent=4)
+            self.writer.append(event)
         except Exception as e:
             print(f"[Audit] ❌ Error writing log: {e}")
 
+    def flush(self):
+        """Waits until all logged events are durable (read-your-writes)."""
+        self.writer.flush()
+
+    def read_events(self, start=None, end=None):
+        """Events with start <= timestamp < end (epoch seconds, either optional)."""
+        self.flush()
+        return self.writer.store.events(start, end)
+
     def get_audit_trail(self, transaction_id):
-        with open(self.log_path, 'r') as f:
-            data = json.load(f)
-        return [e for e in data if e['transaction_id'] == transaction_id]
+        self.flush()
+        return self.writer.store.transaction(transaction_id)
 
 def create_audit_service():
     return AuditService()
@@ -1,12 +1,39 @@
 import json
+import math
+import os
+import re
+from collections import defaultdict
+
+from src.services.embedding_router import EmbeddingRouter
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Keyword match weights (legacy routing scores)
+KEYWORD_WEIGHT = 5
+ID_PREFIX_WEIGHT = 20 # Strong signal for ID prefixes ("so-", "inv-")
+
+# BM25 parameters for ranked search over description + keywords
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# "keyword" (default) or "embedding" (vector routing, see embedding_router)
+ROUTING_MODE = os.getenv("CAPABILITY_ROUTING_MODE", "keyword")
+# Minimum cosine similarity for an embedding route to count as a match
+EMBEDDING_MIN_SCORE = 0.18
 
 class CapabilityIndex:
     """
     A dynamic index of all available SAP capabilities (Agents & Tools).
     Allows for 'semantic' lookup of the best tool for a given query.
     """
-    def __init__(self):
+    def __init__(self, routing_mode=ROUTING_MODE):
         self.index = []
+        self.routing_mode = routing_mode
+        self._agent_lookup = {}
+        self._lookup_size = -1
+        self._postings_size = -1
+        self._router = None
+        self._router_size = -1
         self._build_index()
 
     def _build_index(self):
@@ -180,40 +207,146 @@ class CapabilityIndex:
         ]
         print(f"[Capability Index] 📚 Indexed {len(self.index)} capabilities.")
 
+    def find_agent(self, name: str) -> dict:
+        """
+        First capability whose agent or category equals name (O(1)).
+        The lookup table is rebuilt if capabilities were added to the index.
+        """
+        if self._lookup_size != len(self.index):
+            lookup = {}
+            for cap in self.index:
+                lookup.setdefault(cap['agent'], cap)
+                if cap.get('category'):
+                    lookup.setdefault(cap['category'], cap)
+            self._agent_lookup = lookup
+            self._lookup_size = len(self.index)
+        return self._agent_lookup.get(name)
+
+    def _build_postings(self):
+        """
+        Inverted indexes over the capability list (rebuilt if it grows):
+        - keyword postings: first word of each keyword -> (position, regex, weight);
+          the word-boundary regex only runs for keywords whose first word occurs
+          in the query.
+        - description postings: whitespace token -> positions (legacy overlap).
+        - BM25 postings: word -> (position, precomputed BM25 term weight).
+        """
+        keyword_postings = defaultdict(list)
+        desc_postings = defaultdict(list)
+        docs = []
+        for pos, cap in enumerate(self.index):
+            for kw in cap.get('keywords', []):
+                kw = kw.lower()
+                first = TOKEN_PATTERN.search(kw)
+                if not first:
+                    continue
+                # Use regex for word boundary to avoid "rma" matching "Germany"
+                regex = re.compile(r'\b' + re.escape(kw) + r'\b')
+                weight = ID_PREFIX_WEIGHT if kw.endswith("-") else KEYWORD_WEIGHT
+                keyword_postings[first.group()].append((pos, regex, weight))
+            for token in set(cap['description'].lower().split()):
+                desc_postings[token].append(pos)
+            text = cap['description'] + " " + " ".join(cap.get('keywords', []))
+            docs.append(TOKEN_PATTERN.findall(text.lower()))
+
+        bm25_postings = defaultdict(list)
+        n_docs = len(docs)
+        avg_len = (sum(len(d) for d in docs) / n_docs) if n_docs else 0
+        for pos, tokens in enumerate(docs):
+            tf = defaultdict(int)
+            for token in tokens:
+                tf[token] += 1
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / avg_len) if avg_len else BM25_K1
+            for token, freq in tf.items():
+                bm25_postings[token].append((pos, freq * (BM25_K1 + 1) / (freq + norm)))
+        for token, postings in bm25_postings.items():
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            bm25_postings[token] = [(pos, idf * weight) for pos, weight in postings]
+
+        self._keyword_postings = dict(keyword_postings)
+        self._desc_postings = dict(desc_postings)
+        self._bm25_postings = dict(bm25_postings)
+        self._postings_size = len(self.index)
+
+    def _keyword_scores(self, query_lower: str, scores: dict):
+        for token in set(TOKEN_PATTERN.findall(query_lower)):
+            for pos, regex, weight in self._keyword_postings.get(token, ()):
+                if regex.search(query_lower):
+                    scores[pos] += weight
+
     def find_capability(self, query: str) -> dict:
         """
         Finds the best capability for a given query.
-        Simulates a semantic search by scoring keyword overlaps.
+        Simulates a semantic search by scoring keyword overlaps:
+        keyword hits (word-bounded) plus description word overlap.
+        Only capabilities sharing a term with the query are scored.
         """
-        best_match = None
-        highest_score = 0
-        query_words = set(query.lower().split())
-
-        for cap in self.index:
-            score = 0
-            # Keyword match
-            import re
-            for kw in cap['keywords']:
-                # Use regex for word boundary to avoid "rma" matching "Germany"
-                pattern = r'\b' + re.escape(kw) + r'\b'
-                if re.search(pattern, query.lower()):
-                    if kw.endswith("-"):
-                        score += 20 # Strong signal for ID prefixes
-                    else:
-                        score += 5
-            
-            # Description overlap
-            desc_words = set(cap['description'].lower().split())
-            overlap = query_words.intersection(desc_words)
-            score += len(overlap)
-
-            if score > highest_score:
-                highest_score = score
-                best_match = cap
-
-        if best_match and highest_score > 0:
-            return best_match
+        if self.routing_mode == "embedding":
+            hits = self.embedding_search(query, top_k=1)
+            if hits and hits[0]["score"] >= EMBEDDING_MIN_SCORE:
+                return hits[0]["capability"]
+            return None
+
+        if self._postings_size != len(self.index):
+            self._build_postings()
+        query_lower = query.lower()
+        scores = defaultdict(int)
+        self._keyword_scores(query_lower, scores)
+        # Description overlap
+        for word in set(query_lower.split()):
+            for pos in self._desc_postings.get(word, ()):
+                scores[pos] += 1
+
+        # Highest score wins; ties go to the capability listed first
+        best = min(scores.items(), key=lambda item: (-item[1], item[0]), default=None)
+        if best and best[1] > 0:
+            return self.index[best[0]]
         return None
 
+    def search(self, query: str, top_k: int = 5) -> list:
+        """
+        Ranked capabilities for a query: BM25 over description and keywords,
+        plus the keyword-phrase weights used for routing.
+        Returns up to top_k [{"capability": ..., "score": ...}], best first.
+        """
+        if self._postings_size != len(self.index):
+            self._build_postings()
+        query_lower = query.lower()
+        scores = defaultdict(float)
+        self._keyword_scores(query_lower, scores)
+        for token in TOKEN_PATTERN.findall(query_lower):
+            for pos, weight in self._bm25_postings.get(token, ()):
+                scores[pos] += weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [{"capability": self.index[pos], "score": round(score, 4)} for pos, score in ranked if score > 0]
+
+    def _embedding_router(self) -> EmbeddingRouter:
+        """Embeds capability texts once (re-embedded if the index grows)."""
+        if self._router_size != len(self.index):
+            texts = [
+                f"{cap['description']} {' '.join(cap.get('keywords', []))} {cap.get('category', '')}"
+                for cap in self.index
+            ]
+            self._router = EmbeddingRouter(texts)
+            self._router_size = len(self.index)
+        return self._router
+
+    def embedding_search(self, query: str, top_k: int = 5) -> list:
+        """
+        Vector routing: cosine similarity between the query and the
+        capability embeddings. Returns up to top_k [{"capability", "score"}].
+        """
+        hits = self._embedding_router().route(query, top_k)
+        return [{"capability": self.index[pos], "score": round(score, 4)} for pos, score in hits]
+
+    def route_batch(self, queries: list, top_k: int = 1) -> list:
+        """embedding_search for many queries at once (one matrix product)."""
+        batches = self._embedding_router().route_batch(queries, top_k)
+        return [
+            [{"capability": self.index[pos], "score": round(score, 4)} for pos, score in hits]
+            for hits in batches
+        ]
+
 # Global Instance
 capability_index = CapabilityIndex()
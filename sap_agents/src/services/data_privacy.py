@@ -1,34 +1,54 @@
-import re
+from src.services.redaction import RedactionPolicy, RedactionRule, email_rule
+
+# Amounts like $1200, $1,200 or $1,200.50
+AMOUNT_PATTERN = r"\$\d+(?:,\d{3})*(?:\.\d{2})?"
 
 class DataPrivacyService:
     """
     Masks sensitive data based on user role and clearance level.
     """
     def __init__(self):
-        self.sensitive_patterns = {
-            "email": r"[^@]+@[^@]+\.[^@]+",
-            "salary": r"\$\d+(?:,\d{3})*(?:\.\d{2})?",
-            "credit_limit": r"Credit Limit \$\d+"
-        }
+        self.policy = RedactionPolicy(
+            groups={
+                "financial": [
+                    # Matches from "Credit", so it wins over the bare amount inside it
+                    RedactionRule("credit_limit", r"Credit Limit " + AMOUNT_PATTERN, "Credit Limit [REDACTED]"),
+                    RedactionRule("salary", AMOUNT_PATTERN, "[REDACTED SALARY]"),
+                ],
+                "pii": [
+                    email_rule("email", "[REDACTED EMAIL]"),
+                ],
+            },
+            visibility={
+                # Rule: Only 'CFO' or 'L2+' can see Financials (Salary, Credit Limit)
+                "financial": lambda role, clearance: role == "CFO" or clearance in ("L2", "L3"),
+                # Rule: Only 'Admin' or 'L3' can see PII (Emails)
+                "pii": lambda role, clearance: role == "IT Admin" or clearance == "L3",
+            },
+        )
 
     def secure_data(self, content: str, user_role: str, clearance: str) -> str:
         """
         Redacts sensitive information if the user is not authorized.
         """
         print(f"   [Data Privacy] 🛡️ Securing data for {user_role} ({clearance})...")
-        
-        secured_content = content
-        
-        # Rule: Only 'CFO' or 'L2+' can see Financials (Salary, Credit Limit)
-        if user_role != "CFO" and clearance not in ["L2", "L3"]:
-            secured_content = re.sub(self.sensitive_patterns["salary"], "[REDACTED SALARY]", secured_content)
-            secured_content = re.sub(self.sensitive_patterns["credit_limit"], "Credit Limit [REDACTED]", secured_content)
-            
-        # Rule: Only 'Admin' or 'L3' can see PII (Emails)
-        if user_role != "IT Admin" and clearance != "L3":
-             secured_content = re.sub(self.sensitive_patterns["email"], "[REDACTED EMAIL]", secured_content)
+        return self.policy.redact(content, user_role, clearance)
+
+    def stream_redactor(self, user_role: str, clearance: str):
+        """
+        StreamingRedactor for the caller: feed() chunks as they arrive and
+        close() at the end; `count` tells how many values were masked.
+        """
+        print(f"   [Data Privacy] 🛡️ Securing stream for {user_role} ({clearance})...")
+        return self.policy.engine_for(user_role, clearance).stream()
 
-        return secured_content
+    def secure_stream(self, chunks, user_role: str, clearance: str):
+        """
+        Streaming secure_data: masks an iterable of text chunks (e.g. a large
+        tool output as it arrives), yielding masked text as soon as it is final.
+        """
+        print(f"   [Data Privacy] 🛡️ Securing stream for {user_role} ({clearance})...")
+        return self.policy.redact_stream(chunks, user_role, clearance)
 
 # Global Instance
 data_privacy = DataPrivacyService()
@@ -0,0 +1,143 @@
+"""
+Embedding Router: offline vector routing for the capability index.
+Capabilities are embedded once with a hashing TF-IDF vectorizer (no model
+download, no network) into one contiguous float32 matrix. A query is
+scored with a single matrix-vector product over the features it
+actually contains, and top-k comes from argpartition.
+"""
+import re
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Hashed feature space (memory: N_FEATURES * capabilities * 4 bytes)
+N_FEATURES = 2 ** 11
+
+# Queries scored per route_batch chunk (bounds the score matrix)
+BATCH_ROWS = 1024
+
+# Function words that carry no routing signal
+STOP_WORDS = frozenset(
+    "a an the is are was of for to in on at by with from and or what how my our "
+    "me i do does have has there this that it be you your show tell check".split()
+)
+
+
+class HashingVectorizer:
+    """
+    Word unigrams, word bigrams and character 4-grams (so "booking" still
+    overlaps "book") hashed (crc32) into n_features buckets, sublinear TF,
+    IDF fitted on the capability corpus, L2 normalized.
+    """
+
+    def __init__(self, n_features: int = N_FEATURES):
+        self.n_features = n_features
+        self.idf = np.ones(n_features, dtype=np.float32)
+
+    def _features(self, text: str) -> Dict[int, float]:
+        tokens = [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for token in tokens:
+            padded = f"#{token}#"
+            grams.extend(padded[i:i + 4] for i in range(len(padded) - 3))
+        counts: Dict[int, float] = {}
+        for gram in grams:
+            bucket = zlib.crc32(gram.encode("utf-8")) % self.n_features
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+        return counts
+
+    def fit(self, texts: Sequence[str]):
+        df = np.zeros(self.n_features, dtype=np.float32)
+        for text in texts:
+            df[list(self._features(text))] += 1
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+        return self
+
+    def transform_sparse(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(feature indices, L2-normalized weights) for one text."""
+        counts = self._features(text)
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = (1 + np.log(tf)) * self.idf[idx]
+        norm = np.linalg.norm(weights)
+        return idx, (weights / norm if norm else weights)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Dense (len(texts), n_features) float32 matrix."""
+        out = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            idx, weights = self.transform_sparse(text)
+            out[row, idx] = weights
+        return out
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores (best first); ties keep index order."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.lexsort((part, -scores[part]))]
+
+
+class EmbeddingRouter:
+    """Cosine-similarity router over a fixed list of capability texts."""
+
+    def __init__(self, texts: Sequence[str], n_features: int = N_FEATURES):
+        self.vectorizer = HashingVectorizer(n_features).fit(texts)
+        # Stored feature-major (n_features x capabilities) so the rows for a
+        # query's few non-zero features are contiguous slices
+        self.matrix_t = np.ascontiguousarray(self.vectorizer.transform(texts).T)
+
+    def __len__(self) -> int:
+        return self.matrix_t.shape[1]
+
+    def route(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """[(capability position, cosine score)] best first, score > 0 only."""
+        idx, weights = self.vectorizer.transform_sparse(query)
+        if not len(idx) or not len(self):
+            return []
+        scores = weights @ self.matrix_t[idx]
+        return [(int(pos), float(scores[pos])) for pos in _top_k(scores, top_k) if scores[pos] > 0]
+
+    def route_batch(self, queries: Sequence[str], top_k: int = 5) -> List[List[Tuple[int, float]]]:
+        """
+        Routes many queries at once. Each query's score row is one sparse
+        matrix-vector product (cheaper than a dense matrix-matrix product,
+        since queries touch few features); rows are ranked together with one
+        argpartition per chunk of BATCH_ROWS queries.
+        """
+        n_caps = len(self)
+        if not n_caps:
+            return [[] for _ in queries]
+        results: List[List[Tuple[int, float]]] = []
+        for start in range(0, len(queries), BATCH_ROWS):
+            chunk = queries[start:start + BATCH_ROWS]
+            scores = np.zeros((len(chunk), n_caps), dtype=np.float32)
+            for row, query in enumerate(chunk):
+                idx, weights = self.vectorizer.transform_sparse(query)
+                if len(idx):
+                    scores[row] = weights @ self.matrix_t[idx]
+            results.extend(self._rank_rows(scores, top_k))
+        return results
+
+    @staticmethod
+    def _rank_rows(scores: np.ndarray, top_k: int) -> List[List[Tuple[int, float]]]:
+        """Top-k per row (best first, ties by position), score > 0 only."""
+        k = min(top_k, scores.shape[1])
+        if k < scores.shape[1]:
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        values = np.take_along_axis(scores, part, axis=1)
+        order = np.lexsort((part, -values), axis=1)
+        cols = np.take_along_axis(part, order, axis=1).tolist()
+        values = np.take_along_axis(values, order, axis=1).tolist()
+        return [
+            [(col, value) for col, value in zip(row_cols, row_values) if value > 0]
+            for row_cols, row_values in zip(cols, values)
+        ]
@@ -1,61 +1,186 @@
 import json
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from collections import Counter, deque
 
-AUDIT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'audit_log.json')
+from src.core.latency_metrics import latency_metrics
+from src.services.audit_service import AUDIT_LOG_DIR, OPEN_SEGMENTS, AuditSegmentStore, flush_log
+
+# Rolling KPI windows (label -> seconds)
+KPI_WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+
+# log_feedback stores "Rating: N/5, Comment: ..." as the detail string
+RATING_PATTERN = re.compile(r"Rating:\s*(-?\d+)")
+
+
+class KpiCounters:
+    """Additive KPI counters, so windows can add and evict per-second buckets."""
+    __slots__ = ("requests", "successes", "rating_sum", "rated", "errors", "agents")
 
-class MonitoringService:
     def __init__(self):
+        self.requests = 0
+        self.successes = 0
+        self.rating_sum = 0
+        self.rated = 0
+        self.errors = 0
+        self.agents = Counter()
+
+    def add_event(self, entry):
+        step = entry.get('step')
+        if step == 'TRANSACTION':
+            self.requests += 1
+
+        if step == 'OUTCOME' and entry.get('status') == 'SUCCESS':
+            self.successes += 1
+
+        if step == 'FEEDBACK':
+            detail = entry.get('detail', {})
+            if isinstance(detail, dict):
+                rating = detail.get('rating', 0)
+            else:
+                match = RATING_PATTERN.search(str(detail))
+                rating = int(match.group(1)) if match else 0
+            if rating > 0:
+                self.rating_sum += rating
+                self.rated += 1
+
+        if step == 'DECISION':
+            # Extract agent name from "Routed to X"
+            detail = entry.get('detail', '')
+            if isinstance(detail, str) and "Routed to" in detail:
+                self.agents[detail.replace("Routed to ", "").strip()] += 1
+
+        if entry.get('status') == 'FAIL' or entry.get('status') == 'CRITICAL':
+            self.errors += 1
+
+    def merge(self, other, sign=1):
+        self.requests += sign * other.requests
+        self.successes += sign * other.successes
+        self.rating_sum += sign * other.rating_sum
+        self.rated += sign * other.rated
+        self.errors += sign * other.errors
+        if sign > 0:
+            self.agents.update(other.agents)
+        else:
+            self.agents.subtract(other.agents)
+            self.agents += Counter()  # Drop agents whose count reached zero
+
+    def snapshot(self):
+        success_rate = (self.successes / self.requests * 100) if self.requests > 0 else 100
+        avg_rating = (self.rating_sum / self.rated) if self.rated > 0 else 5.0
+        return {
+            "total_requests": self.requests,
+            "success_rate": round(success_rate, 1),
+            "avg_rating": round(avg_rating, 1),
+            "active_agents_count": len(self.agents),
+            "error_count": self.errors,
+        }
+
+
+class RollingWindow:
+    """
+    KPIs over the last `seconds` of event time, kept as per-second buckets
+    with running totals: adding an event and evicting old buckets are O(1).
+    Events arriving slightly out of order are merged into the newest bucket.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.buckets = deque()   # (second, KpiCounters), oldest first
+        self.totals = KpiCounters()
+
+    def add(self, second, entry):
+        if not self.buckets or second > self.buckets[-1][0]:
+            self.buckets.append((second, KpiCounters()))
+        self.buckets[-1][1].add_event(entry)
+        self.totals.add_event(entry)
+
+    def evict(self, now):
+        cutoff = now - self.seconds
+        while self.buckets and self.buckets[0][0] <= cutoff:
+            _, counters = self.buckets.popleft()
+            self.totals.merge(counters, sign=-1)
+
+
+class MonitoringService:
+    """
+    System KPIs maintained incrementally by tailing the audit segment store.
+    Each poll stats only the newest OPEN_SEGMENTS segments (plus any created
+    since the last poll) and reads the bytes appended since then; the
+    directory is listed again only when a segment file appears.
+    """
+    def __init__(self, log_dir=AUDIT_LOG_DIR):
+        self.log_dir = log_dir
         self._ensure_log_exists()
+        self._store = AuditSegmentStore(log_dir)
+        self._lock = threading.Lock()
+        self._segments = []         # Known segment buckets, in time order
+        self._listing_version = None
+        self._offsets = {}          # segment bucket -> bytes consumed
+        self.totals = KpiCounters()
+        self.windows = {label: RollingWindow(seconds) for label, seconds in KPI_WINDOWS.items()}
 
     def _ensure_log_exists(self):
-        if not os.path.exists(AUDIT_LOG_PATH):
-            os.makedirs(os.path.dirname(AUDIT_LOG_PATH), exist_ok=True)
-            with open(AUDIT_LOG_PATH, 'w') as f:
-                json.dump([], f)
+        os.makedirs(self.log_dir, exist_ok=True)
+
+    def _tail(self):
+        """Consumes complete audit lines appended since the last call."""
+        flush_log(self.log_dir)
+        buckets = set(self._segments[-OPEN_SEGMENTS:])
+        version = self._store.listing_version()
+        if version != self._listing_version:
+            # Read the version first: a segment created while listing changes it again
+            self._listing_version = version
+            known = set(self._segments)
+            self._segments = self._store.segments()
+            buckets.update(bucket for bucket in self._segments if bucket not in known)
+        horizon = time.time() - max(KPI_WINDOWS.values())
+        for bucket in sorted(buckets):
+            path = self._store.segment_path(bucket)
+            consumed = self._offsets.get(bucket, 0)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            if size <= consumed:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(consumed)
+                chunk = f.read(size - consumed)
+            complete = chunk.rfind(b"\n") + 1
+            for line in chunk[:complete].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.totals.add_event(entry)
+                timestamp = entry.get('timestamp') or 0
+                if timestamp > horizon:
+                    for window in self.windows.values():
+                        window.add(int(timestamp), entry)
+            self._offsets[bucket] = consumed + complete
 
     def get_system_health(self):
         """
         Calculates system KPIs from the audit log.
         """
-        try:
-            with open(AUDIT_LOG_PATH, 'r') as f:
-                logs = json.load(f)
-        except Exception:
-            logs = []
-
-        total_requests = 0
-        successful_requests = 0
-        total_rating = 0
-        rated_requests = 0
-        active_agents = set()
-        errors = 0
-
-        for entry in logs:
-            if entry.get('step') == 'TRANSACTION':
-                total_requests += 1
-            
-            if entry.get('step') == 'OUTCOME' and entry.get('status') == 'SUCCESS':
-                successful_requests += 1
-            
-            if entry.get('step') == 'FEEDBACK':
-                rating = entry.get('detail', {}).get('rating', 0)
-                if rating > 0:
-                    total_rating += rating
-                    rated_requests += 1
-            
-            if entry.get('step') == 'DECISION':
-                # Extract agent name from "Routed to X"
-                detail = entry.get('detail', '')
-                if "Routed to" in detail:
-                    agent = detail.replace("Routed to ", "").strip()
-                    active_agents.add(agent)
-
-            if entry.get('status') == 'FAIL' or entry.get('status') == 'CRITICAL':
-                errors += 1
-
-        success_rate = (successful_requests / total_requests * 100) if total_requests > 0 else 100
-        avg_rating = (total_rating / rated_requests) if rated_requests > 0 else 5.0
+        with self._lock:
+            try:
+                self._tail()
+            except Exception as e:
+                print(f"[Monitoring] ⚠️ Audit log tail failed: {e}")
+            now = time.time()
+            for window in self.windows.values():
+                window.evict(now)
+            system = self.totals.snapshot()
+            windows = {label: window.totals.snapshot() for label, window in self.windows.items()}
+
+        success_rate = system["success_rate"]
+        errors = system["error_count"]
+        # Mean end-to-end latency of requests served by this process
+        requests = latency_metrics.histogram("stage", "request")
+        avg_response_time = requests.mean() if requests else 0.0
 
         # Simulated Business Metrics (Demo Mode)
         # In a real app, these would query the Sales/Finance/ESG agents or DB
@@ -69,19 +194,20 @@ class MonitoringService:
 
         return {
             "system": {
-                "total_requests": total_requests,
-                "success_rate": round(success_rate, 1),
-                "avg_rating": round(avg_rating, 1),
-                "active_agents_count": len(active_agents),
-                "avg_response_time": f"{0.8 + (errors * 0.1):.2f}s", # Simulated latency based on load/errors
+                "total_requests": system["total_requests"],
+                "success_rate": success_rate,
+                "avg_rating": system["avg_rating"],
+                "active_agents_count": system["active_agents_count"],
+                "avg_response_time": f"{avg_response_time:.2f}s",
                 "error_count": errors,
                 "status": "Healthy" if success_rate > 90 else "Degraded"
             },
+            "windows": windows,
             "business": business_health
         }
 
-def create_monitoring_service():
-    return MonitoringService()
+def create_monitoring_service(log_dir=AUDIT_LOG_DIR):
+    return MonitoringService(log_dir)
 
 # Singleton
 monitoring_service = create_monitoring_service()
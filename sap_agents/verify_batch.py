@@ -0,0 +1,126 @@
+import sys
+import os
+import time
+import random
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from src.api.main import app
+from src.core.engine import POOL_MIN_BATCH, engine
+from tests.generate_scenarios import ScenarioGenerator
+
+EXTRA = [
+    "Find the risk for the vendor of invoice #1",   # Multi-hop (GraphWalker)
+    "Show orders for the vendor",                   # Clarification
+    "Tell me a joke",                               # No intent
+]
+
+def build_batch(count, distinct):
+    random.seed(25)
+    scenarios = ScenarioGenerator().generate_scenarios(distinct) + EXTRA
+    return [random.choice(scenarios) for _ in range(count)]
+
+def counting(calls, name, func):
+    def wrapper(**params):
+        calls.append((name, tuple(sorted(params.items()))))
+        return func(**params)
+    return wrapper
+
+def counting_batch(calls, name, batch_func):
+    def wrapper(param_sets):
+        calls.extend((name, tuple(sorted(params.items()))) for params in param_sets)
+        return batch_func(param_sets)
+    return wrapper
+
+def verify_batch():
+    print("🚀 Testing Batch Query Execution")
+    print("--------------------------------")
+    prompts = build_batch(3000, 300)
+
+    # 1. Same results as one execute() per prompt, in order
+    print("\n🔹 Step 1: Parity with execute()...")
+    expected = [engine.execute(prompt) for prompt in prompts]
+    results = engine.execute_many(prompts)
+    assert len(results) == len(prompts)
+    for prompt, got, want in zip(prompts, results, expected):
+        assert got == want, f"Mismatch for {prompt!r}"
+    print(f"   {len(prompts)} prompts ({len(set(prompts))} distinct) match execute().")
+
+    # 2. Each distinct (tool, params) call runs once
+    print("\n🔹 Step 2: Dedupe and grouping...")
+    singles = [prompt for prompt in prompts if not engine.is_multihop_query(prompt)]
+    calls = []
+    originals = {}
+    for name, tool in engine.registry.tools.items():
+        originals[name] = (tool.func, tool.batch_func)
+        tool.func = counting(calls, name, tool.func)
+        if tool.batch_func:
+            tool.batch_func = counting_batch(calls, name, tool.batch_func)
+    try:
+        for cache in engine.registry.caches.values():
+            cache.clear()
+        engine.execute_many(singles)
+    finally:
+        for name, (func, batch_func) in originals.items():
+            engine.registry.tools[name].func = func
+            engine.registry.tools[name].batch_func = batch_func
+    planned = {(r["tool_used"], tuple(sorted(r["params_used"].items())))
+               for prompt, r in zip(prompts, expected) if prompt in singles and r.get("tool_used") in engine.registry.tools}
+    assert sorted(calls) == sorted(planned), "Tool calls were repeated or missed"
+    print(f"   {len(calls)} tool calls for {len(singles)} single-tool prompts.")
+
+    # 3. Throughput
+    print("\n🔹 Step 3: Throughput...")
+    engine.plan_cache.clear()
+    start = time.perf_counter()
+    for prompt in prompts:
+        engine.execute(prompt)
+    loop_time = time.perf_counter() - start
+    engine.plan_cache.clear()
+    start = time.perf_counter()
+    engine.execute_many(prompts)
+    batch_time = time.perf_counter() - start
+    print(f"   execute() loop {loop_time * 1000:.0f}ms, execute_many {batch_time * 1000:.0f}ms.")
+
+    # 4. Analysis pool: started once, reused, same plans; stale workers are bypassed
+    print("\n🔹 Step 4: Analysis pool...")
+    large = list(dict.fromkeys(ScenarioGenerator().generate_scenarios(3000)))
+    assert len(large) >= POOL_MIN_BATCH
+    engine.start_analysis_pool(2)
+    try:
+        executor = engine._analysis_pool[0]
+        workers = set(executor._processes)
+        for _ in range(2):
+            engine.plan_cache.clear()
+            assert engine.execute_many(large) == [engine.execute(prompt) for prompt in large], "Pool results differ"
+        assert engine._analysis_pool[0] is executor and set(executor._processes) == workers, "Pool was not reused"
+        engine.db.vendors.append({"id": "99999", "name": "Batchco Industries", "country": "DE", "rating": "A"})
+        try:
+            engine.plan_cache.clear()
+            fresh = engine.execute_many(large + ["Show orders for Batchco Industries"])
+            assert fresh[-1]["params_used"].get("vendor_name") == "Batchco Industries", "Stale worker plans used"
+        finally:
+            engine.db.vendors.pop()
+    finally:
+        engine.stop_analysis_pool()
+    print(f"   {len(large)} distinct prompts on {len(workers)} reused workers; stale workers bypassed.")
+
+    # 5. HTTP endpoint
+    print("\n🔹 Step 5: POST /api/chat/batch...")
+    client = TestClient(app)
+    messages = prompts[:50]
+    response = client.post("/api/chat/batch", json={"messages": messages})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == len(messages)
+    for message, result in zip(messages[:10], body["results"]):
+        assert result == client.post("/api/chat", json={"message": message}).json(), message
+    assert client.post("/api/chat/batch", json={"messages": []}).status_code == 422
+    print(f"   {body['count']} results, identical to /api/chat.")
+
+    print("\n✅ Batch Verification Passed!")
+
+if __name__ == "__main__":
+    verify_batch()
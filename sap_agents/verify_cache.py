@@ -0,0 +1,34 @@
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.meta_registry import MetaRegistry
+
+def verify_cache():
+    print("🚀 Testing Tool Result Cache")
+    print("----------------------------")
+    registry = MetaRegistry()
+
+    # 1. Callers mutating a result do not change what later callers get
+    print("\n🔹 Step 1: Cached results are not shared...")
+    expected = registry.invoke("find_purchase_orders", status="Open")
+    assert expected, "No open purchase orders to test with"
+    first = registry.invoke("find_purchase_orders", status="Open")
+    first[0]["status"] = "Tampered"
+    first.append({"id": "bogus"})
+    assert registry.invoke("find_purchase_orders", status="Open") == expected, "invoke() cache corrupted"
+
+    batch = registry.invoke_batch("find_purchase_orders", [{"status": "Open"}, {"status": "Open"}, {"status": "Late"}])
+    assert batch[0] == batch[1] == expected and batch[0] is not batch[1]
+    batch[0][0]["total_value"] = -1
+    batch[1].clear()
+    assert registry.invoke_batch("find_purchase_orders", [{"status": "Open"}])[0] == expected, "invoke_batch() cache corrupted"
+    assert registry.cache_stats()["find_purchase_orders"]["hits"] >= 3
+    print(f"   {len(expected)} rows served unchanged after callers mutated their copies.")
+
+    print("\n✅ Cache Verification Passed!")
+
+if __name__ == "__main__":
+    verify_cache()
@@ -0,0 +1,100 @@
+import sys
+import os
+import json
+import time
+import asyncio
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from src.api.main import app
+from src.core.engine import engine
+
+ENGINE_LATENCY = 0.5  # Simulated slow SAP call
+
+def parse(body):
+    frames = [frame for frame in body.split("\n\n") if frame]
+    return [(frame.split("\n")[0][len("event: "):], json.loads(frame.split("\n")[1][len("data: "):])) for frame in frames]
+
+async def run_checks():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # 1. Event order and parity with /api/chat
+        print("\n🔹 Step 1: Event sequence...")
+        for message in ["Show purchase orders for Acme Corp", "Find the risk for the vendor of invoice #1"]:
+            response = await client.post("/api/chat/stream", json={"message": message})
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse(response.text)
+            kinds = [kind for kind, _ in events]
+            assert kinds[0] == "start" and kinds[-2:] == ["result", "done"], kinds
+            result = events[-2][1]
+            rows = [data for kind, data in events if kind == "row"]
+            blocking = (await client.post("/api/chat", json={"message": message})).json()
+            assert result["response"] == blocking["response"]
+            assert rows == blocking["data"] and result["count"] == len(rows)
+            print(f"   {message!r}: {', '.join(f'{kinds.count(k)} {k}' for k in dict.fromkeys(kinds))}")
+        assert "hop" in kinds, "GraphWalker hops were not streamed"
+
+        # 2. First byte arrives before the (slow) engine finishes; loop stays free
+        print("\n🔹 Step 2: Time to first byte under a slow engine...")
+        execute = engine.execute
+        def slow_execute(prompt, on_event=None, **kwargs):
+            time.sleep(ENGINE_LATENCY)
+            return execute(prompt, on_event, **kwargs)
+        engine.execute = slow_execute
+        try:
+            start = time.perf_counter()
+            stream = asyncio.ensure_future(timed_asgi_post("/api/chat/stream", {"message": "Show invoices"}))
+            await asyncio.sleep(ENGINE_LATENCY / 5)
+            health_start = time.perf_counter()
+            await client.get("/api/health")
+            health_time = time.perf_counter() - health_start
+            chunks = await stream
+        finally:
+            engine.execute = execute
+        ttfb = chunks[0][0] - start
+        total = chunks[-1][0] - start
+        print(f"   TTFB {ttfb * 1000:.1f}ms, total {total * 1000:.0f}ms, concurrent /api/health {health_time * 1000:.1f}ms")
+        assert chunks[0][1].startswith(b"event: start")
+        kinds = [kind for kind, _ in parse(b"".join(chunk for _, chunk in chunks).decode())]
+        assert "error" not in kinds, kinds
+        assert kinds[-2:] == ["result", "done"], kinds
+        assert total >= ENGINE_LATENCY, f"Stream finished in {total * 1000:.0f}ms, before the engine could"
+        assert ttfb < 0.1, f"First event took {ttfb * 1000:.0f}ms"
+        assert health_time < ENGINE_LATENCY / 2, "Event loop blocked by the engine"
+
+async def timed_asgi_post(path, payload):
+    """
+    Calls the ASGI app directly and returns [(time, body chunk)] as sent
+    (httpx's ASGI transport buffers the whole body, hiding TTFB).
+    """
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("test", 0), "server": ("test", 80),
+    }
+    requested = False
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # Never disconnects
+    chunks = []
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append((time.perf_counter(), message["body"]))
+    await app(scope, receive, send)
+    return chunks
+
+def verify_chat_stream():
+    print("🚀 Testing Streaming Chat Endpoint (SSE)")
+    print("----------------------------------------")
+    asyncio.run(run_checks())
+    print("\n✅ Chat Stream Verification Passed!")
+
+if __name__ == "__main__":
+    verify_chat_stream()
@@ -1,12 +1,13 @@
 import sys
 import os
-import json
 import time
+import tempfile
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.services.monitoring_service import create_monitoring_service, AUDIT_LOG_PATH
+from src.services.audit_service import AuditSegmentStore
+from src.services.monitoring_service import OPEN_SEGMENTS, create_monitoring_service
 
 def verify_monitoring():
     print("🚀 Testing System Monitoring Service")
@@ -31,25 +32,75 @@ def verify_monitoring():
         {"step": "FEEDBACK", "detail": {"rating": 4}}
     ]
     
-    with open(AUDIT_LOG_PATH, 'w') as f:
-        json.dump(mock_logs, f)
+    audit_dir = tempfile.TemporaryDirectory()
+    store = AuditSegmentStore(audit_dir.name)
+    now = time.time()
+    for event in mock_logs:
+        event["timestamp"] = now - 120  # Outside the 1m window, inside 5m
+    store.append(mock_logs)
         
     print("   Seeded 3 transactions (2 Success, 1 Fail).")
     
     # 2. Verify Metrics
     print("\n🔹 Step 2: Verifying Metrics Calculation...")
-    monitor = create_monitoring_service()
+    monitor = create_monitoring_service(audit_dir.name)
     health = monitor.get_system_health()
     
-    print(f"   Calculated Health: {health}")
+    print(f"   Calculated Health: {health['system']}")
     
     # Assertions
-    assert health['total_requests'] == 3, f"Expected 3 requests, got {health['total_requests']}"
-    assert health['success_rate'] == 66.7, f"Expected 66.7% success, got {health['success_rate']}"
-    assert health['avg_rating'] == 3.3, f"Expected 3.3 rating, got {health['avg_rating']}"
-    assert health['active_agents_count'] == 2, f"Expected 2 agents, got {health['active_agents_count']}"
+    system = health['system']
+    assert system['total_requests'] == 3, f"Expected 3 requests, got {system['total_requests']}"
+    assert system['success_rate'] == 66.7, f"Expected 66.7% success, got {system['success_rate']}"
+    assert system['avg_rating'] == 3.3, f"Expected 3.3 rating, got {system['avg_rating']}"
+    assert system['active_agents_count'] == 2, f"Expected 2 agents, got {system['active_agents_count']}"
     
     print("   ✅ Metrics Verified Successfully.")
+    
+    # 3. Incremental Tailing & Rolling Windows
+    print("\n🔹 Step 3: Verifying Incremental Updates & Windows...")
+    store.append([
+        {"step": "TRANSACTION", "detail": "Req 4", "timestamp": now},
+        {"step": "OUTCOME", "status": "SUCCESS", "timestamp": now},
+        {"step": "FEEDBACK", "detail": "Rating: 5/5, Comment: Great", "timestamp": now},
+        {"step": "TRANSACTION", "detail": "Req 0", "timestamp": now - 7200},
+    ])
+    health = monitor.get_system_health()
+    system, windows = health['system'], health['windows']
+    print(f"   Windows: {windows}")
+    
+    assert system['total_requests'] == 5, f"Expected 5 requests, got {system['total_requests']}"
+    assert system['avg_rating'] == 3.8, f"Expected 3.8 rating, got {system['avg_rating']}"
+    assert windows['1m']['total_requests'] == 1, f"Expected 1 request in 1m, got {windows['1m']}"
+    assert windows['1m']['avg_rating'] == 5.0
+    assert windows['5m']['total_requests'] == 4, f"Expected 4 requests in 5m, got {windows['5m']}"
+    assert windows['1h']['total_requests'] == 4, f"Expected 4 requests in 1h, got {windows['1h']}"
+    
+    # Nothing new appended: counters must not double count
+    assert monitor.get_system_health()['system']['total_requests'] == 5
+    
+    audit_dir.cleanup()
+    print("   ✅ Incremental KPIs Verified Successfully.")
+
+    # 4. Poll cost follows new events, not the number of segments
+    print("\n🔹 Step 4: Verifying Poll Cost with Many Segments...")
+    audit_dir = tempfile.TemporaryDirectory()
+    store = AuditSegmentStore(audit_dir.name)
+    store.append([{"step": "TRANSACTION", "detail": f"Old {i}", "timestamp": now - 3600 * (i + 1)} for i in range(1000)])
+    monitor = create_monitoring_service(audit_dir.name)
+    assert monitor.get_system_health()['system']['total_requests'] == 1000
+    store.append([{"step": "TRANSACTION", "detail": "Req new", "timestamp": now}])
+    stats = []
+    getsize = os.path.getsize
+    os.path.getsize = lambda path: stats.append(path) or getsize(path)
+    try:
+        assert monitor.get_system_health()['system']['total_requests'] == 1001
+        assert monitor.get_system_health()['system']['total_requests'] == 1001
+    finally:
+        os.path.getsize = getsize
+    print(f"   {len(store.segments())} segments, {len(stats)} segment stats over 2 polls.")
+    assert len(stats) <= 2 * (OPEN_SEGMENTS + 1), f"{len(stats)} stats for 2 polls"
+    audit_dir.cleanup()
 
 if __name__ == "__main__":
     verify_monitoring()
@@ -0,0 +1,101 @@
+import sys
+import os
+import json
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from src.api.main import app
+from src.api.serialization import dumps
+from src.core.meta_registry import MetaRegistry, registry
+from src.core.mock_sap import MockDatabase
+from src.core.pagination import InvalidCursor
+
+FIELDS = ["id", "status", "total_value"]
+
+def walk(reg, name, params, limit, fields=None, cursor=None):
+    rows, pages = [], 0
+    while True:
+        page = reg.invoke_page(name, params, cursor=cursor, limit=limit, fields=fields)
+        rows.extend(page["rows"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows, page["total"], pages
+
+def verify_pagination():
+    print("🚀 Testing Paginated & Projected Tool Results")
+    print("---------------------------------------------")
+
+    # 1. Walking the cursor yields every row once, projected
+    print("\n🔹 Step 1: Cursor walk...")
+    for name, params in [("find_purchase_orders", {}), ("find_purchase_orders", {"status": "Open"}),
+                         ("find_invoices", {}), ("rank_vendors_by_risk", {})]:
+        full = registry.invoke(name, **params)
+        rows, total, pages = walk(registry, name, params, limit=7, fields=FIELDS)
+        assert total == len(full) == len(rows), (name, total, len(full), len(rows))
+        assert rows == [{f: r[f] for f in FIELDS if f in r} for r in full], name
+        print(f"   {name} {params}: {total} rows in {pages} pages")
+    page = registry.invoke_page("find_purchase_orders", {"status": "Open"}, limit=2)
+    try:
+        registry.invoke_page("find_purchase_orders", {"status": "Late"}, cursor=page["next_cursor"])
+        assert False, "Cursor accepted for another query"
+    except InvalidCursor:
+        pass
+
+    # 2. Keyset cursors survive inserts mid-walk (no skipped or repeated rows)
+    print("\n🔹 Step 2: Stability under writes...")
+    db = MockDatabase(scale_factor=1, seed=5)
+    reg = MetaRegistry()
+    reg.tools["find_purchase_orders"].page_func = db.find_pos_page
+    first = reg.invoke_page("find_purchase_orders", {}, limit=50, fields=["id"])
+    db.insert_purchase_order(dict(db.purchase_orders[0], id="NEW-1"))
+    rows, _, _ = walk(reg, "find_purchase_orders", {}, limit=50, fields=["id"], cursor=first["next_cursor"])
+    seen = [r["id"] for r in first["rows"] + rows]
+    assert seen == [po["id"] for po in db.purchase_orders], "Rows skipped or repeated"
+    print(f"   {len(seen)} rows, new row served once at the end.")
+
+    # 3. Pushdown: a page touches only its rows, even at scale
+    print("\n🔹 Step 3: Pushdown at scale...")
+    big = MockDatabase(scale_factor=100, seed=3)
+    start = time.perf_counter()
+    full_body = dumps(big.find_pos())
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    rows, total, _ = big.find_pos_page(limit=50, fields=FIELDS)
+    page_body = dumps(rows)
+    page_time = time.perf_counter() - start
+    print(f"   {total} POs: full {len(full_body) // 1024}KB in {full_time * 1000:.1f}ms, "
+          f"page {len(page_body)}B in {page_time * 1000:.2f}ms")
+    assert len(rows) == 50 and total == len(big.purchase_orders)
+    assert page_time < full_time / 10, "Page was not cheaper than the full result"
+    assert json.loads(full_body) == json.loads(json.dumps(big.find_pos(), default=str))
+
+    # 4. /api/chat pages and projects, defaults unchanged
+    print("\n🔹 Step 4: /api/chat...")
+    client = TestClient(app)
+    message = "Show purchase orders"
+    unpaged = client.post("/api/chat", json={"message": message}).json()
+    assert "next_cursor" not in unpaged
+    body = {"message": message, "limit": 5, "fields": "id,status,total_value"}
+    data, cursor = [], None
+    while True:
+        response = client.post("/api/chat", json=dict(body, cursor=cursor)).json()
+        assert len(response["data"]) <= 5 and response["total"] == len(unpaged["data"])
+        assert f"found {response['total']} results" in response["response"]
+        data.extend(response["data"])
+        cursor = response["next_cursor"]
+        if cursor is None:
+            break
+    assert data == [{f: r[f] for f in FIELDS} for r in unpaged["data"]]
+    foreign = client.post("/api/chat", json=body).json()["next_cursor"]
+    bad = client.post("/api/chat", json={"message": "Show invoices", "cursor": foreign})
+    assert bad.status_code == 400, bad.status_code
+    print(f"   {len(data)} rows over {-(-len(data) // 5)} pages; foreign cursor rejected with 400.")
+
+    print("\n✅ Pagination Verification Passed!")
+
+if __name__ == "__main__":
+    verify_pagination()
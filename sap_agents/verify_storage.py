@@ -0,0 +1,99 @@
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mock_sap import mock_db, MockDatabase
+from src.core.data_generator import BASE_EPOCH, BulkDataGenerator
+
+def scan_pos(vendor_name=None, status=None, plant_loc=None):
+    # Reference implementation: the original full-scan filter
+    results = mock_db.purchase_orders
+    if vendor_name:
+        results = [p for p in results if vendor_name.lower() in p['vendor_name'].lower()]
+    if status:
+        results = [p for p in results if status.lower() == p['status'].lower()]
+    if plant_loc:
+        results = [p for p in results if plant_loc.lower() in p['plant_location'].lower()]
+    return results
+
+def verify_storage():
+    print("🚀 Testing Indexed Mock SAP Storage")
+    print("-----------------------------------")
+
+    # Case 1: Indexed lookups agree with the full-scan reference
+    print("\n🔹 Case 1: Index Intersection vs. Full Scan")
+    vendor = mock_db.vendors[0]['name']
+    cases = [
+        {},
+        {"vendor_name": vendor},
+        {"vendor_name": vendor[1:5].upper()},
+        {"status": "late"},
+        {"plant_loc": "ber", "status": "Open"},
+        {"vendor_name": vendor, "status": "Received", "plant_loc": "o"},
+        {"vendor_name": "no-such-vendor"},
+    ]
+    for params in cases:
+        assert mock_db.find_pos(**params) == scan_pos(**params), f"Mismatch for {params}"
+    print(f"   {len(cases)} filter combinations matched.")
+
+    # Case 2: Inserts and updates keep the indexes in sync
+    print("\n🔹 Case 2: Index Maintenance")
+    pos = mock_db.po_table.insert({
+        'id': '4599999', 'vendor_id': '1', 'vendor_name': 'Verify Storage GmbH',
+        'plant_id': '1', 'plant_location': 'Berlin', 'date': '2025-01-01',
+        'status': 'Open', 'total_value': 1.0,
+        'delivery_days_actual': None, 'delivery_days_promised': 5
+    })
+    assert len(mock_db.find_pos(vendor_name="storage gmbh", status="Open")) == 1
+    mock_db.po_table.update(pos, status='Blocked')
+    assert not mock_db.find_pos(vendor_name="storage gmbh", status="Open")
+    assert len(mock_db.find_pos(vendor_name="storage gmbh", status="Blocked")) == 1
+    print("   Insert/update reflected in lookups.")
+
+    # Case 3: Bulk generator is deterministic and snapshots round-trip
+    print("\n🔹 Case 3: Scale-Factor Generator & Snapshots")
+    sf10 = MockDatabase(scale_factor=10, seed=42)
+    assert len(sf10.purchase_orders) == 2000, f"Expected 2000 POs at SF10, got {len(sf10.purchase_orders)}"
+    assert MockDatabase(scale_factor=10, seed=42).purchase_orders == sf10.purchase_orders
+    # Dates hang off a fixed epoch, not today, so a seed gives the same data any day
+    dataset = BulkDataGenerator(10, seed=42).generate()
+    assert dataset.meta['base_date'] == BASE_EPOCH.isoformat()
+    assert dataset.to_tables()['purchase_orders'] == sf10.purchase_orders
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "sf10")
+        generated = MockDatabase(scale_factor=10, seed=7, snapshot_path=snapshot)
+        loaded = MockDatabase(snapshot_path=snapshot)
+        assert loaded.purchase_orders == generated.purchase_orders
+        assert loaded.invoices == generated.invoices
+    print("   SF10 generation is seeded and snapshot reload is identical.")
+
+    # Case 4: Vendor risk aggregates follow PO writes
+    print("\n🔹 Case 4: Incremental Vendor Risk")
+    db = MockDatabase(scale_factor=1, seed=11)
+    vendor = db.vendors[0]['name']
+    before = db.analyze_vendor_risk(vendor)
+    db.insert_purchase_order({
+        'id': '4600000', 'vendor_id': db.vendors[0]['id'], 'vendor_name': vendor,
+        'plant_id': db.plants[0]['id'], 'plant_location': db.plants[0]['location'],
+        'date': '2025-01-01', 'status': 'Open', 'total_value': 100.0,
+        'delivery_days_actual': None, 'delivery_days_promised': 5
+    })
+    assert db.analyze_vendor_risk(vendor) == before, "Open POs must not change the risk context"
+    db.update_po_status('4600000', 'Received', delivery_days_actual=9)
+    after = db.analyze_vendor_risk(vendor)
+    assert after['total_orders_analyzed'] == before.get('total_orders_analyzed', 0) + 1
+    assert after['late_orders'] == before.get('late_orders', 0) + 1
+    ranking = db.rank_vendors_by_risk()
+    assert [r['risk_score'] for r in ranking] == sorted((r['risk_score'] for r in ranking), reverse=True)
+    assert db.rank_vendors_by_risk(0) == [] and len(db.rank_vendors_by_risk(2)) == 2
+    ranking[0]['risk_score'] = -1  # Callers get copies, not the cached ranking
+    assert db.rank_vendors_by_risk(1)[0]['risk_score'] != -1
+    print(f"   {vendor}: {before.get('risk_score')} -> {after['risk_score']} after a late receipt.")
+
+    print("\n✅ Storage Verification Passed!")
+
+if __name__ == "__main__":
+    verify_storage()